@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Batch Planning
+Reads user queries for batch runs from JSONL, and merges the dorked queries of
+many sessions so each unique Exa query is searched once while its results are
+attributed to every session that asked for it.
+"""
+
+import json
+import re
+from itertools import islice
+
+from search_cache import normalize_query
+
+# Fields a batch line may hold the user query under, in order of preference
+USER_QUERY_FIELDS = ('query', 'user_query', 'body')
+
+
+def normalize_user_query(text):
+    """Collapse whitespace and case so repeated campaign queries share one LLM run"""
+    return re.sub(r'\s+', ' ', text).strip().casefold()
+
+
+def read_user_queries(path):
+    """
+    Stream batch entries from a JSONL file as (line number, user query, record).
+
+    Each line is an object with the user query under "query" (or "user_query"
+    / "body"); a bare JSON string also works. Blank lines are skipped, and
+    malformed lines are reported and skipped rather than ending the batch.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"⚠️  Skipping line {line_number}: invalid JSON ({str(e)})")
+                continue
+            if isinstance(record, str):
+                record = {'query': record}
+            user_query = None
+            if isinstance(record, dict):
+                user_query = next((record[field] for field in USER_QUERY_FIELDS
+                                   if isinstance(record.get(field), str) and record[field].strip()), None)
+            if user_query is None:
+                print(f"⚠️  Skipping line {line_number}: no user query found")
+                continue
+            yield line_number, user_query.strip(), record
+
+
+def chunked(iterable, size):
+    """Yield lists of up to size items without reading the whole iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class SharedQueryPlan:
+    """
+    The unique dorked queries wanted by one or more sessions.
+
+    Queries that normalize to the same text are searched once, using the first
+    spelling seen; sessions_for(query) lists every (session_id, spelling) that
+    wants it, the first entry being the session that fetched it.
+    """
+
+    def __init__(self):
+        self.wanted = {}       # normalized query -> [(session_id, query as the session spelled it)]
+        self.searched_as = {}  # normalized query -> spelling sent to Exa
+        self.packed = {}       # query -> PackedQuery
+        self.session_ids = []
+        self.duplicates = {}   # session_id -> queries merged within that session
+
+    def add(self, session_id, queries, packed=None, skip=()):
+        """Register a session's queries; queries in skip (e.g. already done) are left out"""
+        queries = list(queries)
+        if session_id not in self.duplicates:
+            self.session_ids.append(session_id)
+            self.duplicates[session_id] = 0
+        keys = set()
+        for query in queries:
+            key = normalize_query(query)
+            if key in keys:
+                self.duplicates[session_id] += 1
+            keys.add(key)
+            if query in skip:
+                continue
+            self.searched_as.setdefault(key, query)
+            self.wanted.setdefault(key, []).append((session_id, query))
+        self.packed.update(packed or {})
+
+    def queries(self):
+        """Unique queries to search, in the order they were first registered"""
+        return list(self.searched_as.values())
+
+    def sessions_for(self, query):
+        """The (session_id, spelling) pairs that want query"""
+        return self.wanted.get(normalize_query(query), [])
+
+    @property
+    def requested(self):
+        """How many session/query pairs the plan covers"""
+        return sum(len(wanted) for wanted in self.wanted.values())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Database Write Benchmark
+Inserts synthetic search results with the original per-search connection and
+row-by-row INSERTs, then with the batched WAL writer (which also upserts the
+profiles/hits tables and the analytics totals), and compares them. Both databases
+carry the same indexes and analytics tables.
+
+Usage:
+    python benchmarks/bench_db_writer.py --rows 100000 --per-query 10
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_writer import LeadWriter
+from fake_exa import FakeResult
+from lead_store import create_lead_tables, create_dedup_tables, create_analytics_tables
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS search_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        query TEXT NOT NULL,
+        title TEXT,
+        url TEXT,
+        snippet TEXT,
+        published_date TEXT,
+        author TEXT,
+        score REAL,
+        session_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def synthetic_batches(rows, per_query):
+    """Yield (query, results) pairs totalling `rows` results"""
+    for start in range(0, rows, per_query):
+        query = f'"intitle:\\"Role {start // per_query % 20}\\" AND (\\"Company {start}\\") inurl:/in/"'
+        yield query, [
+            FakeResult(
+                title=f"Person {n} - Role - Company | LinkedIn",
+                url=f"https://www.linkedin.com/in/person-{n}",
+                text="Experienced professional. " * 20,
+                author=f"Person {n}",
+                score=0.5,
+            )
+            for n in range(start, min(start + per_query, rows))
+        ]
+
+
+def legacy_save_search_results(db_name, query, results):
+    """The original implementation: new connection and row-by-row INSERTs per search"""
+    conn = sqlite3.connect(db_name)
+    cursor = conn.cursor()
+    for result in results:
+        cursor.execute('''
+            INSERT INTO search_results
+            (query, title, url, snippet, published_date, author, score)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            query,
+            result.title if hasattr(result, 'title') else '',
+            result.url if hasattr(result, 'url') else '',
+            result.text if hasattr(result, 'text') else '',
+            result.published_date if hasattr(result, 'published_date') else '',
+            result.author if hasattr(result, 'author') else '',
+            result.score if hasattr(result, 'score') else 0.0
+        ))
+    conn.commit()
+    conn.close()
+
+
+def make_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    create_lead_tables(conn.cursor())
+    # The analytics triggers also watch search_sessions and profiles.lead_id
+    conn.execute('CREATE TABLE IF NOT EXISTS search_sessions (id INTEGER PRIMARY KEY AUTOINCREMENT)')
+    create_dedup_tables(conn.cursor())
+    create_analytics_tables(conn.cursor())
+    conn.commit()
+    conn.close()
+
+
+def count_rows(path):
+    conn = sqlite3.connect(path)
+    count = conn.execute('SELECT COUNT(*) FROM search_results').fetchone()[0]
+    conn.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs batched SQLite writes")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--per-query', type=int, default=10, help="results saved per search call")
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--skip-legacy', action='store_true')
+    args = parser.parse_args()
+
+    batches = list(synthetic_batches(args.rows, args.per_query))
+
+    print("🚀 Database Write Benchmark")
+    print("=" * 50)
+    print(f"   - Rows: {args.rows} ({len(batches)} saves of {args.per_query})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_time = None
+        if not args.skip_legacy:
+            legacy_db = os.path.join(tmp, 'legacy.db')
+            make_db(legacy_db)
+            start = time.perf_counter()
+            for query, results in batches:
+                legacy_save_search_results(legacy_db, query, results)
+            legacy_time = time.perf_counter() - start
+            print(f"\n   - Legacy:  {legacy_time:7.2f}s  ({args.rows / legacy_time:9.0f} rows/s)"
+                  f"  rows={count_rows(legacy_db)}")
+
+        batched_db = os.path.join(tmp, 'batched.db')
+        make_db(batched_db)
+        writer = LeadWriter(batched_db, batch_size=args.batch_size).start()
+        start = time.perf_counter()
+        for query, results in batches:
+            writer.save_results(query, results)
+        writer.close()
+        batched_time = time.perf_counter() - start
+        print(f"   - Batched: {batched_time:7.2f}s  ({args.rows / batched_time:9.0f} rows/s)"
+              f"  rows={count_rows(batched_db)}, commits={writer.commits}")
+
+        if legacy_time:
+            print(f"   - Speedup: {legacy_time / batched_time:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
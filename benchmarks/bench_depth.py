@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Adaptive Depth Benchmark
+Runs the same sessions through the search path twice, once with every query
+fetched as search_and_contents and once with adaptive depth (probe, deepen
+only on new profiles, contents only for profiles not already stored), against
+FakeExa serving a synthetic corpus with page-sized texts, where a role/company
+pair has anywhere from no profiles to --per-pair of them. The second session
+overlaps the first, as repeated research on a market does; the result cache is
+off so its repeated queries reach Exa, and the budget covers every query even
+at three requests each. Reports Exa requests, payload,
+simulated Exa time and new profiles per session.
+
+Usage:
+    python benchmarks/bench_depth.py [--roles 8] [--companies 10] [--per-pair 8] [--text-bytes 4000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import linkedin_lead_generator as llg
+from fake_exa import FakeExa, build_profile_corpus
+
+
+def make_corpus(roles, companies, per_pair, text_bytes, seed=3):
+    """build_profile_corpus thinned to 0..per_pair profiles per pair, with texts padded to text_bytes"""
+    rng = random.Random(seed)
+    full = build_profile_corpus(roles, companies, per_pair=per_pair)
+    corpus = []
+    for start in range(0, len(full), per_pair):
+        corpus += full[start:start + rng.randint(0, per_pair)]
+    for profile in corpus:
+        profile.text = (profile.text + ' ') * (text_bytes // (len(profile.text) + 1) + 1)
+    return corpus
+
+
+def run_mode(adaptive, sessions, corpus, args):
+    """Search each session's queries in order on a fresh database; returns one row per session"""
+    llg.EXA_ADAPTIVE_DEPTH = adaptive
+    llg.EXA_MIN_MARGINAL_YIELD = 0
+    llg.EXA_CACHE_MODE = 'off'
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        llg.DB_NAME = os.path.join(tmp, 'depth.db')
+        llg.search_cache = None
+        with contextlib.redirect_stdout(io.StringIO()):
+            llg.init_database()
+        for label, queries in sessions:
+            client = FakeExa(latency=args.latency, page_latency=args.page_latency, corpus=corpus)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                llg.search_with_rate_limiting(queries, label, client=client, rate=10_000, burst=10_000,
+                                              max_in_flight=args.in_flight, budget=3 * len(queries))
+            wall = time.perf_counter() - start
+            conn = sqlite3.connect(llg.DB_NAME)
+            try:
+                usage = conn.execute('''
+                    SELECT exa_requests, exa_response_bytes FROM search_sessions ORDER BY id DESC LIMIT 1
+                ''').fetchone()
+                profiles = conn.execute('SELECT COUNT(*) FROM profiles').fetchone()[0]
+            finally:
+                conn.close()
+            rows.append((label, usage[0], usage[1], wall, profiles - sum(row[4] for row in rows)))
+        llg.close_db_writer()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark adaptive result depth against full contents")
+    parser.add_argument('--roles', type=int, default=8)
+    parser.add_argument('--companies', type=int, default=10)
+    parser.add_argument('--per-pair', type=int, default=8, help="corpus profiles per role/company pair")
+    parser.add_argument('--text-bytes', type=int, default=4000, help="page text per profile")
+    parser.add_argument('--latency', type=float, default=0.05, help="simulated seconds per Exa call")
+    parser.add_argument('--page-latency', type=float, default=0.1,
+                        help="simulated seconds added to a call that returns page text")
+    parser.add_argument('--in-flight', type=int, default=10)
+    args = parser.parse_args()
+
+    roles = [f"Role {i}" for i in range(args.roles)]
+    companies = [f"Company {i}" for i in range(args.companies)]
+    corpus = make_corpus(roles, companies, args.per_pair, args.text_bytes)
+    half = max(1, args.roles // 2)
+    sessions = [
+        ('first', llg.generate_dorked_queries(roles[:half + 1], companies)),
+        ('overlap', llg.generate_dorked_queries(roles[half - 1:], companies)),
+    ]
+
+    print("🚀 Adaptive Depth Benchmark")
+    print("=" * 50)
+    print(f"   - Corpus: {len(corpus)} profiles, {args.text_bytes} bytes of text each")
+    print(f"   - Sessions: " + ', '.join(f"{label} ({len(queries)} queries)" for label, queries in sessions))
+    print(f"   - Probe {llg.EXA_PROBE_RESULTS} results, deepen to {llg.EXA_DEEP_RESULTS}")
+
+    print(f"\n   {'mode':<10} {'session':<9} {'requests':>8} {'payload':>10} {'wall':>8} {'new':>5} "
+          f"{'KB/new':>8} {'ms/new':>8}")
+    for mode, adaptive in (('full', False), ('adaptive', True)):
+        for label, requests, payload, wall, new in run_mode(adaptive, sessions, corpus, args):
+            per_kb = f"{payload / new / 1024:8.1f}" if new else f"{'-':>8}"
+            per_ms = f"{wall / new * 1000:8.1f}" if new else f"{'-':>8}"
+            print(f"   {mode:<10} {label:<9} {requests:8} {payload / 1024:8.1f}KB {wall:7.2f}s {new:5} "
+                  f"{per_kb} {per_ms}")
+
+
+if __name__ == "__main__":
+    main()
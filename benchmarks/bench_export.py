@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Export Benchmark
+Builds synthetic databases of increasing size and exports each one with the
+streaming exporter (xlsx, csv and, if pyarrow is installed, parquet), and with
+the original pandas-based Excel export when pandas is available. Reports time
+and peak Python memory (tracemalloc) so flat memory across sizes is visible.
+
+Usage:
+    python benchmarks/bench_export.py --rows 20000 100000 --formats xlsx csv
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from export_to_excel import EXPORT_FORMATS, export_database
+from lead_store import migrate_database
+
+SCHEMA = '''
+    CREATE TABLE search_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        query TEXT NOT NULL,
+        title TEXT,
+        url TEXT,
+        snippet TEXT,
+        published_date TEXT,
+        author TEXT,
+        score REAL,
+        session_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE search_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_query TEXT NOT NULL,
+        total_queries INTEGER,
+        queries_searched INTEGER,
+        exa_calls_avoided INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+'''
+
+
+def make_db(path, rows, per_query=10):
+    """Fill search_results with `rows` results, then build profiles/hits through the migration"""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany('''
+        INSERT INTO search_results (query, title, url, snippet, published_date, author, score, session_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+    ''', (
+        (f'"intitle:\\"Role {n // per_query % 20}\\" AND (\\"Company {n // per_query}\\") inurl:/in/"',
+         f"Person {n} - Role - Company | LinkedIn", f"https://www.linkedin.com/in/person-{n}",
+         "Experienced professional with a long profile summary. " * 15, '', f"Person {n}", 0.5)
+        for n in range(rows)
+    ))
+    conn.execute("INSERT INTO search_sessions (user_query, total_queries, queries_searched) VALUES ('bench', 1, 1)")
+    conn.commit()
+    migrate_database(conn)
+    conn.close()
+
+
+def legacy_export(db_name, output_file):
+    """The original export: whole tables into DataFrames, normal openpyxl, full width scan"""
+    import pandas as pd
+    conn = sqlite3.connect(db_name)
+    df = pd.read_sql_query('SELECT query, title, url, snippet, published_date, author, score, created_at '
+                           'FROM search_results ORDER BY created_at DESC', conn)
+    conn.close()
+    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='Search Results', index=False)
+        worksheet = writer.book['Search Results']
+        for column in worksheet.columns:
+            width = max(len(str(cell.value)) for cell in column)
+            worksheet.column_dimensions[column[0].column_letter].width = min(width + 2, 50)
+
+
+def measure(fn):
+    """Run fn quietly; return (seconds, peak MiB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming exports against the pandas export")
+    parser.add_argument('--rows', type=int, nargs='+', default=[20000, 100000])
+    parser.add_argument('--formats', nargs='+', choices=EXPORT_FORMATS, default=list(EXPORT_FORMATS))
+    parser.add_argument('--skip-legacy', action='store_true')
+    args = parser.parse_args()
+
+    formats = list(args.formats)
+    if 'parquet' in formats and importlib.util.find_spec('pyarrow') is None:
+        print("⚠️  pyarrow not installed, skipping parquet")
+        formats.remove('parquet')
+
+    print("🚀 Export Benchmark")
+    print("=" * 50)
+    print(f"\n{'rows':>8}  {'mode':<18}{'seconds':>9}{'peak MiB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            db_name = os.path.join(tmp, f'bench_{rows}.db')
+            make_db(db_name, rows)
+            if not args.skip_legacy:
+                try:
+                    elapsed, peak = measure(lambda: legacy_export(db_name, os.path.join(tmp, 'legacy.xlsx')))
+                    print(f"{rows:>8}  {'pandas xlsx':<18}{elapsed:>9.2f}{peak:>10.1f}")
+                except ImportError:
+                    print("⚠️  pandas not installed, skipping the legacy export")
+                    args.skip_legacy = True
+            for fmt in formats:
+                output_file = os.path.join(tmp, f'stream_{rows}.{fmt}')
+                elapsed, peak = measure(lambda: export_database(db_name, output_file, fmt=fmt))
+                print(f"{rows:>8}  {'streaming ' + fmt:<18}{elapsed:>9.2f}{peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Groq Client Benchmark
+Runs chat calls against the local mock Groq server (mock_groq_server.py) with
+a fresh connection per call (the original `requests.post`) and with the pooled
+GroqClient, then shows retries riding out injected 429s and the circuit
+breaker failing fast during an outage.
+
+Usage:
+    python benchmarks/bench_groq.py --calls 50 --latency 0.02 --rate-limit-every 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from groq_client import GroqClient, GroqError, CircuitBreaker
+from mock_groq_server import MockGroqServer
+
+PAYLOAD = {'model': 'llama3-8b-8192', 'messages': [{'role': 'user', 'content': 'User query: test'}]}
+
+
+def run_unpooled(server, calls):
+    for _ in range(calls):
+        response = requests.post(server.url, json=PAYLOAD, headers={'Connection': 'close'}, timeout=10)
+        response.raise_for_status()
+
+
+def run_pooled(client, calls):
+    succeeded = 0
+    for _ in range(calls):
+        try:
+            client.chat(PAYLOAD)
+            succeeded += 1
+        except GroqError:
+            pass
+    return succeeded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pooled, retrying Groq client against a mock server")
+    parser.add_argument('--calls', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--rate-limit-every', type=int, default=5)
+    args = parser.parse_args()
+
+    print("🚀 Groq Client Benchmark")
+    print("=" * 50)
+
+    server = MockGroqServer(latency=args.latency).start()
+    start = time.perf_counter()
+    run_unpooled(server, args.calls)
+    elapsed = time.perf_counter() - start
+    print(f"\n   - New connection per call: {elapsed:6.2f}s  "
+          f"{server.requests} requests over {server.connections} connections")
+    server.stop()
+
+    server = MockGroqServer(latency=args.latency).start()
+    client = GroqClient('mock-key', server.url)
+    start = time.perf_counter()
+    run_pooled(client, args.calls)
+    elapsed = time.perf_counter() - start
+    print(f"   - Pooled keep-alive:       {elapsed:6.2f}s  "
+          f"{server.requests} requests over {server.connections} connections")
+    client.close()
+    server.stop()
+
+    server = MockGroqServer(latency=args.latency, rate_limit_every=args.rate_limit_every,
+                            retry_after=0).start()
+    client = GroqClient('mock-key', server.url, backoff_base=0.01)
+    with contextlib.redirect_stdout(io.StringIO()):
+        succeeded = run_pooled(client, args.calls)
+    print(f"\n   - 429 on every {args.rate_limit_every}th request: {succeeded}/{args.calls} calls succeeded, "
+          f"{client.retries} retries, {server.rate_limited} rate limited")
+    client.close()
+    server.stop()
+
+    server = MockGroqServer(latency=args.latency, error_rate=1.0).start()
+    client = GroqClient('mock-key', server.url, max_retries=2, backoff_base=0.01,
+                        breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        succeeded = run_pooled(client, args.calls)
+    elapsed = time.perf_counter() - start
+    print(f"   - Outage (every request 503): {succeeded}/{args.calls} succeeded in {elapsed:.2f}s, "
+          f"{server.requests} requests reached the server, breaker {client.breaker.state}")
+    client.close()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Query Packing Benchmark
+Replays recorded Exa profiles (benchmarks/fixtures/exa_profiles.json) through
+FakeExa and compares one query per role/company pair with packed queries:
+Exa calls made, unique profiles found (recall) and attribution accuracy.
+
+Usage:
+    python benchmarks/bench_packing.py --lengths 300 600 1000 --num-results 10 25
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_exa import FakeExa, load_profile_corpus
+from query_packing import pack_queries, attribute_results
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'exa_profiles.json')
+
+
+def dorked_query(role, company):
+    """Same format as linkedin_lead_generator.generate_dorked_queries, without importing its API clients"""
+    return f'"intitle:\"{role}\" AND (\"{company}\" OR \"@{company}\" OR \"| {company}\" OR \"- {company}\" OR \"at {company}\" OR \"({company})\" OR \": {company}\") inurl:/in/"'
+
+
+def run_unpacked(corpus, roles, companies, num_results):
+    client = FakeExa(corpus=corpus)
+    found = set()
+    for role in roles:
+        for company in companies:
+            for result in client.search_and_contents(dorked_query(role, company), num_results=num_results).results:
+                found.add(result.url)
+    return client.calls, found, 1.0
+
+
+def run_packed(corpus, roles, companies, num_results, max_length, max_roles, max_companies):
+    client = FakeExa(corpus=corpus)
+    truth = {profile.url: (profile.job_role, profile.company_name) for profile in corpus}
+    found = set()
+    attributed = correct = 0
+    for packed in pack_queries(roles, companies, max_length=max_length,
+                               max_roles=max_roles, max_companies=max_companies):
+        results = client.search_and_contents(packed.query, num_results=num_results).results
+        for pair, matched in attribute_results(packed, results).items():
+            for result in matched:
+                found.add(result.url)
+                attributed += 1
+                correct += pair == truth.get(result.url)
+    return client.calls, found, (correct / attributed if attributed else 1.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark packed vs one-per-pair dorked queries")
+    parser.add_argument('--fixture', default=FIXTURE)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[300, 600, 1000])
+    parser.add_argument('--num-results', type=int, nargs='+', default=[10, 25])
+    parser.add_argument('--max-roles', type=int, default=3)
+    parser.add_argument('--max-companies', type=int, default=10)
+    args = parser.parse_args()
+
+    corpus, metadata = load_profile_corpus(args.fixture)
+    roles, companies = metadata['job_roles'], metadata['company_names']
+    reachable = {profile.url for profile in corpus}
+
+    print("🚀 Query Packing Benchmark")
+    print("=" * 50)
+    print(f"   - Fixture: {len(roles)} roles × {len(companies)} companies, {len(reachable)} profiles")
+
+    print(f"\n{'mode':<26}{'results/call':>13}{'calls':>8}{'found':>8}{'recall':>9}{'attribution':>13}")
+    for num_results in args.num_results:
+        calls, found, accuracy = run_unpacked(corpus, roles, companies, num_results)
+        print(f"{'one query per pair':<26}{num_results:>13}{calls:>8}{len(found):>8}"
+              f"{len(found) / len(reachable):>9.1%}{accuracy:>13.1%}")
+        for max_length in args.lengths:
+            calls, found, accuracy = run_packed(corpus, roles, companies, num_results, max_length,
+                                                args.max_roles, args.max_companies)
+            print(f"{f'packed ≤{max_length} chars':<26}{num_results:>13}{calls:>8}{len(found):>8}"
+                  f"{len(found) / len(reachable):>9.1%}{accuracy:>13.1%}")
+
+
+if __name__ == "__main__":
+    main()
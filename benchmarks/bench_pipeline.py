@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+Runs each step of the lead pipeline offline and reports throughput, latency
+percentiles and peak Python memory:
+
+    dorking   generate_dorked_queries for the fixture's roles x companies
+    parse     parse_stage_output over the recorded LLM replies
+    llm       run_llm_stages with the replay provider (recorded Groq fixture)
+    search    the search loop against FakeExa serving the recorded Exa fixture
+    save      save_search_results for a synthetic result set of each --scale
+    extract   lead field extraction (title/snippet parsing, role/company matching) over it
+    dedup     resolve_leads (MinHash/LSH lead clustering) over that result set
+    query     search_leads (FTS5 ranked search with filters and paging) over it
+    export    export_database (xlsx and csv) of that result set, and an incremental csv
+              export of its newest 1%
+
+Each case is timed untraced (best of --rounds runs), then run again under tracemalloc for its peak
+memory (tracing slows allocation-heavy code several times over; skip the
+second run with --no-memory).
+
+Results can be saved as a baseline and later runs compared against it, so an
+optimization can be shown to help and a regression fails the run:
+
+    python benchmarks/bench_pipeline.py --save-baseline
+    python benchmarks/bench_pipeline.py --compare
+    python benchmarks/bench_pipeline.py --scales 1k 100k 1m --only save export
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+FIXTURES = os.path.join(BENCH_DIR, 'fixtures')
+RECORDINGS = os.path.join(FIXTURES, 'llm_recordings.jsonl')
+EXA_FIXTURE = os.path.join(FIXTURES, 'exa_profiles.json')
+BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# The recorded fixtures were captured for this query
+FIXTURE_QUERY = "IT support professionals in top tech firms India"
+
+SCALES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+SCENARIOS = ('dorking', 'parse', 'render', 'llm', 'search', 'save', 'extract', 'dedup', 'query', 'export')
+
+# Offline: replay the recorded Groq responses and never touch the caches
+os.environ.update(LLM_PROVIDER='replay', LLM_RECORDINGS=RECORDINGS, LLM_CACHE_MODE='off', EXA_CACHE_MODE='off')
+
+import linkedin_lead_generator as llg
+from export_to_excel import export_database, newest_ids
+from lead_dedup import resolve_leads
+from lead_extract import extract_session
+from lead_search import search_leads
+from fake_exa import FakeExa, FakeResult, load_profile_corpus
+from metrics import Histogram
+from mock_groq_server import CANNED_REPLIES
+from structured_output import parse_stage_output
+
+# Same prompt markers the mock server uses, mapped to the stage each prompt belongs to
+STAGE_MARKERS = dict(zip((marker for marker, _ in CANNED_REPLIES),
+                         ('variables', 'descriptions', 'job_roles', 'company_names')))
+
+
+def use_database(path):
+    """Point the pipeline at a fresh, empty database"""
+    llg.close_db_writer()
+    llg.search_cache = None
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    llg.DB_NAME = path
+    llg.init_database()
+
+
+def measure(fn, trace_memory=True):
+    """Run fn quietly; return (its result, seconds, peak MiB or None)"""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        value = fn()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return value, elapsed, peak
+
+
+def calibrate():
+    """Seconds for a fixed pure-Python workload (best of 5), to factor machine speed out of comparisons"""
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        sum(i * i for i in range(300_000))
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def latencies(fn, items):
+    """Call fn on each item; return a Histogram of per-call seconds"""
+    histogram = Histogram()
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        histogram.observe(time.perf_counter() - start)
+    return histogram
+
+
+# Roles and companies of the synthetic session, as the LLM stages would have generated them
+SYNTHETIC_ROLES = [f"Role {n} Engineer" for n in range(20)]
+SYNTHETIC_COMPANIES = [f"Company {n} Technologies" for n in range(500)]
+
+
+def synthetic_results(rows, per_query=10):
+    """(query, results) batches shaped like Exa responses"""
+    for first in range(0, rows, per_query):
+        group = first // per_query
+        role, company = SYNTHETIC_ROLES[group % 20], SYNTHETIC_COMPANIES[group % 500]
+        query = llg.generate_dorked_queries([role], [company])[0]
+        yield query, [
+            FakeResult(title=f"Person {n} - Senior {role} - {company} | LinkedIn",
+                       url=f"https://www.linkedin.com/in/person-{n}",
+                       text=f"{role} at {company}. Pune, Maharashtra, India. "
+                            + "Experienced professional with a long profile summary. " * 15,
+                       author=f"Person {n}", score=0.5)
+            for n in range(first, min(first + per_query, rows))
+        ]
+
+
+def bench_dorking(ctx):
+    roles, companies = ctx['meta']['job_roles'], ctx['meta']['company_names']
+    runs = ctx['repeats'] * 100
+    histogram = latencies(lambda _: llg.generate_dorked_queries(roles, companies), range(runs))
+    return histogram, runs * len(roles) * len(companies), 'queries'
+
+
+def bench_parse(ctx):
+    replies = []
+    for record in ctx['recordings']:
+        prompt = record['messages'][0]['content']
+        stage = next((stage for marker, stage in STAGE_MARKERS.items() if marker in prompt), None)
+        if stage:
+            replies.append((stage, record['response']))
+    items = replies * ctx['repeats'] * 100
+    return latencies(lambda item: parse_stage_output(*item), items), len(items), 'replies'
+
+
+def bench_render(ctx):
+    """Render each stage's prompt with the inputs the mock server's canned replies would give it"""
+    registry = llg.get_prompt_registry()
+    variables, descriptions = CANNED_REPLIES[0][1], CANNED_REPLIES[1][1]
+    items = [
+        (registry.stage('variables'), FIXTURE_QUERY),
+        (registry.stage('descriptions'), variables),
+        (registry.stage('job_roles'), {'occupation_description': descriptions['persona_description']}),
+        (registry.stage('company_names'), {'company_description': descriptions['company_description'],
+                                           'location': variables['location']}),
+    ] * ctx['repeats'] * 100
+    return latencies(lambda item: llg.render_prompt(*item), items), len(items), 'prompts'
+
+
+def bench_llm(ctx):
+    histogram = latencies(lambda _: llg.run_llm_stages(FIXTURE_QUERY), range(ctx['repeats']))
+    return histogram, ctx['repeats'], 'runs'
+
+
+def bench_search(ctx):
+    use_database(os.path.join(ctx['tmp'], 'search.db'))
+    queries = llg.generate_dorked_queries(ctx['meta']['job_roles'], ctx['meta']['company_names'])
+    client = FakeExa(latency=ctx['exa_latency'], corpus=ctx['corpus'])
+    llg.metrics = llg.Metrics()
+    searched, _ = llg.search_with_rate_limiting(queries, FIXTURE_QUERY, client=client, rate=10_000,
+                                                burst=10_000, budget=len(queries))
+    llg.close_db_writer()
+    # Latencies are per Exa request; an adaptive query makes up to three
+    histogram = next(h for (name, _), h in llg.metrics.histograms.items() if name == 'exa_request_seconds')
+    return histogram, searched, 'queries'
+
+
+def bench_save(ctx):
+    use_database(ctx['db'])
+    session_id = llg.create_session('benchmark', [], job_roles=SYNTHETIC_ROLES, company_names=SYNTHETIC_COMPANIES)
+    histogram = Histogram()
+    for query, results in synthetic_results(ctx['rows']):
+        start = time.perf_counter()
+        llg.save_search_results(query, results, session_id=session_id)
+        histogram.observe(time.perf_counter() - start)
+    llg.close_db_writer()
+    return histogram, ctx['rows'], 'rows'
+
+
+def bench_extract(ctx):
+    conn = sqlite3.connect(ctx['db'])
+    try:
+        count = extract_session(conn, 1)
+        conn.commit()
+    finally:
+        conn.close()
+    return None, count, 'profiles'
+
+
+def bench_dedup(ctx):
+    conn = sqlite3.connect(ctx['db'])
+    try:
+        stats = resolve_leads(conn, rebuild=True)
+        conn.commit()
+    finally:
+        conn.close()
+    return None, stats['resolved'], 'profiles'
+
+
+def bench_query(ctx):
+    """
+    A mix of lookups: a name, a role, role + company, a filtered role, a deep page, a word every
+    profile contains with a filter, filters alone
+    """
+    searches = []
+    for n in range(ctx['repeats']):
+        # Pairs the synthetic results contain: query group g searched role g % 20 at company g % 500
+        group = n * 37
+        role, company = SYNTHETIC_ROLES[group % 20], SYNTHETIC_COMPANIES[group % 500]
+        searches += [
+            {'text': f"Person {group * 10 % ctx['rows']}"},
+            {'text': role},
+            {'text': f"{role} {company}"},
+            {'text': f"{role} pune", 'session_id': 1, 'min_score': 0.4},
+            {'text': 'engineer', 'page': 5},
+            {'text': 'engineer', 'min_score': 0.2},
+            {'query': company, 'session_id': 1},
+        ]
+    conn = sqlite3.connect(ctx['db'])
+    try:
+        histogram = latencies(lambda search: search_leads(conn, **search), searches)
+    finally:
+        conn.close()
+    return histogram, len(searches), 'searches'
+
+
+def bench_export(ctx, fmt):
+    export_database(ctx['db'], os.path.join(ctx['tmp'], f"export.{fmt}"), fmt=fmt)
+    return None, ctx['rows'], 'rows'
+
+
+def bench_export_delta(ctx):
+    """Incremental csv export with the newest 1% of the rows (at least 100) past the target's mark"""
+    delta = max(100, ctx['rows'] // 100)
+    conn = sqlite3.connect(ctx['db'])
+    try:
+        newest = newest_ids(conn)
+        conn.execute('INSERT OR REPLACE INTO export_marks (target, hit_id, result_id, session_id) VALUES (?, ?, ?, ?)',
+                     ('benchmark', newest['hits'] - delta, newest['search_results'] - delta,
+                      newest['search_sessions']))
+        conn.commit()
+    finally:
+        conn.close()
+    export_database(ctx['db'], os.path.join(ctx['tmp'], 'delta.csv'), fmt='csv', incremental=True,
+                    target='benchmark')
+    return None, delta, 'rows'
+
+
+def run_case(name, fn, ctx, trace_memory, warmup=False):
+    """Run one benchmark case, keeping the fastest of ctx['rounds'] runs, and return its result record"""
+    if warmup:
+        measure(lambda: fn(ctx), trace_memory=False)
+    runs = []
+    for _ in range(ctx['rounds']):
+        calibration = calibrate()
+        runs.append(measure(lambda: fn(ctx), trace_memory=False) + (calibration,))
+    (histogram, ops, unit), elapsed, _, calibration = min(runs, key=lambda run: run[1])
+    peak = measure(lambda: fn(ctx))[2] if trace_memory else None
+    record = {'ops': ops, 'unit': unit, 'seconds': elapsed, 'throughput': ops / elapsed if elapsed else 0.0,
+              'peak_mib': peak, 'calibration': calibration}
+    if histogram is not None and histogram.count:
+        for q in ('p50', 'p95', 'p99'):
+            record[f'{q}_ms'] = histogram.quantile(int(q[1:]) / 100) * 1000
+    print(f"{name:<16}{ops:>10} {unit:<8}{elapsed:>9.3f}{record['throughput']:>14,.0f}"
+          f"{record.get('p50_ms', float('nan')):>10.3f}{record.get('p95_ms', float('nan')):>10.3f}"
+          f"{peak if peak is not None else float('nan'):>10.1f}")
+    return record
+
+
+def run_benchmarks(args):
+    corpus, meta = load_profile_corpus(EXA_FIXTURE)
+    ctx = {
+        'meta': meta, 'corpus': corpus, 'repeats': args.repeats, 'rounds': args.rounds,
+        'exa_latency': args.exa_latency,
+        'recordings': [json.loads(line) for line in open(RECORDINGS, encoding='utf-8') if line.strip()],
+    }
+    trace_memory = not args.no_memory
+    results = {}
+    print(f"\n{'case':<16}{'ops':>10} {'':<8}{'seconds':>9}{'ops/s':>14}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'peak MiB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx['tmp'] = tmp
+        llg.LLM_CACHE_DB = os.path.join(tmp, 'llm_cache.db')
+        for name, fn in (('dorking', bench_dorking), ('parse', bench_parse), ('render', bench_render),
+                         ('llm', bench_llm), ('search', bench_search)):
+            if name in args.only:
+                results[name] = run_case(name, fn, ctx, trace_memory, warmup=True)
+        for scale in args.scales:
+            ctx['rows'] = SCALES[scale]
+            ctx['db'] = os.path.join(tmp, f'scale_{scale}.db')
+            if {'save', 'extract', 'dedup', 'query', 'export'} & set(args.only):
+                results[f'save@{scale}'] = run_case(f'save@{scale}', bench_save, ctx, trace_memory)
+            if 'extract' in args.only:
+                results[f'extract@{scale}'] = run_case(f'extract@{scale}', bench_extract, ctx, trace_memory)
+            if 'dedup' in args.only:
+                results[f'dedup@{scale}'] = run_case(f'dedup@{scale}', bench_dedup, ctx, trace_memory)
+            if 'query' in args.only:
+                results[f'query@{scale}'] = run_case(f'query@{scale}', bench_query, ctx, trace_memory, warmup=True)
+            if 'export' in args.only:
+                for fmt in ('xlsx', 'csv'):
+                    results[f'export_{fmt}@{scale}'] = run_case(
+                        f'export_{fmt}@{scale}', lambda c, fmt=fmt: bench_export(c, fmt), ctx, trace_memory)
+                results[f'export_delta@{scale}'] = run_case(f'export_delta@{scale}', bench_export_delta, ctx,
+                                                            trace_memory)
+        llg.close_db_writer()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print the change against the baseline; return the cases that regressed"""
+    regressions = []
+    print(f"\n📊 Compared with baseline from {baseline.get('created', 'unknown')} "
+          f"(tolerance {tolerance:.0%}):")
+    for name, record in results.items():
+        old = baseline['results'].get(name)
+        if not old:
+            print(f"   - {name:<16} new case, no baseline")
+            continue
+        # Throughput in units of the calibration workload, so a slower or busier machine isn't a regression
+        speed = (record['throughput'] * record['calibration']) / (old['throughput'] * old['calibration']) - 1 \
+            if old['throughput'] else 0.0
+        line = f"   - {name:<16} throughput {speed:+7.1%}"
+        slower = speed < -tolerance
+        bigger = False
+        if record.get('peak_mib') is not None and old.get('peak_mib'):
+            growth = record['peak_mib'] / old['peak_mib'] - 1
+            # Ignore growth under 1 MiB: small cases are dominated by allocator noise
+            bigger = growth > tolerance and record['peak_mib'] - old['peak_mib'] > 1
+            line += f", peak memory {growth:+7.1%}"
+        if slower or bigger:
+            regressions.append(name)
+            line += "  ❌ regression"
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the lead pipeline offline against recorded fixtures")
+    parser.add_argument('--scales', nargs='+', choices=SCALES, default=['1k'],
+                        help="synthetic result set sizes for the save, extract, dedup, query and export cases")
+    parser.add_argument('--only', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--repeats', type=int, default=20, help="repetitions of the small cases")
+    parser.add_argument('--rounds', type=int, default=3, help="runs per case; the fastest is reported")
+    parser.add_argument('--exa-latency', type=float, default=0.0, help="simulated seconds per Exa call")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the tracemalloc run of each case (halves the run time)")
+    parser.add_argument('--save-baseline', metavar='FILE', nargs='?', const=BASELINE)
+    parser.add_argument('--compare', metavar='FILE', nargs='?', const=BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed throughput drop / memory growth before a case counts as a regression")
+    args = parser.parse_args()
+
+    print("🚀 Pipeline Benchmark")
+    print("=" * 50)
+    print(f"   - Python {platform.python_version()} on {platform.platform()}")
+    results = run_benchmarks(args)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as file:
+            json.dump({'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': platform.python_version(),
+                       'platform': platform.platform(), 'settings': {
+                           'repeats': args.repeats, 'rounds': args.rounds, 'exa_latency': args.exa_latency,
+                           'memory': not args.no_memory},
+                       'results': results}, file, indent=2)
+        print(f"\n💾 Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Search Throughput Benchmark
+Compares the serial Exa loop with the concurrent, rate-limited search engine
+against the offline FakeExa stub. No API keys or network needed.
+
+Usage:
+    python benchmarks/bench_search.py --queries 100 --latency 0.3 --in-flight 10 --rate 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_exa import FakeExa
+from search_engine import TokenBucket, run_concurrent_searches
+
+
+def make_queries(count):
+    """Build `count` distinct dorked-style queries"""
+    return [
+        f'"intitle:\\"Role {i}\\" AND (\\"Company {i % 30}\\" OR \\"@Company {i % 30}\\") inurl:/in/"'
+        for i in range(count)
+    ]
+
+
+def run_serial(client, queries, num_results):
+    results = []
+    for query in queries:
+        results.append((query, client.search_and_contents(query, num_results=num_results).results))
+    return results
+
+
+def run_concurrent(client, queries, num_results, in_flight, rate, burst):
+    limiter = TokenBucket(rate, burst)
+    return run_concurrent_searches(
+        queries,
+        lambda query: client.search_and_contents(query, num_results=num_results).results,
+        max_in_flight=in_flight,
+        rate_limiter=limiter
+    )
+
+
+def urls(results):
+    return [(query, [r.url for r in items]) for query, items in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial vs concurrent Exa search")
+    parser.add_argument('--queries', type=int, default=60)
+    parser.add_argument('--latency', type=float, default=0.25, help="simulated seconds per Exa call")
+    parser.add_argument('--jitter', type=float, default=0.1)
+    parser.add_argument('--in-flight', type=int, default=10)
+    parser.add_argument('--rate', type=float, default=20.0, help="token bucket requests/sec")
+    parser.add_argument('--burst', type=int, default=10)
+    parser.add_argument('--num-results', type=int, default=10)
+    parser.add_argument('--end-to-end', action='store_true',
+                        help="also run search_with_rate_limiting against a temporary database")
+    args = parser.parse_args()
+
+    queries = make_queries(args.queries)
+
+    print("🚀 Search Throughput Benchmark")
+    print("=" * 50)
+    print(f"   - Queries: {len(queries)}")
+    print(f"   - Simulated latency: {args.latency}s (+ up to {args.jitter}s jitter)")
+
+    client = FakeExa(latency=args.latency, jitter=args.jitter)
+    start = time.perf_counter()
+    serial = run_serial(client, queries, args.num_results)
+    serial_time = time.perf_counter() - start
+
+    client = FakeExa(latency=args.latency, jitter=args.jitter)
+    start = time.perf_counter()
+    concurrent = run_concurrent(client, queries, args.num_results, args.in_flight, args.rate, args.burst)
+    concurrent_time = time.perf_counter() - start
+
+    print(f"\n📊 Results:")
+    print(f"   - Serial:     {serial_time:7.2f}s  ({len(queries) / serial_time:6.1f} queries/s)")
+    print(f"   - Concurrent: {concurrent_time:7.2f}s  ({len(queries) / concurrent_time:6.1f} queries/s)"
+          f"  [{args.in_flight} in flight, {args.rate:g} req/s, burst {args.burst}]")
+    print(f"   - Speedup:    {serial_time / concurrent_time:7.2f}x")
+    print(f"   - Results identical to serial path: {urls(serial) == urls(concurrent)}")
+
+    if args.end_to_end:
+        import linkedin_lead_generator as llg
+        with tempfile.TemporaryDirectory() as tmp:
+            llg.DB_NAME = os.path.join(tmp, 'bench.db')
+            llg.init_database()
+            start = time.perf_counter()
+            llg.search_with_rate_limiting(
+                queries, 'benchmark', client=FakeExa(latency=args.latency, jitter=args.jitter),
+                max_in_flight=args.in_flight, rate=args.rate, burst=args.burst
+            )
+            print(f"\n   - search_with_rate_limiting end-to-end: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Runs leads.py subcommands in fresh interpreters under `python -X importtime`
+and reports wall-clock time and the time spent importing modules beyond what
+a bare interpreter imports, with the heaviest imports of each command. The
+lightweight commands (help, info, search, export --help) must stay under
+--max-import-ms; the run fails if one doesn't.
+
+Usage:
+    python benchmarks/bench_startup.py [--rounds 5] [--rows 1000] [--max-import-ms 50]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_export import make_db
+
+CLI = os.path.join(ROOT, 'leads.py')
+# (label, arguments, lightweight)
+COMMANDS = [
+    ('--help', ['--help'], True),
+    ('info', ['info'], True),
+    ('search', ['search', 'devops', '--limit', '5'], True),
+    ('export --help', ['export', '--help'], True),
+    ('resume (list)', ['resume'], False),
+    ('run --help', ['run', '--help'], False),
+]
+
+
+def parse_importtime(stderr):
+    """{top-level module: cumulative microseconds} from -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented under the module that triggered them
+        if not name.startswith('  '):
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def measure(argv, cwd, rounds):
+    """Median wall seconds and the per-module import times of the median run"""
+    runs = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-X', 'importtime'] + argv, cwd=cwd,
+                                   capture_output=True, text=True)
+        runs.append((time.perf_counter() - start, parse_importtime(completed.stderr)))
+    runs.sort(key=lambda run: run[0])
+    return runs[len(runs) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold start and import time")
+    parser.add_argument('--rounds', type=int, default=5, help="runs per command (the median is reported)")
+    parser.add_argument('--rows', type=int, default=1000, help="search results in the database searched")
+    parser.add_argument('--max-import-ms', type=float, default=50.0,
+                        help="import budget of the lightweight commands")
+    args = parser.parse_args()
+
+    print("🚀 Startup Benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_db(os.path.join(tmp, 'linkedin_leads.db'), args.rows)
+
+        bare_seconds, bare_modules = measure(['-c', 'pass'], tmp, args.rounds)
+        print(f"   - Bare interpreter: {bare_seconds * 1000:6.0f} ms wall")
+        print(f"\n   {'command':<16} {'wall':>8} {'imports':>9}   heaviest imports")
+
+        over_budget = []
+        for label, argv, lightweight in COMMANDS:
+            seconds, modules = measure([CLI] + argv, tmp, args.rounds)
+            extra = {name: us for name, us in modules.items() if name not in bare_modules}
+            import_ms = sum(extra.values()) / 1000
+            heaviest = ', '.join(f"{name} {us / 1000:.0f}ms"
+                                 for name, us in sorted(extra.items(), key=lambda item: -item[1])[:3])
+            flag = ''
+            if lightweight and import_ms > args.max_import_ms:
+                over_budget.append(label)
+                flag = '  ⚠️'
+            print(f"   {label:<16} {seconds * 1000:6.0f}ms {import_ms:7.1f}ms   {heaviest}{flag}")
+
+    if over_budget:
+        print(f"\n❌ Over the {args.max_import_ms:g} ms import budget: {', '.join(over_budget)}")
+        sys.exit(1)
+    print(f"\n✅ Lightweight commands import in under {args.max_import_ms:g} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Batched SQLite Writer
+A single long-lived connection owned by a dedicated writer thread. Callers on
+any thread queue rows; the writer inserts them with executemany and commits
+once per batch (by size or time interval) in WAL mode, folding each batch's
+search results into the analytics totals as it commits. Each queued item runs
+under its own savepoint, so a failing one is undone alone and its future
+carries the error, while the rest of the batch commits.
+"""
+
+import queue
+from concurrent.futures import Future
+import sqlite3
+import threading
+import time
+
+from lead_store import upsert_leads, fold_result_totals
+
+_STOP = object()
+
+
+class WriterError(Exception):
+    """The writer thread isn't running, so a call queued on it can't complete"""
+
+
+def configure_connection(conn):
+    """Switch a connection to WAL journaling with settings suited to bulk writes"""
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA busy_timeout=5000')
+    return conn
+
+
+def result_to_row(query, result):
+    """Flatten an Exa result into a search_results row"""
+    return (
+        query,
+        getattr(result, 'title', '') or '',
+        getattr(result, 'url', '') or '',
+        getattr(result, 'text', '') or '',
+        getattr(result, 'published_date', '') or '',
+        getattr(result, 'author', '') or '',
+        getattr(result, 'score', 0.0) or 0.0,
+    )
+
+
+INSERT_RESULT_SQL = '''
+    INSERT INTO search_results
+    (query, title, url, snippet, published_date, author, score, session_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+class LeadWriter:
+    """Queue-fed writer thread that owns the only write connection to the database"""
+
+    def __init__(self, db_name, batch_size=500, flush_interval=1.0):
+        self.db_name = db_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.rows_written = 0
+        self.commits = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.thread = None
+
+    def start(self):
+        """Start the writer thread (idempotent)"""
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name='lead-writer', daemon=True)
+            self.thread.start()
+        return self
+
+    def _put(self, kind, target, payload):
+        future = Future()
+        self.queue.put((kind, target, (payload, future)))
+        return future
+
+    def execute(self, sql, params=()):
+        """
+        Queue a single statement. Returns a Future that resolves once it is committed, or
+        holds the error that rolled it back
+        """
+        return self._put('one', sql, params)
+
+    def executemany(self, sql, rows):
+        """Queue a bulk statement; returns a Future like execute()"""
+        rows = list(rows)
+        if not rows:
+            future = Future()
+            future.set_result(None)
+            return future
+        return self._put('many', sql, rows)
+
+    def submit(self, fn):
+        """Queue fn(conn) to run inside the current batch without waiting for it; returns a Future like execute()"""
+        return self._put('fn', fn, None)
+
+    def save_results(self, query, results, session_id=None, store_raw=True):
+        """
+        Queue search results for insertion into search_results and the profiles/hits upsert;
+        returns the Futures of the queued writes
+        """
+        rows = [result_to_row(query, result) for result in results]
+        if not rows:
+            return []
+        futures = []
+        if store_raw:
+            futures.append(self.executemany(INSERT_RESULT_SQL, [row + (session_id,) for row in rows]))
+        futures.append(self.submit(lambda conn: upsert_leads(conn, query, session_id, rows)))
+        return futures
+
+    def call(self, fn):
+        """Run fn(conn) on the writer thread after everything queued before it; returns its result"""
+        done = threading.Event()
+        box = {}
+        if not self.running():
+            raise WriterError(f"the writer for {self.db_name} is not running")
+        self.queue.put(('call', fn, (done, box)))
+        # A writer that dies after the put fails the call instead of leaving it waiting
+        while not done.wait(0.5):
+            if not self.running():
+                raise WriterError(f"the writer for {self.db_name} stopped before the call ran")
+        if 'error' in box:
+            raise box['error']
+        return box.get('value')
+
+    def running(self):
+        thread = self.thread
+        return thread is not None and thread.is_alive()
+
+    def flush(self):
+        """Block until every queued write has been committed"""
+        self.call(lambda conn: None)
+
+    def close(self):
+        """Commit outstanding writes and stop the writer thread"""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+        self.thread = None
+
+    def _run(self):
+        try:
+            self._write_loop()
+        finally:
+            # Fail the calls and writes still queued, so no caller waits on a writer that is gone
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    continue
+                error = WriterError(f"the writer for {self.db_name} stopped before the write ran")
+                if item[0] == 'call':
+                    done, box = item[2]
+                    box['error'] = error
+                    done.set()
+                else:
+                    item[2][1].set_exception(error)
+
+    def _write_loop(self):
+        conn = configure_connection(sqlite3.connect(self.db_name))
+        pending = 0
+        dirty = False
+        # Futures of the items in the uncommitted batch, resolved when it commits
+        batch = []
+        last_commit = time.monotonic()
+
+        def settle(error=None):
+            for future in batch:
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+            batch.clear()
+
+        def commit():
+            nonlocal pending, dirty, last_commit
+            if pending or dirty:
+                # Fold the batch's search_results into the analytics totals in the same transaction;
+                # rows a failed fold leaves behind are picked up by the next one
+                if pending:
+                    try:
+                        fold_result_totals(conn)
+                    except sqlite3.Error as e:
+                        print(f"⚠️ Could not update the analytics totals: {str(e)}")
+                try:
+                    conn.commit()
+                    self.commits += 1
+                    self.rows_written += pending
+                    settle()
+                except sqlite3.Error as e:
+                    self.errors += 1
+                    conn.rollback()
+                    settle(e)
+            pending = 0
+            dirty = False
+            last_commit = time.monotonic()
+
+        def run_item(kind, target, payload):
+            """Run one queued write under its own savepoint; returns the rows it added"""
+            if not conn.in_transaction:
+                conn.execute('BEGIN')
+            conn.execute('SAVEPOINT item')
+            try:
+                if kind == 'many':
+                    conn.executemany(target, payload)
+                    rows = len(payload)
+                elif kind == 'one':
+                    conn.execute(target, payload)
+                    rows = 1
+                else:
+                    target(conn)
+                    rows = 0
+            except Exception:
+                conn.execute('ROLLBACK TO item')
+                conn.execute('RELEASE item')
+                raise
+            conn.execute('RELEASE item')
+            return rows
+
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_commit))
+            try:
+                item = self.queue.get(timeout=timeout if pending or dirty else None)
+            except queue.Empty:
+                commit()
+                continue
+
+            if item is _STOP:
+                commit()
+                break
+
+            kind, target, payload = item
+            started = time.perf_counter()
+            if kind == 'call':
+                done, box = payload
+                commit()
+                try:
+                    box['value'] = target(conn)
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    box['error'] = e
+                self.busy_seconds += time.perf_counter() - started
+                done.set()
+                continue
+
+            payload, future = payload
+            try:
+                rows = run_item(kind, target, payload)
+            except Exception as e:
+                # A bad row or a failing fn costs only its own item: its caller gets the error
+                self.errors += 1
+                if conn.in_transaction:
+                    future.set_exception(e)
+                else:
+                    # SQLite already rolled the whole transaction back (e.g. disk full), and with
+                    # it the rest of the batch
+                    settle(e)
+                    future.set_exception(e)
+                    pending = 0
+                    dirty = False
+                self.busy_seconds += time.perf_counter() - started
+                continue
+            pending += rows
+            dirty = dirty or kind == 'fn'
+            batch.append(future)
+
+            if pending >= self.batch_size or time.monotonic() - last_commit >= self.flush_interval:
+                commit()
+            self.busy_seconds += time.perf_counter() - started
+
+        conn.close()
@@ -1,228 +1,530 @@
 #!/usr/bin/env python3
 """
 LinkedIn Leads Database Export to Excel
-This script exports the SQLite database to an Excel file with proper formatting.
+This script exports the SQLite database to an Excel file with proper formatting,
+or to CSV/Parquet files. Rows are streamed from SQLite in chunks and written
+through a write-only workbook, so memory stays flat however large the database is.
+
+With --incremental only what changed since the last export to the same target is
+written: a delta workbook, or rows appended to a rolling CSV/Parquet dataset. The
+summary sheets read aggregate tables kept current as results are saved, so they
+never rescan the whole history.
 """
 
+import argparse
+import csv
 import sqlite3
-import pandas as pd
 from datetime import datetime
 import os
+from itertools import islice
+from lead_store import migrate_database, LEADS_SQL
+
+EXPORT_FORMATS = ('xlsx', 'csv', 'parquet')
+CHUNK_SIZE = 1000          # Rows fetched from SQLite per round trip
+WIDTH_SAMPLE_ROWS = 500    # Rows used to size Excel columns
+MAX_COLUMN_WIDTH = 50      # Cap at 50 characters
+
+# Summary sheets, read from the analytics tables the write path keeps current
+# (see lead_store.create_analytics_tables) rather than aggregated over every search result
+SUMMARY_SHEETS = [
+    ('Summary Statistics', """
+        SELECT
+            results as total_results,
+            queries as unique_queries,
+            unique_urls,
+            profiles as unique_profiles,
+            leads as unique_leads,
+            sessions,
+            score_sum / NULLIF(scored, 0) as avg_score,
+            max_score,
+            first_seen as first_search,
+            last_seen as last_search
+        FROM result_totals
+    """),
+    # Top queries by result count
+    ('Top Queries', """
+        SELECT
+            query,
+            results as result_count,
+            unique_urls,
+            score_sum / NULLIF(scored, 0) as avg_score,
+            max_score,
+            first_seen,
+            last_seen
+        FROM query_totals
+        ORDER BY results DESC
+        LIMIT 20
+    """),
+    # Top URLs by score, one row per profile
+    ('Top URLs', """
+        SELECT
+            p.title,
+            p.url,
+            p.snippet,
+            t.score,
+            (SELECT h.query FROM hits h WHERE h.profile_id = p.id
+             ORDER BY h.score DESC LIMIT 1) as query
+        FROM top_profiles t
+        JOIN profiles p ON p.id = t.profile_id
+        ORDER BY t.score DESC, t.profile_id
+    """),
+]
+
+# (sheet name, query) for every exported table, in workbook order
+EXPORT_SHEETS = [
+    # Unique leads: one row per person, duplicate profiles merged (see lead_dedup.py)
+    ('Leads', """
+        SELECT
+            name,
+            headline,
+            company,
+            location,
+            matched_role,
+            url,
+            title,
+            snippet,
+            best_score,
+            matching_queries,
+            profiles as merged_profiles,
+            profile_urls,
+            first_seen,
+            last_seen
+        FROM leads
+        ORDER BY best_score DESC
+    """),
+    ('Search Results', """
+        SELECT
+            query,
+            title,
+            url,
+            snippet,
+            published_date,
+            author,
+            score,
+            created_at
+        FROM search_results
+        ORDER BY created_at DESC
+    """),
+    ('Search Sessions', """
+        SELECT
+            user_query,
+            total_queries,
+            queries_searched,
+            created_at
+        FROM search_sessions
+        ORDER BY created_at DESC
+    """),
+    *SUMMARY_SHEETS,
+]
+
+
+# Leads with a hit since the export mark: new profiles, profiles found again and, through
+# their lead_id, every profile of a lead they joined
+CHANGED_LEADS_SQL = """
+    SELECT COALESCE(changed.lead_id, changed.id) FROM hits h JOIN profiles changed ON changed.id = h.profile_id
+    WHERE h.id > :hit_low AND h.id <= :hit_high
+"""
+
+# What --incremental writes for each target: rows added or changed between its mark (*_low)
+# and the newest rows when the export started (*_high), then the summary sheets
+DELTA_SHEETS = [
+    # lead_id identifies a lead across exports: a changed lead is written again in full, and a
+    # lead a new profile merged into another gets a row with only lead_id and merged_into
+    ('Leads', f"""
+        SELECT
+            lead_id,
+            NULL as merged_into,
+            name,
+            headline,
+            company,
+            location,
+            matched_role,
+            url,
+            title,
+            snippet,
+            best_score,
+            matching_queries,
+            profiles as merged_profiles,
+            profile_urls,
+            first_seen,
+            last_seen
+        FROM ({LEADS_SQL.format(scope=f"WHERE p.lead_id IN ({CHANGED_LEADS_SQL}) OR p.id IN ({CHANGED_LEADS_SQL})")})
+        UNION ALL
+        SELECT m.lead_id, m.merged_into, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL,
+               NULL, NULL, NULL, NULL, NULL, NULL
+        FROM lead_merges m
+        WHERE m.profile_id IN (SELECT profile_id FROM hits WHERE id > :hit_low AND id <= :hit_high)
+        ORDER BY best_score DESC
+    """),
+    ('Search Results', """
+        SELECT
+            query,
+            title,
+            url,
+            snippet,
+            published_date,
+            author,
+            score,
+            created_at
+        FROM search_results
+        WHERE id > :result_low AND id <= :result_high
+        ORDER BY id
+    """),
+    # New sessions, and older ones that were resumed: a resumed session is written again
+    # with its current counts, so keep the last row per session_id
+    ('Search Sessions', """
+        SELECT
+            id as session_id,
+            user_query,
+            total_queries,
+            queries_searched,
+            created_at
+        FROM search_sessions
+        WHERE (id > :session_low AND id <= :session_high)
+           OR id IN (SELECT session_id FROM hits WHERE id > :hit_low AND id <= :hit_high)
+        ORDER BY id
+    """),
+    *SUMMARY_SHEETS,
+]
+# Sheets appended to a rolling dataset; the summary sheets are rewritten each time
+DELTA_APPEND_SHEETS = ('Leads', 'Search Results', 'Search Sessions')
+
+# Parquet column types per sheet; every other column is text. SQLite columns are untyped, so
+# a type taken from the data would change between part files with the rows they happen to hold
+PARQUET_TYPES = {
+    'Leads': {'lead_id': 'int64', 'merged_into': 'int64', 'best_score': 'float64',
+              'matching_queries': 'int64', 'merged_profiles': 'int64'},
+    'Search Results': {'score': 'float64'},
+    'Search Sessions': {'session_id': 'int64', 'total_queries': 'int64', 'queries_searched': 'int64'},
+    'Summary Statistics': {'total_results': 'int64', 'unique_queries': 'int64', 'unique_urls': 'int64',
+                           'unique_profiles': 'int64', 'unique_leads': 'int64', 'sessions': 'int64',
+                           'avg_score': 'float64', 'max_score': 'float64'},
+    'Top Queries': {'result_count': 'int64', 'unique_urls': 'int64', 'avg_score': 'float64',
+                    'max_score': 'float64'},
+    'Top URLs': {'score': 'float64'},
+}
+
+
+def iter_rows(conn, sql, chunk_size=CHUNK_SIZE, params=()):
+    """Run a query and yield its rows, fetching chunk_size at a time; returns (columns, rows)"""
+    cursor = conn.execute(sql, params)
+    columns = [description[0] for description in cursor.description]
+
+    def rows():
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                return
+            yield from chunk
+
+    return columns, rows()
+
+
+def sample_column_widths(columns, sample):
+    """Size columns from the header and a sample of rows instead of scanning every cell"""
+    widths = [len(str(column)) for column in columns]
+    for row in sample:
+        for i, value in enumerate(row):
+            if value is not None:
+                widths[i] = max(widths[i], len(str(value)))
+    return [min(width + 2, MAX_COLUMN_WIDTH) for width in widths]
+
+
+def write_xlsx(output_file, tables, append=()):
+    """
+    Stream each (sheet, columns, rows) into a write-only workbook; returns row counts.
+    A workbook is always written whole, so append is ignored (deltas get their own file).
+    """
+    # Imported here so csv/parquet exports and show_database_info don't load openpyxl
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    counts = {}
+    for sheet_name, columns, rows in tables:
+        worksheet = workbook.create_sheet(sheet_name)
+
+        # Column widths have to be set before the first row is written
+        sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+        for i, width in enumerate(sample_column_widths(columns, sample), 1):
+            worksheet.column_dimensions[get_column_letter(i)].width = width
+
+        worksheet.append(columns)
+        count = 0
+        for row in sample:
+            worksheet.append(row)
+            count += 1
+        for row in rows:
+            worksheet.append(row)
+            count += 1
+
+        # Add filters to headers
+        worksheet.auto_filter.ref = f"A1:{get_column_letter(max(1, len(columns)))}{count + 1}"
+        counts[sheet_name] = count
+    workbook.save(output_file)
+    return counts
+
+
+def sheet_file_name(output_file, sheet_name, extension):
+    """One file per sheet for formats without sheets, e.g. export_leads.csv"""
+    base = output_file[:-len(extension) - 1] if output_file.endswith('.' + extension) else output_file
+    return f"{base}_{sheet_name.lower().replace(' ', '_')}.{extension}"
+
+
+def write_csv(output_file, tables, append=()):
+    """Stream each sheet to its own CSV file, adding to the files of sheets in append; returns row counts"""
+    counts = {}
+    for sheet_name, columns, rows in tables:
+        path = sheet_file_name(output_file, sheet_name, 'csv')
+        adding = sheet_name in append and os.path.exists(path) and os.path.getsize(path) > 0
+        count = 0
+        with open(path, 'a' if adding else 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            if not adding:
+                writer.writerow(columns)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        counts[sheet_name] = count
+    return counts
+
+
+def write_parquet(output_file, tables, chunk_size=CHUNK_SIZE, append=()):
+    """
+    Stream each sheet to its own Parquet file in row groups of chunk_size; needs pyarrow.
+    Sheets in append become datasets: a directory gaining one part file per export.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+
+    counts = {}
+    for sheet_name, columns, rows in tables:
+        path = sheet_file_name(output_file, sheet_name, 'parquet')
+        if sheet_name in append:
+            directory = path[:-len('.parquet')]
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{len(os.listdir(directory)):05d}.parquet")
+        types = PARQUET_TYPES.get(sheet_name, {})
+        schema = pa.schema([pa.field(column, getattr(pa, types.get(column, 'string'))()) for column in columns])
+        count = 0
+        writer = None
+        try:
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk and sheet_name in append and writer is None:
+                    break
+                data = {column: [row[i] for row in chunk] for i, column in enumerate(columns)}
+                if writer is None:
+                    writer = pq.ParquetWriter(path, schema)
+                if chunk:
+                    writer.write_table(pa.table(data, schema=schema))
+                count += len(chunk)
+                if len(chunk) < chunk_size:
+                    break
+        finally:
+            if writer is not None:
+                writer.close()
+        counts[sheet_name] = count
+    return counts
+
+
+WRITERS = {'xlsx': write_xlsx, 'csv': write_csv, 'parquet': write_parquet}
+
+
+def newest_ids(conn):
+    """The newest row id of each table a delta is cut from: everything up to them gets exported"""
+    return {
+        table: conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}').fetchone()[0]
+        for table in ('hits', 'search_results', 'search_sessions', 'profiles')
+    }
+
+
+def read_export_mark(conn, target):
+    """(hit_id, result_id, session_id) already exported to a target; zeros for a new target"""
+    row = conn.execute('SELECT hit_id, result_id, session_id FROM export_marks WHERE target = ?',
+                       (target,)).fetchone()
+    return row or (0, 0, 0)
+
+
+def save_export_mark(conn, target, newest):
+    conn.execute('''
+        INSERT INTO export_marks (target, hit_id, result_id, session_id, exports, exported_at)
+        VALUES (?, ?, ?, ?, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT(target) DO UPDATE SET
+            hit_id = excluded.hit_id,
+            result_id = excluded.result_id,
+            session_id = excluded.session_id,
+            exports = exports + 1,
+            exported_at = excluded.exported_at
+    ''', (target, newest['hits'], newest['search_results'], newest['search_sessions']))
+
+
+def export_database(db_name='linkedin_leads.db', output_file=None, fmt='xlsx', chunk_size=CHUNK_SIZE,
+                    incremental=False, target=None):
+    """
+    Export the LinkedIn leads database as xlsx, csv or parquet, streaming rows in chunks.
+    incremental writes only what changed since the last export to target (default: the
+    output file for a csv/parquet dataset, 'xlsx' for delta workbooks) and moves its mark.
+    """
 
-def export_database_to_excel(db_name='linkedin_leads.db', output_file=None):
-    """Export the LinkedIn leads database to Excel"""
-    
     # Check if database exists
     if not os.path.exists(db_name):
         print(f"❌ Database file '{db_name}' not found!")
         return False
-    
-    # Generate output filename if not provided
+
+    if fmt not in EXPORT_FORMATS:
+        print(f"❌ Unknown export format '{fmt}' (choose from {', '.join(EXPORT_FORMATS)})")
+        return False
+
+    # Generate output filename if not provided; an incremental csv/parquet export keeps adding
+    # to the same dataset, so its default name has no timestamp
     if output_file is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = f"linkedin_leads_export_{timestamp}.xlsx"
-    
+        if incremental and fmt != 'xlsx':
+            output_file = f"linkedin_leads_dataset.{fmt}"
+        elif incremental:
+            output_file = f"linkedin_leads_delta_{timestamp}.{fmt}"
+        else:
+            output_file = f"linkedin_leads_export_{timestamp}.{fmt}"
+    if target is None:
+        target = output_file if fmt != 'xlsx' else 'xlsx'
+
+    conn = None
     try:
         # Connect to database
         conn = sqlite3.connect(db_name)
-        
-        # Read data from tables
-        print("📊 Reading data from database...")
-        
-        # Get search results
-        search_results_df = pd.read_sql_query("""
-            SELECT 
-                query,
-                title,
-                url,
-                snippet,
-                published_date,
-                author,
-                score,
-                created_at
-            FROM search_results 
-            ORDER BY created_at DESC
-        """, conn)
-        
-        # Get search sessions
-        search_sessions_df = pd.read_sql_query("""
-            SELECT 
-                user_query,
-                total_queries,
-                queries_searched,
-                created_at
-            FROM search_sessions 
-            ORDER BY created_at DESC
-        """, conn)
-        
-        # Get summary statistics
-        summary_stats = pd.read_sql_query("""
-            SELECT 
-                COUNT(*) as total_results,
-                COUNT(DISTINCT query) as unique_queries,
-                COUNT(DISTINCT url) as unique_urls,
-                AVG(score) as avg_score,
-                MIN(created_at) as first_search,
-                MAX(created_at) as last_search
-            FROM search_results
-        """, conn)
-        
-        # Get top queries by result count
-        top_queries_df = pd.read_sql_query("""
-            SELECT 
-                query,
-                COUNT(*) as result_count,
-                AVG(score) as avg_score
-            FROM search_results 
-            GROUP BY query 
-            ORDER BY result_count DESC 
-            LIMIT 20
-        """, conn)
-        
-        # Get top URLs by score
-        top_urls_df = pd.read_sql_query("""
-            SELECT 
-                title,
-                url,
-                snippet,
-                score,
-                query
-            FROM search_results 
-            WHERE score > 0
-            ORDER BY score DESC 
-            LIMIT 50
-        """, conn)
-        
-        conn.close()
-        
-        print(f"✅ Data loaded successfully!")
-        print(f"   - Search Results: {len(search_results_df)} rows")
-        print(f"   - Search Sessions: {len(search_sessions_df)} rows")
-        print(f"   - Top Queries: {len(top_queries_df)} rows")
-        print(f"   - Top URLs: {len(top_urls_df)} rows")
-        
-        # Create Excel writer
-        print(f"📝 Creating Excel file: {output_file}")
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            
-            # Write search results
-            search_results_df.to_excel(writer, sheet_name='Search Results', index=False)
-            
-            # Write search sessions
-            search_sessions_df.to_excel(writer, sheet_name='Search Sessions', index=False)
-            
-            # Write summary statistics
-            summary_stats.to_excel(writer, sheet_name='Summary Statistics', index=False)
-            
-            # Write top queries
-            top_queries_df.to_excel(writer, sheet_name='Top Queries', index=False)
-            
-            # Write top URLs
-            top_urls_df.to_excel(writer, sheet_name='Top URLs', index=False)
-            
-            # Get the workbook and worksheets
-            workbook = writer.book
-            
-            # Format each worksheet
-            for sheet_name in workbook.sheetnames:
-                worksheet = workbook[sheet_name]
-                
-                # Auto-adjust column widths
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    
-                    adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                # Add filters to headers
-                worksheet.auto_filter.ref = worksheet.dimensions
-        
-        print(f"✅ Excel file created successfully: {output_file}")
-        
+
+        # Older databases are migrated in place once; after that the export only reads, apart
+        # from moving its incremental mark. Searches keep profiles parsed and clustered and the
+        # analytics tables current as they write
+        migrate_database(conn)
+        # Rows written after this point wait for the next export
+        newest = newest_ids(conn)
+
+        sheets, params, append = EXPORT_SHEETS, {}, ()
+        if incremental:
+            hit_low, result_low, session_low = read_export_mark(conn, target)
+            if (hit_low, result_low, session_low) == (newest['hits'], newest['search_results'],
+                                                      newest['search_sessions']):
+                conn.close()
+                print(f"✅ Nothing new since the last export to {target}")
+                return True
+            sheets, append = DELTA_SHEETS, DELTA_APPEND_SHEETS
+            params = {'hit_low': hit_low, 'hit_high': newest['hits'],
+                      'result_low': result_low, 'result_high': newest['search_results'],
+                      'session_low': session_low, 'session_high': newest['search_sessions']}
+            print(f"🔁 Incremental export to {target}: hits after #{hit_low}, results after #{result_low}")
+
+        print(f"📝 Streaming {len(sheets)} tables to {fmt}: {output_file}")
+        try:
+            # Each table is queried only when the writer reaches it, so one cursor is open at a time
+            tables = ((sheet_name, *iter_rows(conn, sql, chunk_size, params)) for sheet_name, sql in sheets)
+            counts = WRITERS[fmt](output_file, tables, append=append)
+            if incremental:
+                save_export_mark(conn, target, newest)
+                conn.commit()
+        finally:
+            conn.close()
+
+        print(f"✅ Export created successfully: {output_file}")
+
         # Print summary
         print(f"\n📊 Export Summary:")
-        print(f"   - File: {output_file}")
-        print(f"   - Sheets: 5 (Search Results, Search Sessions, Summary Statistics, Top Queries, Top URLs)")
-        print(f"   - Total Results: {len(search_results_df)}")
-        print(f"   - Total Sessions: {len(search_sessions_df)}")
-        
+        print(f"   - File: {output_file}" + ("" if fmt == 'xlsx' else " (one file per table)"))
+        print(f"   - Sheets: {len(counts)} ({', '.join(counts)})")
+        for sheet_name, count in counts.items():
+            added = " added" if sheet_name in append and fmt != 'xlsx' else ""
+            print(f"   - {sheet_name}: {count} rows{added}")
+
         return True
-        
+
     except Exception as e:
+        # Release the connection, and with it any write lock a failed step left behind
+        if conn is not None:
+            conn.close()
         print(f"❌ Error exporting database: {str(e)}")
         return False
 
+def export_database_to_excel(db_name='linkedin_leads.db', output_file=None):
+    """Export the LinkedIn leads database to Excel"""
+    return export_database(db_name, output_file, fmt='xlsx')
+
 def show_database_info(db_name='linkedin_leads.db'):
     """Show information about the database"""
-    
+
     if not os.path.exists(db_name):
         print(f"❌ Database file '{db_name}' not found!")
         return
-    
+
     try:
         conn = sqlite3.connect(db_name)
         cursor = conn.cursor()
-        
-        # Get table information
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
-        
+
+        tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
         print(f"📊 Database Information: {db_name}")
         print("=" * 50)
-        
-        for table in tables:
-            table_name = table[0]
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()[0]
+
+        # Only the tables the analytics totals track are listed, so this never scans a table
+        if 'result_totals' not in tables:
+            print("   ⚠️ No analytics totals yet; export once (or run lead_store.py) to migrate the database")
+            conn.close()
+            return
+        results, queries, last_search, profiles, leads, hits, sessions = cursor.execute("""
+            SELECT results, queries, last_seen, profiles, leads, hits, sessions FROM result_totals
+        """).fetchone()
+        for table_name, count in (('search_results', results), ('search_sessions', sessions),
+                                  ('profiles', profiles), ('hits', hits)):
             print(f"   📋 {table_name}: {count} rows")
-        
-        # Get recent activity
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_results,
-                COUNT(DISTINCT query) as unique_queries,
-                MAX(created_at) as last_search
-            FROM search_results
-        """)
-        
-        stats = cursor.fetchone()
-        if stats[0] > 0:
+
+        if results > 0:
             print(f"\n📈 Recent Activity:")
-            print(f"   - Total Results: {stats[0]}")
-            print(f"   - Unique Queries: {stats[1]}")
-            print(f"   - Last Search: {stats[2]}")
-        
+            print(f"   - Total Results: {results}")
+            print(f"   - Unique Queries: {queries}")
+            print(f"   - Last Search: {last_search}")
+        print(f"   - Unique Leads: {leads}")
+
         conn.close()
-        
+
     except Exception as e:
         print(f"❌ Error reading database: {str(e)}")
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Export the LinkedIn leads database")
+    parser.add_argument('--db', default='linkedin_leads.db', help="SQLite database to export")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='xlsx', dest='fmt',
+                        help="xlsx workbook, or one csv/parquet file per table")
+    parser.add_argument('--output', default=None, help="output file (default: timestamped name)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help="rows fetched from SQLite per round trip")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only export what changed since the last export to the same target")
+    parser.add_argument('--target', default=None,
+                        help="name the incremental export mark is kept under (default: the output dataset, "
+                             "or 'xlsx' for delta workbooks)")
+    args = parser.parse_args()
+
     print("🚀 LinkedIn Leads Database Export Tool")
     print("=" * 50)
-    
+
     # Show database info
-    show_database_info()
-    
-    print(f"\n📝 Exporting database to Excel...")
-    
+    show_database_info(args.db)
+
+    print(f"\n📝 Exporting database to {args.fmt}...")
+
     # Export to Excel
-    success = export_database_to_excel()
-    
+    success = export_database(args.db, args.output, fmt=args.fmt, chunk_size=args.chunk_size,
+                              incremental=args.incremental, target=args.target)
+
     if success:
         print(f"\n✅ Export completed successfully!")
-        print(f"💡 You can now open the Excel file to view your LinkedIn leads data.")
+        print(f"💡 You can now open the exported file to view your LinkedIn leads data.")
     else:
         print(f"\n❌ Export failed!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
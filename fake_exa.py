@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Fake Exa Client
+Offline stand-in for `exa_py.Exa` so searches can be benchmarked and exercised
+without an API key or network. Responses are deterministic per query and each
+call can simulate network latency.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+
+class FakeResult:
+    """Mimics the attributes of an Exa search result"""
+
+    def __init__(self, title, url, text, published_date='', author='', score=0.0):
+        self.title = title
+        self.url = url
+        self.text = text
+        self.published_date = published_date
+        self.author = author
+        self.score = score
+
+    def __repr__(self):
+        return f"FakeResult(title={self.title!r}, url={self.url!r})"
+
+
+class FakeResponse:
+    """Mimics the `SearchResponse` returned by Exa"""
+
+    def __init__(self, results):
+        self.results = results
+
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def parse_query_terms(query):
+    """Pull the quoted role (intitle) and company terms out of a dorked query"""
+    unescaped = query.replace('\\"', '"')
+    roles = re.findall(r'intitle:"([^"]+)"', unescaped)
+    group = re.search(r'AND \((.*)\)', unescaped)
+    companies = []
+    for term in re.findall(r'"([^"]+)"', group.group(1) if group else ''):
+        if term.startswith('(') and term.endswith(')'):
+            term = term[1:-1]
+        term = re.sub(r'^(@|\| |- |at |: )', '', term).strip()
+        if term and term not in companies:
+            companies.append(term)
+    return roles, companies
+
+
+def build_profile_corpus(job_roles, company_names, per_pair=3, seed=7):
+    """Build a synthetic corpus of LinkedIn profiles for every role/company pair"""
+    rng = random.Random(seed)
+    corpus = []
+    for role in job_roles:
+        for company in company_names:
+            for n in range(per_pair):
+                name = f"Person {_slug(role)[:6]}{_slug(company)[:6]}{n}"
+                slug = f"{_slug(name)}-{rng.randrange(10**6):06d}"
+                corpus.append(FakeResult(
+                    title=f"{name} - {role} - {company} | LinkedIn",
+                    url=f"https://www.linkedin.com/in/{slug}",
+                    text=f"{role} at {company}. Experienced professional based in India.",
+                    author=name,
+                    score=round(rng.uniform(0.1, 0.9), 4),
+                ))
+    return corpus
+
+
+def save_profile_corpus(path, corpus, **metadata):
+    """Record a corpus (and e.g. the roles/companies it was built for) as a JSON fixture"""
+    payload = dict(metadata)
+    payload['profiles'] = [dict(vars(profile)) for profile in corpus]
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(payload, file, indent=1)
+
+
+def load_profile_corpus(path):
+    """Load a recorded JSON fixture; returns (corpus, metadata)"""
+    with open(path, 'r', encoding='utf-8') as file:
+        payload = json.load(file)
+    corpus = []
+    for item in payload.pop('profiles'):
+        extra = {key: item.pop(key) for key in list(item) if key not in
+                 ('title', 'url', 'text', 'published_date', 'author', 'score')}
+        profile = FakeResult(**item)
+        profile.__dict__.update(extra)
+        corpus.append(profile)
+    return corpus, payload
+
+
+class FakeExa:
+    """
+    Drop-in replacement for `Exa` exposing `search_and_contents`, `search` and
+    `get_contents`.
+
+    With a `corpus`, a query returns the profiles whose title matches one of
+    its intitle roles and one of its company terms. Without one, results are
+    synthesized from a hash of the query so the same query always gets the
+    same answer. `page_latency` is added to every call that returns page text,
+    for the retrieval and live crawls contents cost (pages of one call are
+    fetched in parallel).
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, corpus=None, seed=0, page_latency=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.page_latency = page_latency
+        self.pages = {}
+        self.corpus = corpus
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def _sleep(self):
+        with self.lock:
+            self.calls += 1
+            delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _sleep_pages(self, count):
+        if self.page_latency > 0 and count:
+            time.sleep(self.page_latency)
+
+    def _match_corpus(self, query, num_results):
+        roles, companies = parse_query_terms(query)
+        matches = []
+        for profile in self.corpus:
+            title = profile.title
+            if roles and not any(role in title for role in roles):
+                continue
+            if companies and not any(company in title for company in companies):
+                continue
+            matches.append(profile)
+        matches.sort(key=lambda profile: profile.score, reverse=True)
+        return matches[:num_results]
+
+    def _synthesize(self, query, num_results):
+        digest = hashlib.sha1(query.encode('utf-8')).hexdigest()
+        rng = random.Random(digest)
+        roles, companies = parse_query_terms(query)
+        role = roles[0] if roles else 'Professional'
+        company = companies[0] if companies else 'Company'
+        results = []
+        for n in range(num_results):
+            slug = f"{_slug(role)}-{digest[:8]}-{n}"
+            results.append(FakeResult(
+                title=f"Person {n} - {role} - {company} | LinkedIn",
+                url=f"https://www.linkedin.com/in/{slug}",
+                text=f"{role} at {company}. " + "Lorem ipsum " * 20,
+                author=f"Person {n}",
+                score=round(rng.uniform(0.1, 0.9), 4),
+            ))
+        return results
+
+    def _results(self, query, num_results):
+        if self.corpus is not None:
+            results = self._match_corpus(query, num_results)
+        else:
+            results = self._synthesize(query, num_results)
+        with self.lock:
+            for result in results:
+                self.pages[result.url] = result
+        return results
+
+    def search_and_contents(self, query, num_results=10, **kwargs):
+        """Return a FakeResponse for the query after the simulated latency"""
+        self._sleep()
+        results = self._results(query, num_results)
+        self._sleep_pages(len(results))
+        return FakeResponse(results)
+
+    def search(self, query, num_results=10, contents=None, **kwargs):
+        """Like search_and_contents; contents=False returns results without text"""
+        if contents is not False:
+            return self.search_and_contents(query, num_results=num_results, **kwargs)
+        self._sleep()
+        return FakeResponse([
+            FakeResult(r.title, r.url, None, r.published_date, r.author, r.score)
+            for r in self._results(query, num_results)
+        ])
+
+    def get_contents(self, urls, **kwargs):
+        """Contents of URLs returned by earlier searches; unknown URLs are left out"""
+        self._sleep()
+        if isinstance(urls, str):
+            urls = [urls]
+        with self.lock:
+            results = [self.pages[url] for url in urls if url in self.pages]
+        self._sleep_pages(len(results))
+        return FakeResponse(results)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Groq HTTP Client
+One pooled `requests.Session` (keep-alive) shared by every Groq call, with
+per-call timeouts, jittered exponential backoff that honors Retry-After on
+429/5xx responses, and a circuit breaker that fails fast once Groq keeps
+failing instead of retrying every call into an outage.
+"""
+
+import random
+import threading
+import time
+
+# Responses worth retrying: rate limited, or a transient server-side failure
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class GroqError(Exception):
+    """A Groq call failed for good (after retries, or with a non-retryable error)"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpenError(GroqError):
+    """Raised without calling Groq while the circuit breaker is open"""
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delay seconds or an HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - (now if now is not None else time.time()))
+
+
+def backoff_delay(attempt, base=0.5, cap=20.0, rng=random):
+    """Full-jitter exponential backoff: uniform between 0 and min(cap, base * 2**attempt)"""
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed calls and rejects calls
+    for `reset_timeout` seconds; then lets one trial call through (half-open)
+    and closes again if it succeeds.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self.lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        """Whether a call may go out now"""
+        with self.lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class GroqClient:
+    """Pooled, retrying client for Groq's OpenAI-compatible chat completions endpoint"""
+
+    def __init__(self, api_key, url, timeout=(5.0, 60.0), max_retries=4, backoff_base=0.5,
+                 backoff_cap=20.0, max_retry_after=60.0, breaker=None, pool_size=10, session=None):
+        self.url = url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_retry_after = max_retry_after
+        self.breaker = breaker or CircuitBreaker()
+        # requests is imported with the first client, so importing this module stays cheap
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {api_key}'
+        })
+        self.retries = 0
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.lock = threading.Lock()
+
+    def _retry_wait(self, attempt, response=None):
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                delay = min(retry_after, self.max_retry_after)
+        with self.lock:
+            self.retries += 1
+        return delay
+
+    def _post(self, payload):
+        """POST with retries; returns the decoded JSON body or raises GroqError"""
+        import requests
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if last_attempt:
+                    raise GroqError(f"{type(e).__name__}: {str(e)}")
+                delay = self._retry_wait(attempt)
+                print(f"⚠️  Groq request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            except requests.exceptions.RequestException as e:
+                raise GroqError(str(e))
+            with self.lock:
+                self.requests += 1
+                self.bytes_sent += len(response.request.body or b'')
+                self.bytes_received += len(response.content)
+
+            if response.status_code in RETRY_STATUSES and not last_attempt:
+                delay = self._retry_wait(attempt, response)
+                print(f"⚠️  Groq returned {response.status_code}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            if response.status_code >= 400:
+                raise GroqError(f"HTTP {response.status_code}: {response.text[:200]}",
+                                status=response.status_code)
+            try:
+                return response.json()
+            except ValueError:
+                raise GroqError(f"Response is not JSON: {response.text[:200]}")
+
+    def chat(self, payload):
+        """Send a chat completion request and return the message content"""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Groq circuit breaker is open after repeated failures; "
+                                   "not calling the API")
+        try:
+            data = self._post(payload)
+            content = data['choices'][0]['message']['content'].strip()
+        except (KeyError, IndexError, TypeError, AttributeError) as e:
+            # Groq answered, just not in the expected shape
+            self.breaker.record_success()
+            raise GroqError(f"Unexpected API response format: {str(e)}")
+        except GroqError as e:
+            # Client errors (bad key, bad request) say nothing about Groq's health
+            if e.status is None or e.status in RETRY_STATUSES:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        self.breaker.record_success()
+        return content
+
+    def stats(self):
+        """HTTP requests made (retries included), retries and bytes on the wire (bodies only)"""
+        with self.lock:
+            return {'requests': self.requests, 'retries': self.retries,
+                    'bytes_sent': self.bytes_sent, 'bytes_received': self.bytes_received}
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Lead Deduplication
+Entity resolution on top of the profiles table. URL variants of a profile
+(in.linkedin.com, trailing slashes, tracking parameters) already collapse onto
+one canonical /in/ slug when results are stored; this clusters what's left,
+the same person under different slugs, into one lead.
+
+Each profile gets a one-permutation MinHash of the word bigrams in its title
+and snippet. LSH bands of that signature, keyed together with the person's
+name, go into the lead_buckets index, so a new profile is only compared with
+same-name profiles whose text is likely similar; candidates whose exact
+Jaccard similarity passes the threshold share a lead_id. Resolution is
+incremental (only profiles with no lead_id yet) and linear in the number of
+new profiles. A profile that bridges two leads folds the higher lead_id into
+the lower one, and lead_merges records it for incremental exports.
+
+Usage:
+    python lead_dedup.py [linkedin_leads.db] [--threshold 0.6] [--rebuild]
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import zlib
+from array import array
+
+from lead_store import migrate_database
+
+# 8 bands of 3 values: pairs at Jaccard 0.6 become candidates ~86% of the time, at 0.8 over 99%
+BANDS = 8
+ROWS = 3
+NUM_BINS = BANDS * ROWS
+DEFAULT_THRESHOLD = 0.6
+RESOLVE_BATCH = 5000
+
+_WORD_RE = re.compile(r'\w+')
+_NAME_SPLIT_RE = re.compile(r' [-|–] ')
+_MASK = 0xFFFFFFFF
+_GOLDEN = 0x9E3779B1
+
+
+def name_key(title, author):
+    """Normalized person name: the author, else the title up to ' - ' or ' | '"""
+    name = author or _NAME_SPLIT_RE.split(title or '', maxsplit=1)[0]
+    # Drop credentials after a comma: "Jane Doe, PMP"
+    return ' '.join(_WORD_RE.findall(name.split(',')[0].lower()))
+
+
+def shingles(text):
+    """Word bigrams of the lowercased text (single words for one-word texts)"""
+    words = _WORD_RE.findall((text or '').lower())
+    if len(words) < 2:
+        return set(words)
+    return {f"{first} {second}" for first, second in zip(words, words[1:])}
+
+
+def minhash(shingle_set):
+    """
+    One-permutation MinHash: every shingle is hashed once into one of NUM_BINS
+    bins, keeping each bin's minimum. Empty bins borrow the next non-empty bin,
+    offset by the distance (rotation densification). None for an empty set.
+    """
+    bins = [None] * NUM_BINS
+    for shingle in shingle_set:
+        value = zlib.crc32(shingle.encode('utf-8'))
+        index = value % NUM_BINS
+        value //= NUM_BINS
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+    if all(value is None for value in bins):
+        return None
+    signature = list(bins)
+    for i in range(NUM_BINS):
+        distance = 1
+        while signature[i] is None:
+            borrowed = bins[(i + distance) % NUM_BINS]
+            if borrowed is not None:
+                signature[i] = (borrowed + distance * _GOLDEN) & _MASK
+            distance += 1
+    return signature
+
+
+def jaccard(first, second):
+    """Exact Jaccard similarity of two shingle sets"""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def band_buckets(name, signature):
+    """One bucket id per LSH band; the name is hashed in so only same-name profiles collide"""
+    seed = zlib.crc32(name.encode('utf-8'))
+    return [(band << 32) | zlib.crc32(array('I', signature[band * ROWS:(band + 1) * ROWS]).tobytes(), seed)
+            for band in range(BANDS)]
+
+
+def profile_text(title, snippet):
+    return f"{title or ''} {snippet or ''}"
+
+
+def _matching_leads(conn, name, text_shingles, buckets, threshold):
+    """
+    lead_ids of already-resolved same-name profiles sharing a bucket whose exact Jaccard
+    passes the threshold (a 24-value signature is too coarse to decide merges on its own)
+    """
+    placeholders = ','.join('?' * len(buckets))
+    candidates = conn.execute(f'''
+        SELECT p.title, p.snippet, p.author, p.lead_id FROM profiles p
+        WHERE p.id IN (SELECT DISTINCT profile_id FROM lead_buckets WHERE bucket IN ({placeholders}))
+          AND p.lead_id IS NOT NULL
+    ''', buckets).fetchall()
+    leads = set()
+    for title, snippet, author, lead_id in candidates:
+        if lead_id in leads or name_key(title, author) != name:
+            continue
+        if jaccard(text_shingles, shingles(profile_text(title, snippet))) >= threshold:
+            leads.add(lead_id)
+    return leads
+
+
+def resolve_leads(conn, threshold=DEFAULT_THRESHOLD, rebuild=False, batch_size=RESOLVE_BATCH):
+    """
+    Give every profile without a lead_id one, merging it (and any clusters it bridges)
+    into the lead of each matching profile. The caller commits.
+    Returns {'resolved', 'merged', 'leads'}.
+    """
+    if rebuild:
+        conn.execute('DELETE FROM lead_buckets')
+        conn.execute('UPDATE profiles SET lead_id = NULL')
+        conn.execute('DELETE FROM lead_merges')
+
+    resolved = merged = 0
+    last_id = 0
+    while True:
+        rows = conn.execute('''
+            SELECT id, title, snippet, author FROM profiles
+            WHERE lead_id IS NULL AND id > ? ORDER BY id LIMIT ?
+        ''', (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        for profile_id, title, snippet, author in rows:
+            last_id = profile_id
+            resolved += 1
+            lead_id = profile_id
+            name = name_key(title, author)
+            text_shingles = shingles(profile_text(title, snippet))
+            signature = minhash(text_shingles)
+            # Without a name there is nothing to tell two people with the same headline apart
+            if name and signature is not None:
+                buckets = band_buckets(name, signature)
+                leads = _matching_leads(conn, name, text_shingles, buckets, threshold)
+                if leads:
+                    lead_id = min(leads)
+                    merged += 1
+                    others = sorted(leads - {lead_id})
+                    if others:
+                        conn.execute(f"UPDATE profiles SET lead_id = ? WHERE lead_id IN ({','.join('?' * len(others))})",
+                                     [lead_id] + others)
+                        conn.executemany('''
+                            INSERT OR REPLACE INTO lead_merges (lead_id, merged_into, profile_id)
+                            VALUES (?, ?, ?)
+                        ''', [(other, lead_id, profile_id) for other in others])
+                conn.executemany('INSERT OR IGNORE INTO lead_buckets (bucket, profile_id) VALUES (?, ?)',
+                                 [(bucket, profile_id) for bucket in buckets])
+            conn.execute('UPDATE profiles SET lead_id = ? WHERE id = ?', (lead_id, profile_id))
+
+    leads = conn.execute('SELECT COUNT(DISTINCT COALESCE(lead_id, id)) FROM profiles').fetchone()[0]
+    return {'resolved': resolved, 'merged': merged, 'leads': leads}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster duplicate LinkedIn profiles into leads")
+    parser.add_argument('db', nargs='?', default='linkedin_leads.db')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Jaccard similarity of title+snippet word bigrams needed to merge same-name profiles")
+    parser.add_argument('--rebuild', action='store_true', help="discard existing clusters and resolve every profile")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database file '{args.db}' not found!")
+        return
+
+    conn = sqlite3.connect(args.db)
+    try:
+        migrate_database(conn)
+        stats = resolve_leads(conn, threshold=args.threshold, rebuild=args.rebuild)
+        conn.commit()
+        profiles = conn.execute('SELECT COUNT(*) FROM profiles').fetchone()[0]
+    finally:
+        conn.close()
+
+    print(f"✅ Resolved {stats['resolved']} profiles in {args.db}")
+    print(f"   - Merged into an existing lead: {stats['merged']}")
+    print(f"   📋 profiles: {profiles}, leads: {stats['leads']} ({profiles - stats['leads']} duplicates)")
+
+
+if __name__ == "__main__":
+    main()
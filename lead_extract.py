@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Lead Field Extraction
+Parses each profile's LinkedIn title line ("Name - Role - Company | LinkedIn")
+and snippet into name, headline, company, location and matched-role columns,
+without an LLM call. The session's own job roles and company names are compiled
+into one multi-pattern matcher: the patterns go into a character trie that is
+emitted as a single regex with shared prefixes factored out, so each text is
+scanned once in C however many roles and companies there are.
+
+Usage:
+    python lead_extract.py [linkedin_leads.db] [--session ID]   # (re)extract stored profiles
+"""
+
+import argparse
+import os
+import json
+import re
+import sqlite3
+
+from lead_store import migrate_database
+
+EXTRACT_BATCH = 5000
+EXTRACTED_FIELDS = ('name', 'headline', 'company', 'location', 'matched_role')
+
+_TITLE_SUFFIX_RE = re.compile(r'\s*[|\-–]\s*LinkedIn\s*$', re.IGNORECASE)
+_TITLE_SPLIT_RE = re.compile(r'\s+[-–|]\s+')
+_AT_COMPANY_RE = re.compile(r'\s+(?:at|@)\s+(.+)$', re.IGNORECASE)
+_LOCATION_RES = (
+    re.compile(r'Location:\s*([^·|\n]+?)\s*(?:[·|\n]|\.(?:\s|$)|$)'),
+    re.compile(r'\b(Greater [\w .]+? Area)\b'),
+    # A sentence that is just "City, State[, Country]"
+    re.compile(r'(?:^|[.·|]\s+)([A-Z][\w\'’ -]*(?:, [A-Z][\w\'’ -]*){1,2})\s*(?=[.·|\n]|$)'),
+)
+_SPACE_RE = re.compile(r'\s+')
+
+
+def _trie_pattern(node):
+    """Regex for a trie node; '' marks the end of a pattern"""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # Greedy optional tail: the longest pattern at a position wins
+        return f'(?:{body})?'
+    return body
+
+
+class MultiPatternMatcher:
+    """Case-insensitive whole-word matcher for a list of phrases, returning their original spelling"""
+
+    def __init__(self, patterns):
+        self.canonical = {}
+        for pattern in patterns:
+            key = _SPACE_RE.sub(' ', (pattern or '').strip()).lower()
+            if key:
+                self.canonical.setdefault(key, pattern.strip())
+        trie = {}
+        for key in self.canonical:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        self.regex = re.compile(r'(?<!\w)' + _trie_pattern(trie) + r'(?!\w)', re.IGNORECASE) if trie else None
+
+    def __bool__(self):
+        return self.regex is not None
+
+    def search(self, text):
+        """Original spelling of the first phrase found in text, or None"""
+        if self.regex is None or not text:
+            return None
+        match = self.regex.search(text)
+        return self.canonical.get(_SPACE_RE.sub(' ', match.group(0)).lower()) if match else None
+
+    def findall(self, text):
+        if self.regex is None or not text:
+            return []
+        return [self.canonical.get(_SPACE_RE.sub(' ', found).lower()) for found in self.regex.findall(text)]
+
+
+def parse_title(title):
+    """Split a LinkedIn result title into (name, headline, company); missing parts are None"""
+    if not title:
+        return None, None, None
+    parts = [part.strip() for part in _TITLE_SPLIT_RE.split(_TITLE_SUFFIX_RE.sub('', title.strip())) if part.strip()]
+    if not parts:
+        return None, None, None
+    name = parts[0]
+    if len(parts) == 1:
+        return name, None, None
+    if len(parts) == 2:
+        headline, company = parts[1], None
+    else:
+        headline, company = ' - '.join(parts[1:-1]), parts[-1]
+    if company is None:
+        at = _AT_COMPANY_RE.search(headline)
+        if at:
+            company = at.group(1).strip()
+    return name, headline, company
+
+
+def parse_location(snippet):
+    if not snippet:
+        return None
+    for regex in _LOCATION_RES:
+        match = regex.search(snippet)
+        if match:
+            return match.group(1).strip(' .')
+    return None
+
+
+class LeadExtractor:
+    """Extracts EXTRACTED_FIELDS from (title, snippet), matching the session's roles and companies"""
+
+    def __init__(self, job_roles=(), company_names=()):
+        self.roles = MultiPatternMatcher(job_roles)
+        self.companies = MultiPatternMatcher(company_names)
+
+    def extract(self, title, snippet):
+        name, headline, company = parse_title(title)
+        # Prefer a known company name (in its generated spelling) over the raw title text
+        known = self.companies.search(company) or self.companies.search(headline)
+        if known or company is None:
+            company = known or self.companies.search(snippet)
+        role = self.roles.search(headline) or self.roles.search(snippet)
+        return name, headline, company, parse_location(snippet), role
+
+    def extract_batch(self, rows):
+        """[(id, title, snippet)] -> [(name, headline, company, location, matched_role, id)] for an UPDATE"""
+        extract = self.extract
+        return [extract(title, snippet) + (row_id,) for row_id, title, snippet in rows]
+
+
+# A session whose roles don't match keeps the role another session matched
+UPDATE_FIELDS_SQL = '''
+    UPDATE profiles SET name = ?, headline = ?, company = ?, location = ?,
+                        matched_role = COALESCE(?, matched_role)
+    WHERE id = ?
+'''
+
+
+def session_lists(conn, session_id):
+    """The job roles and company names a session generated (empty for sessions without them)"""
+    row = conn.execute('SELECT job_roles, company_names FROM search_sessions WHERE id = ?',
+                       (session_id,)).fetchone()
+    if row is None:
+        return [], []
+    return json.loads(row[0] or '[]') or [], json.loads(row[1] or '[]') or []
+
+
+def extract_session(conn, session_id, batch_size=EXTRACT_BATCH):
+    """Fill the extracted columns of every profile a session found; returns the number updated"""
+    extractor = LeadExtractor(*session_lists(conn, session_id))
+    cursor = conn.execute('''
+        SELECT id, title, snippet FROM profiles
+        WHERE id IN (SELECT profile_id FROM hits WHERE session_id = ?)
+    ''', (session_id,))
+    # Read everything first: updating profiles while the same table is being scanned is unsafe
+    rows = cursor.fetchall()
+    for start in range(0, len(rows), batch_size):
+        conn.executemany(UPDATE_FIELDS_SQL, extractor.extract_batch(rows[start:start + batch_size]))
+    return len(rows)
+
+
+def extract_missing(conn, batch_size=EXTRACT_BATCH):
+    """
+    Parse profiles never extracted (e.g. stored before extraction existed), without role matching,
+    batch_size at a time in id order; returns the number parsed
+    """
+    extractor = LeadExtractor()
+    last_id = 0
+    total = 0
+    while True:
+        rows = conn.execute('''
+            SELECT id, title, snippet FROM profiles
+            WHERE name IS NULL AND headline IS NULL AND title IS NOT NULL AND id > ?
+            ORDER BY id LIMIT ?
+        ''', (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        conn.executemany(UPDATE_FIELDS_SQL, extractor.extract_batch(rows))
+        last_id = rows[-1][0]
+        total += len(rows)
+    return total
+
+
+def extract_all(conn, batch_size=EXTRACT_BATCH):
+    """Extract every profile: plain parsing first, then each session's matches, oldest session first"""
+    extractor = LeadExtractor()
+    last_id = 0
+    total = 0
+    while True:
+        rows = conn.execute('SELECT id, title, snippet FROM profiles WHERE id > ? ORDER BY id LIMIT ?',
+                            (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        conn.executemany(UPDATE_FIELDS_SQL, extractor.extract_batch(rows))
+        last_id = rows[-1][0]
+        total += len(rows)
+    for (session_id,) in conn.execute('SELECT id FROM search_sessions ORDER BY id').fetchall():
+        extract_session(conn, session_id, batch_size)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse name, headline, company, location and role out of stored profiles")
+    parser.add_argument('db', nargs='?', default='linkedin_leads.db')
+    parser.add_argument('--session', type=int, help="only the profiles found by this session")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database file '{args.db}' not found!")
+        return
+
+    conn = sqlite3.connect(args.db)
+    try:
+        migrate_database(conn)
+        if args.session is not None:
+            count = extract_session(conn, args.session)
+        else:
+            count = extract_all(conn)
+        conn.commit()
+        filled = conn.execute('''
+            SELECT COUNT(name), COUNT(headline), COUNT(company), COUNT(location), COUNT(matched_role)
+            FROM profiles
+        ''').fetchone()
+    finally:
+        conn.close()
+
+    print(f"✅ Extracted fields for {count} profiles in {args.db}")
+    for field, filled_count in zip(EXTRACTED_FIELDS, filled):
+        print(f"   - {field}: {filled_count} profiles")
+
+
+if __name__ == "__main__":
+    main()
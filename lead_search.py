@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Lead Search
+Ranked full-text search over stored profiles, through the profiles_fts FTS5
+index that lead_store keeps in sync on every save. Results can be filtered by
+session, search query, date seen and score, and are paged so a query stays
+fast however many profiles match.
+
+Usage:
+    python lead_search.py "devops infosys pune" [--db linkedin_leads.db] [--session ID]
+        [--query TEXT] [--since 2026-01-01] [--until 2026-03-31] [--min-score 0.3]
+        [--page 1] [--limit 20] [--raw] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+
+from lead_store import migrate_database
+
+PAGE_SIZE = 20
+# bm25 weights for the title, snippet and author columns: a hit in the headline counts most
+RANK_WEIGHTS = (5.0, 1.0, 3.0)
+# Matches ranked per search. bm25 costs about 2 ms per 1,000 matches, so beyond this only the
+# newest ones are ranked and the result says so ('truncated'); add words or filters to narrow it
+RANK_LIMIT = 15000
+
+_TOKEN_RE = re.compile(r'[^\s"]+\*?')
+RESULT_FIELDS = ('id', 'lead_id', 'name', 'headline', 'company', 'location', 'url', 'best_score',
+                 'first_seen', 'last_seen', 'excerpt')
+
+
+def fts_query(text):
+    """
+    Turn free text into an FTS5 query matching every word: each word is quoted, so
+    punctuation ("c++", "ai-ml") can't break the syntax; a trailing * keeps prefix search
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(text or ''):
+        prefix = token.endswith('*')
+        word = token.rstrip('*')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return ' '.join(terms)
+
+
+def _day_end(date):
+    """'2026-03-31' -> '2026-03-31 23:59:59' so an until date includes that whole day"""
+    return f"{date} 23:59:59" if date and len(date) == 10 else date
+
+
+def search_leads(conn, text=None, session_id=None, query=None, since=None, until=None,
+                 min_score=None, page=1, limit=PAGE_SIZE, raw=False, rank_limit=RANK_LIMIT):
+    """
+    Profiles matching text (best bm25 rank first) or, without text, all profiles by best score,
+    narrowed by the filters:
+      session_id  found by that session
+      query       found by a search query containing this text
+      since/until seen during the period (last_seen >= since, first_seen <= until)
+      min_score   best_score at least this
+    raw passes text to FTS5 unchanged (AND/OR/NOT, NEAR, column filters). Up to rank_limit
+    matches that pass the filters are ranked, the newest ones when there are more (deep pages
+    widen it); 'truncated' tells when older matches were left out.
+    Returns {'results': [dict], 'page', 'has_more', 'truncated'}.
+    """
+    page = max(1, page)
+    offset = (page - 1) * limit
+    match = (text if raw else fts_query(text)) if text else ''
+
+    conditions = []
+    params = []
+    # Session and query filters are one lookup in hits. Text matches probe it per candidate;
+    # otherwise the matching hits are collected first (the session's index narrows them)
+    hit_conditions = []
+    if session_id is not None:
+        hit_conditions.append('session_id = ?')
+        params.append(session_id)
+    if query:
+        hit_conditions.append("query LIKE '%' || ? || '%'")
+        params.append(query)
+    if hit_conditions and match:
+        conditions.append(f"EXISTS (SELECT 1 FROM hits WHERE profile_id = p.id AND {' AND '.join(hit_conditions)})")
+    elif hit_conditions:
+        conditions.append(f"p.id IN (SELECT profile_id FROM hits WHERE {' AND '.join(hit_conditions)})")
+    if session_id is not None and match:
+        # The session's profiles lie between these ids: FTS5 can seek to the range instead of
+        # walking every match of a common word
+        low, high = conn.execute('SELECT MIN(profile_id), MAX(profile_id) FROM hits WHERE session_id = ?',
+                                 (session_id,)).fetchone()
+        conditions.append('profiles_fts.rowid BETWEEN ? AND ?')
+        params += [low, high]
+    if since:
+        conditions.append('p.last_seen >= ?')
+        params.append(since)
+    if until:
+        conditions.append('p.first_seen <= ?')
+        params.append(_day_end(until))
+    if min_score is not None:
+        conditions.append('p.best_score >= ?')
+        params.append(min_score)
+
+    columns = ('p.id, p.lead_id, p.name, p.headline, p.company, p.location, p.url, p.best_score, '
+               'p.first_seen, p.last_seen')
+    if not match:
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        rows = conn.execute(f'''
+            SELECT {columns}, substr(p.snippet, 1, 120) AS excerpt
+            FROM profiles p {where}
+            ORDER BY p.best_score DESC, p.id
+            LIMIT ? OFFSET ?
+        ''', params + [limit + 1, offset]).fetchall()
+        return _page(rows, page, limit)
+
+    # Filter the newest matches up to the window (rowid order is free in FTS5), rank them with
+    # bm25 inside SQLite and keep only the page's ids; profiles is read only when a filter needs it
+    weights = ', '.join(str(weight) for weight in RANK_WEIGHTS)
+    filtered = hit_conditions or since or until or min_score is not None
+    join = 'JOIN profiles p ON p.id = profiles_fts.rowid' if filtered else ''
+    where = f"profiles_fts MATCH ? {''.join(' AND ' + condition for condition in conditions)}"
+    window = max(rank_limit, offset + limit + 1)
+    # One candidate past the window tells whether older matches were left out
+    rows = conn.execute(f'''
+        WITH candidates AS MATERIALIZED (
+            SELECT profiles_fts.rowid AS id, bm25(profiles_fts, {weights}) AS rank
+            FROM profiles_fts {join}
+            WHERE {where}
+            ORDER BY profiles_fts.rowid DESC LIMIT ?
+        ),
+        ranked AS (
+            SELECT id, rank FROM candidates ORDER BY id DESC LIMIT ?
+        )
+        SELECT id, (SELECT COUNT(*) FROM candidates) FROM ranked ORDER BY rank, id LIMIT ? OFFSET ?
+    ''', [match] + params + [window + 1, window, limit + 1, offset]).fetchall()
+    if not rows:
+        return _page([], page, limit)
+    ids = [row[0] for row in rows]
+    truncated = rows[0][1] > window
+
+    # Excerpts in one more pass over the page's id range; the unary + keeps SQLite from handing
+    # the id list to FTS5, which would re-expand the query (costly for prefix terms) once per id
+    by_id = {row[0]: row for row in conn.execute(f'''
+        SELECT {columns}, snippet(profiles_fts, 1, '[', ']', '…', 16) AS excerpt
+        FROM profiles_fts JOIN profiles p ON p.id = profiles_fts.rowid
+        WHERE profiles_fts MATCH ? AND profiles_fts.rowid BETWEEN ? AND ?
+          AND +profiles_fts.rowid IN ({','.join('?' * len(ids))})
+    ''', [match, min(ids), max(ids)] + ids)}
+    return _page([by_id[profile_id] for profile_id in ids if profile_id in by_id], page, limit, truncated)
+
+
+def _page(rows, page, limit, truncated=False):
+    # One extra row tells whether there is a next page without counting every match
+    return {
+        'results': [dict(zip(RESULT_FIELDS, row)) for row in rows[:limit]],
+        'page': page,
+        'has_more': len(rows) > limit,
+        'truncated': truncated,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search stored LinkedIn leads")
+    parser.add_argument('text', nargs='?', default=None, help="words to match in title, snippet and author")
+    parser.add_argument('--db', default='linkedin_leads.db', help="SQLite database to search")
+    parser.add_argument('--session', type=int, help="only profiles found by this session")
+    parser.add_argument('--query', help="only profiles found by a search query containing this text")
+    parser.add_argument('--since', help="only profiles seen on or after this date (YYYY-MM-DD)")
+    parser.add_argument('--until', help="only profiles first seen on or before this date (YYYY-MM-DD)")
+    parser.add_argument('--min-score', type=float, help="minimum best relevance score")
+    parser.add_argument('--page', type=int, default=1)
+    parser.add_argument('--limit', type=int, default=PAGE_SIZE, help="results per page")
+    parser.add_argument('--raw', action='store_true', help="pass the text to FTS5 as query syntax")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database file '{args.db}' not found!")
+        return
+
+    conn = sqlite3.connect(args.db)
+    try:
+        migrate_database(conn)
+        found = search_leads(conn, args.text, session_id=args.session, query=args.query, since=args.since,
+                             until=args.until, min_score=args.min_score, page=args.page,
+                             limit=args.limit, raw=args.raw)
+    except sqlite3.OperationalError as e:
+        # Malformed --raw FTS5 syntax
+        print(f"❌ Search failed: {str(e)}")
+        return
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps(found, indent=2, ensure_ascii=False))
+        return
+
+    results = found['results']
+    if not results:
+        print("🔍 No matching leads")
+        return
+    first = (found['page'] - 1) * args.limit + 1
+    print(f"🔍 Leads {first}-{first + len(results) - 1}{' (more on the next page)' if found['has_more'] else ''}")
+    if found['truncated']:
+        print(f"⚠️  Over {RANK_LIMIT} matches: only the newest were ranked; add words or filters to narrow the search")
+    print()
+    for number, lead in enumerate(results, first):
+        headline = ' · '.join(part for part in (lead['headline'], lead['company'], lead['location']) if part)
+        print(f"{number}. {lead['name'] or lead['url']} (score {lead['best_score'] or 0:.2f})")
+        if headline:
+            print(f"   {headline}")
+        print(f"   🔗 {lead['url']}")
+        if lead['excerpt']:
+            print(f"   {lead['excerpt']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Lead Research Service
+Runs the pipeline as a long-lived HTTP service. Jobs are queued and run on a
+shared worker pool, so every job reuses one database writer, the Groq and Exa
+caches, the LLM provider's keep-alive connections and a single Exa rate limit.
+Python startup and init_database() are paid once, not per query.
+
+    POST   /jobs                {"query": "...", "budget": 20, "pack": false} -> 202 {"id": ...}
+    GET    /jobs                recent jobs, newest first (?limit=50)
+    GET    /jobs/{id}           status, stage and per-query progress
+    GET    /jobs/{id}/results   profiles found so far as NDJSON; ?follow=1 streams until the job ends
+    DELETE /jobs/{id}           cancel; a running job keeps what it found and its session stays resumable
+    GET    /metrics             Prometheus text for everything the service has run
+    GET    /health
+
+SIGTERM or Ctrl-C stops accepting jobs, checkpoints running sessions as
+interrupted and leaves queued jobs queued; the next start picks both up again.
+
+Usage:
+    python lead_service.py [--host 127.0.0.1] [--port 8080] [--workers 4]
+    python lead_service.py --mock-groq --fake-exa    # local stub backends, no API keys needed
+"""
+
+import argparse
+import json
+import math
+import signal
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import linkedin_lead_generator as llg
+from llm_providers import LLM_PROVIDERS
+from query_packing import pack_queries
+from search_engine import TokenBucket
+
+SERVICE_WORKERS = 4
+# Seconds between database polls while a ?follow=1 results stream waits for new hits
+FOLLOW_POLL_INTERVAL = 1.0
+RESULTS_BATCH = 500
+
+FINISHED = ('completed', 'failed', 'cancelled')
+# Picked up again when the service starts; 'running' means the last process died mid-job
+UNFINISHED = ('queued', 'running', 'interrupted')
+JOB_COLUMNS = ('id', 'user_query', 'options', 'status', 'session_id', 'error',
+               'created_at', 'started_at', 'finished_at')
+
+RESULTS_SQL = '''
+    SELECT h.id, p.id, p.lead_id, p.name, p.headline, p.company, p.location, p.url, p.title,
+           h.score, h.query
+    FROM hits h JOIN profiles p ON p.id = h.profile_id
+    WHERE h.session_id = ? AND h.id > ?
+    ORDER BY h.id LIMIT ?
+'''
+RESULT_FIELDS = ('hit_id', 'profile_id', 'lead_id', 'name', 'headline', 'company', 'location', 'url',
+                 'title', 'score', 'query')
+
+
+def _now():
+    """UTC timestamp in SQLite's CURRENT_TIMESTAMP format"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+
+
+def job_progress(conn, session_id):
+    """Query and profile counts of a job's session, from its checkpoints"""
+    if session_id is None:
+        return None
+    total, done, failed, results = conn.execute('''
+        SELECT COUNT(*), SUM(status = 'done'), SUM(status = 'failed'), SUM(results)
+        FROM session_queries WHERE session_id = ?
+    ''', (session_id,)).fetchone()
+    row = conn.execute('SELECT budget, status FROM search_sessions WHERE id = ?', (session_id,)).fetchone()
+    profiles = conn.execute('SELECT COUNT(DISTINCT profile_id) FROM hits WHERE session_id = ?',
+                            (session_id,)).fetchone()[0]
+    return {
+        'queries': total, 'budget': row[0] if row else None, 'done': done or 0, 'failed': failed or 0,
+        'results': results or 0, 'profiles': profiles, 'session_status': row[1] if row else None,
+    }
+
+
+class Job:
+    """One user query submitted to the service; stop is set to cancel it or on shutdown"""
+
+    def __init__(self, id, user_query, options=None, status='queued', session_id=None, error=None,
+                 created_at=None, started_at=None, finished_at=None):
+        self.id = id
+        self.user_query = user_query
+        self.options = json.loads(options) if isinstance(options, str) else (options or {})
+        self.status = status
+        self.session_id = session_id
+        self.error = error
+        self.created_at = created_at or _now()
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.stage = None
+        self.cancelled = False
+        self.stop = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    def to_dict(self):
+        return {
+            'id': self.id, 'user_query': self.user_query, 'options': self.options, 'status': self.status,
+            'stage': self.stage, 'session_id': self.session_id, 'error': self.error,
+            'created_at': self.created_at, 'started_at': self.started_at, 'finished_at': self.finished_at,
+        }
+
+
+class LeadService(ThreadingHTTPServer):
+    """
+    HTTP front end plus the job queue. Jobs run on a pool of `workers` threads and
+    share the pipeline's module-level writer, caches and LLM provider; `client` is the
+    Exa client (None for the real one), and one TokenBucket keeps all jobs under
+    EXA_RATE_LIMIT together.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 8080), workers=SERVICE_WORKERS, client=None):
+        super().__init__(address, LeadServiceHandler)
+        self.workers = workers
+        self.client = client
+        self.limiter = TokenBucket(llg.EXA_RATE_LIMIT, llg.EXA_BURST)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lead-job')
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.accepting = True
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a background thread; returns self"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def submit(self, user_query, options=None):
+        """Checkpoint a new job as queued and hand it to the pool"""
+        job = Job(uuid.uuid4().hex[:12], user_query, options)
+        llg.get_db_writer().call(lambda conn: conn.execute(
+            'INSERT INTO service_jobs (id, user_query, options, status, created_at) VALUES (?, ?, ?, ?, ?)',
+            (job.id, job.user_query, json.dumps(job.options), job.status, job.created_at)))
+        self._enqueue(job)
+        return job
+
+    def requeue(self):
+        """Queue the jobs a previous process left queued, running or interrupted; returns how many"""
+        conn = sqlite3.connect(llg.DB_NAME)
+        try:
+            rows = conn.execute(f'''
+                SELECT {', '.join(JOB_COLUMNS)} FROM service_jobs
+                WHERE status IN ({','.join('?' * len(UNFINISHED))}) ORDER BY created_at, rowid
+            ''', UNFINISHED).fetchall()
+        finally:
+            conn.close()
+        for row in rows:
+            job = Job(*row)
+            job.status = 'queued'
+            self._enqueue(job)
+        return len(rows)
+
+    def _enqueue(self, job):
+        with self.lock:
+            self.jobs[job.id] = job
+        self.pool.submit(self.run_job, job)
+
+    def get(self, job_id):
+        """A job of this process, else one stored by an earlier one; None if unknown"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is not None:
+            return job
+        conn = sqlite3.connect(llg.DB_NAME)
+        try:
+            row = conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM service_jobs WHERE id = ?",
+                               (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return Job(*row) if row else None
+
+    def list_jobs(self, limit=50):
+        conn = sqlite3.connect(llg.DB_NAME)
+        try:
+            rows = conn.execute(f'''
+                SELECT {', '.join(JOB_COLUMNS)} FROM service_jobs ORDER BY created_at DESC, rowid DESC LIMIT ?
+            ''', (limit,)).fetchall()
+        finally:
+            conn.close()
+        with self.lock:
+            # Live jobs know their stage, and a status change may not be committed yet
+            return [self.jobs.get(row[0]) or Job(*row) for row in rows]
+
+    def cancel(self, job):
+        """Stop a job: a queued one never starts, a running one stops before its next search batch"""
+        job.cancelled = True
+        job.stop.set()
+        if job.status == 'queued':
+            self.update(job, status='cancelled', finished_at=_now())
+
+    def update(self, job, **fields):
+        """Set job attributes and checkpoint the stored ones"""
+        for name, value in fields.items():
+            setattr(job, name, value)
+        stored = [name for name in fields if name in JOB_COLUMNS]
+        if stored:
+            values = [getattr(job, name) for name in stored]
+            llg.get_db_writer().call(lambda conn: conn.execute(
+                f"UPDATE service_jobs SET {', '.join(name + ' = ?' for name in stored)} WHERE id = ?",
+                values + [job.id]))
+
+    def run_job(self, job):
+        """Worker: LLM stages and a checkpointed session, then the search; a job with a session resumes it"""
+        if job.stop.is_set():
+            return
+        self.update(job, status='running', started_at=_now(), error=None,
+                    stage='llm' if job.session_id is None else 'search')
+        print(f"\n🧵 Job {job.id}: '{job.user_query[:60]}'")
+        error = None
+        try:
+            if job.session_id is None:
+                queries, packed, budget = self.prepare(job)
+            else:
+                session = llg.load_session(job.session_id)
+                if session is None:
+                    raise ValueError(f"session #{job.session_id} no longer exists")
+                queries, packed, budget = session['queries'], session['packed'], session.get('budget')
+                llg.set_session_status(job.session_id, 'searching')
+            self.update(job, stage='search')
+            llg.search_with_rate_limiting(queries, job.user_query, client=self.client, budget=budget,
+                                          packed=packed, session_id=job.session_id,
+                                          limiter=self.limiter, stop=job.stop)
+            conn = sqlite3.connect(llg.DB_NAME)
+            try:
+                status = conn.execute('SELECT status FROM search_sessions WHERE id = ?',
+                                      (job.session_id,)).fetchone()[0]
+            finally:
+                conn.close()
+        except llg.SearchInterrupted:
+            # run_search_plan already checkpointed the session as interrupted
+            status = 'cancelled' if job.cancelled else 'interrupted'
+        except (Exception, SystemExit) as e:
+            # A Groq outage, an unrepairable reply or a missing prompt only fails this job
+            status, error = 'failed', str(e) or type(e).__name__
+            if job.session_id is not None:
+                llg.set_session_status(job.session_id, 'failed')
+        self.update(job, status=status, stage=None, error=error,
+                    finished_at=_now() if status in FINISHED else None)
+        print(f"🧵 Job {job.id} {status}" + (f": {error}" if error else ""))
+
+    def prepare(self, job):
+        """Steps 1-4 for a job: LLM stages, dorked queries and the session checkpoint"""
+        outputs, _ = llg.run_llm_stages(job.user_query)
+        job_roles = outputs['job_roles']
+        company_names = outputs['company_names']
+        with llg.metrics.span('dorking'):
+            queries = llg.generate_dorked_queries(job_roles, company_names)
+            packed = {}
+            if job.options.get('pack', llg.EXA_PACK_QUERIES):
+                packed = {p.query: p for p in pack_queries(job_roles, company_names,
+                                                           max_length=llg.EXA_MAX_QUERY_LENGTH)}
+                queries = list(packed)
+        budget = job.options.get('budget') or llg.EXA_QUERY_BUDGET or math.ceil(len(queries) / 4)
+        session_id = llg.create_session(
+            job.user_query, queries,
+            variables=outputs['variables'], descriptions=outputs['descriptions'],
+            job_roles=job_roles, company_names=company_names, packed=packed, budget=budget
+        )
+        self.update(job, session_id=session_id)
+        return queries, packed, budget
+
+    def drain(self):
+        """Stop taking jobs, stop running ones between search batches and wait for their checkpoints"""
+        self.accepting = False
+        with self.lock:
+            jobs = list(self.jobs.values())
+        running = [job for job in jobs if job.status == 'running']
+        if running:
+            print(f"⏳ Waiting for {len(running)} running jobs to checkpoint...")
+        for job in jobs:
+            job.stop.set()
+        # Queued jobs stay queued in service_jobs for the next start
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class LeadServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type='application/json'):
+        data = (json.dumps(body, ensure_ascii=False) if content_type == 'application/json' else body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, message):
+        self._send(status, {'error': message})
+
+    def _route(self):
+        """(path parts, query parameters) of the request"""
+        url = urlparse(self.path)
+        return [part for part in url.path.split('/') if part], parse_qs(url.query)
+
+    def _job(self, job_id):
+        job = self.server.get(job_id)
+        if job is None:
+            self._error(404, f"no job '{job_id}'")
+        return job
+
+    def do_POST(self):
+        parts, _ = self._route()
+        if parts != ['jobs']:
+            self._error(404, f"no route POST {self.path}")
+            return
+        if not self.server.accepting:
+            self._error(503, "service is shutting down")
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            self._error(400, "invalid JSON body")
+            return
+        user_query = body.get('query') if isinstance(body, dict) else None
+        if not isinstance(user_query, str) or not user_query.strip():
+            self._error(400, "'query' must be a non-empty string")
+            return
+        options = {}
+        if body.get('budget') is not None:
+            if not isinstance(body['budget'], int) or body['budget'] < 1:
+                self._error(400, "'budget' must be a positive integer")
+                return
+            options['budget'] = body['budget']
+        if body.get('pack') is not None:
+            options['pack'] = bool(body['pack'])
+        job = self.server.submit(user_query.strip(), options)
+        self._send(202, job.to_dict())
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        if len(parts) != 2 or parts[0] != 'jobs':
+            self._error(404, f"no route DELETE {self.path}")
+            return
+        job = self._job(parts[1])
+        if job is None:
+            return
+        if job.finished:
+            self._error(409, f"job is already {job.status}")
+            return
+        self.server.cancel(job)
+        self._send(202, job.to_dict())
+
+    def _int_param(self, params, name, default, minimum=0):
+        """A query string integer, or None after answering 400 when it isn't one"""
+        try:
+            value = int(params.get(name, [str(default)])[0])
+        except ValueError:
+            value = None
+        if value is None or value < minimum:
+            self._error(400, f"'{name}' must be an integer >= {minimum}")
+            return None
+        return value
+
+    def do_GET(self):
+        parts, params = self._route()
+        if parts == ['health']:
+            self._send(200, {'status': 'ok' if self.server.accepting else 'draining',
+                             'workers': self.server.workers})
+        elif parts == ['metrics']:
+            llg.record_run_metrics()
+            self._send(200, llg.metrics.to_prometheus(), content_type='text/plain; version=0.0.4')
+        elif parts == ['jobs']:
+            limit = self._int_param(params, 'limit', 50, minimum=1)
+            if limit is None:
+                return
+            self._send(200, {'jobs': [job.to_dict() for job in self.server.list_jobs(limit)]})
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self._job(parts[1])
+            if job is not None:
+                conn = sqlite3.connect(llg.DB_NAME)
+                try:
+                    self._send(200, dict(job.to_dict(), progress=job_progress(conn, job.session_id)))
+                finally:
+                    conn.close()
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'results':
+            job = self._job(parts[1])
+            after = self._int_param(params, 'after', 0) if job is not None else None
+            if after is not None:
+                self.stream_results(job, follow=params.get('follow', ['0'])[0] in ('1', 'true'), after=after)
+        else:
+            self._error(404, f"no route GET {self.path}")
+
+    def stream_results(self, job, follow=False, after=0):
+        """
+        Write the job's profiles as NDJSON, one line per profile in the order they were found.
+        name/headline/company/location are filled once the job's search has finished.
+        With follow, keep polling for new hits until the job stops; `after` resumes from a hit_id.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        seen = set()
+        conn = sqlite3.connect(llg.DB_NAME)
+        try:
+            while True:
+                # Read the job's state before the hits, so the last batch of a finished job isn't missed
+                stopped = job.status not in ('queued', 'running')
+                rows = conn.execute(RESULTS_SQL, (job.session_id, after, RESULTS_BATCH)).fetchall() \
+                    if job.session_id is not None else []
+                for row in rows:
+                    after = row[0]
+                    if row[1] not in seen:
+                        seen.add(row[1])
+                        self.wfile.write((json.dumps(dict(zip(RESULT_FIELDS, row)), ensure_ascii=False)
+                                          + '\n').encode('utf-8'))
+                self.wfile.flush()
+                if len(rows) == RESULTS_BATCH:
+                    continue
+                if not follow or stopped or not self.server.accepting:
+                    break
+                time.sleep(FOLLOW_POLL_INTERVAL)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            conn.close()
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve LinkedIn lead research jobs over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=SERVICE_WORKERS, help="jobs run at once")
+    parser.add_argument('--no-requeue', action='store_true',
+                        help="don't pick up jobs a previous run left queued or interrupted")
+    parser.add_argument('--fake-exa', action='store_true', help="answer searches with the offline fake Exa client")
+    parser.add_argument('--exa-latency', type=float, default=0.0, help="simulated latency of --fake-exa calls")
+    parser.add_argument('--mock-groq', action='store_true',
+                        help="start a local mock Groq server and send LLM calls to it")
+    parser.add_argument('--metrics', metavar='FILE', default=llg.METRICS_FILE or None,
+                        help="also write the service's metrics to FILE at shutdown")
+    args = parser.parse_args()
+
+    mock = None
+    if args.mock_groq:
+        # Test stubs load only when asked for
+        from mock_groq_server import MockGroqServer
+        mock = MockGroqServer().start()
+        llg.LLM_PROVIDER = 'groq'
+        llg.GROQ_API_URL = mock.url
+        print(f"🧪 Mock Groq server at {mock.url}")
+    if llg.LLM_PROVIDER not in LLM_PROVIDERS:
+        print(f"❌ Unknown LLM_PROVIDER '{llg.LLM_PROVIDER}' (choose from {', '.join(LLM_PROVIDERS)})")
+        return
+
+    llg.init_database()
+    client = None
+    if args.fake_exa:
+        from fake_exa import FakeExa
+        client = FakeExa(latency=args.exa_latency)
+    service = LeadService((args.host, args.port), workers=args.workers, client=client)
+    if not args.no_requeue:
+        requeued = service.requeue()
+        if requeued:
+            print(f"♻️  Requeued {requeued} unfinished jobs")
+    signal.signal(signal.SIGTERM, _interrupt)
+    print(f"🌐 Lead research service on {service.url} ({args.workers} workers)")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down")
+    finally:
+        service.drain()
+        service.server_close()
+        if mock is not None:
+            mock.stop()
+        llg.save_run_metrics(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
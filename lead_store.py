@@ -0,0 +1,827 @@
+#!/usr/bin/env python3
+"""
+Normalized Lead Store
+One `profiles` row per LinkedIn profile (keyed by its canonical /in/ slug) and
+a `hits` link table recording which query and session found it, with what
+score. Also owns the schema migrations for existing databases.
+
+Usage:
+    python lead_store.py [linkedin_leads.db]    # migrate an existing database in place
+"""
+
+import re
+import sqlite3
+import sys
+from urllib.parse import unquote, urlparse
+
+# Bumped whenever migrate_database gains a step; stored in PRAGMA user_version
+SCHEMA_VERSION = 14
+
+_SLUG_RE = re.compile(r'/in/([^/?#]+)')
+_DORK_RE = re.compile(r'intitle:"(.+?)" AND \("(.+?)"')
+
+
+def canonical_profile_slug(url):
+    """Return the lowercase /in/ slug of a LinkedIn profile URL, or None if it isn't one"""
+    if not url:
+        return None
+    parsed = urlparse(url if '://' in url else f'https://{url}')
+    if not parsed.netloc.lower().endswith('linkedin.com'):
+        return None
+    match = _SLUG_RE.search(parsed.path)
+    if not match:
+        return None
+    slug = unquote(match.group(1)).strip().lower()
+    return slug or None
+
+
+def canonical_profile_url(slug):
+    return f"https://www.linkedin.com/in/{slug}"
+
+
+def parse_dorked_query(query):
+    """
+    Recover (job_role, company_name) from a single-pair query built by generate_dorked_queries.
+    Packed queries cover several pairs; their yield is attributed per pair instead (see query_yields).
+    """
+    match = _DORK_RE.search(query.replace('\\"', '"'))
+    if not match:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+def ensure_column(cursor, table, column, declaration):
+    """Add a column to an existing table if it is missing"""
+    columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
+def create_lead_tables(cursor):
+    """Create the profiles/hits tables and the indexes used by export and dedup queries"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS profiles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            slug TEXT NOT NULL UNIQUE,
+            url TEXT NOT NULL,
+            title TEXT,
+            snippet TEXT,
+            author TEXT,
+            best_score REAL DEFAULT 0,
+            times_seen INTEGER DEFAULT 1,
+            first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # session_id 0 marks hits migrated from rows that predate session tracking
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS hits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_id INTEGER NOT NULL REFERENCES profiles(id),
+            query TEXT NOT NULL,
+            session_id INTEGER NOT NULL DEFAULT 0,
+            score REAL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (profile_id, query, session_id)
+        )
+    ''')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_profiles_best_score ON profiles(best_score)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_hits_query ON hits(query)')
+    create_session_index(cursor)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_hits_score ON hits(score)')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_results_url ON search_results(url)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_results_query_score ON search_results(query, score)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_results_session ON search_results(session_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_results_score ON search_results(score)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_results_created_at ON search_results(created_at)')
+
+
+UPSERT_PROFILE_SQL = '''
+    INSERT INTO profiles (slug, url, title, snippet, author, best_score)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(slug) DO UPDATE SET
+        title = CASE WHEN excluded.best_score > profiles.best_score THEN excluded.title ELSE profiles.title END,
+        snippet = CASE WHEN excluded.best_score > profiles.best_score AND excluded.snippet != ''
+                       THEN excluded.snippet ELSE profiles.snippet END,
+        author = COALESCE(NULLIF(profiles.author, ''), excluded.author),
+        best_score = MAX(profiles.best_score, excluded.best_score),
+        times_seen = profiles.times_seen + 1,
+        last_seen = CURRENT_TIMESTAMP
+'''
+
+UPSERT_HIT_SQL = '''
+    INSERT INTO hits (profile_id, query, session_id, score)
+    SELECT id, ?, ?, ? FROM profiles WHERE slug = ?
+    ON CONFLICT(profile_id, query, session_id) DO UPDATE SET
+        score = MAX(hits.score, excluded.score)
+'''
+
+
+def create_session_index(cursor):
+    """hits by session, then profile: a session's profile id range is two index seeks (lead_search)"""
+    cursor.execute('DROP INDEX IF EXISTS idx_hits_session')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_hits_session_profile ON hits(session_id, profile_id)')
+
+
+def create_query_stats_table(cursor):
+    """Per-query yield history used by the query scheduler"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS searched_queries (
+            query TEXT PRIMARY KEY,
+            job_role TEXT,
+            company_name TEXT,
+            searches INTEGER DEFAULT 0,
+            results INTEGER DEFAULT 0,
+            new_profiles INTEGER DEFAULT 0,
+            last_searched TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_searched_queries_role ON searched_queries(job_role)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_searched_queries_company ON searched_queries(company_name)')
+
+
+RECORD_QUERY_SQL = '''
+    INSERT INTO searched_queries (query, job_role, company_name, searches, results, new_profiles)
+    VALUES (?, ?, ?, 1, ?, ?)
+    ON CONFLICT(query) DO UPDATE SET
+        searches = searched_queries.searches + 1,
+        results = searched_queries.results + excluded.results,
+        new_profiles = searched_queries.new_profiles + excluded.new_profiles,
+        last_searched = CURRENT_TIMESTAMP
+'''
+
+
+def create_session_tables(cursor):
+    """Checkpoint state for resumable sessions: LLM outputs on search_sessions, one row per query"""
+    ensure_column(cursor, 'search_sessions', 'status', "TEXT DEFAULT 'completed'")
+    ensure_column(cursor, 'search_sessions', 'budget', 'INTEGER')
+    ensure_column(cursor, 'search_sessions', 'variables', 'TEXT')
+    ensure_column(cursor, 'search_sessions', 'descriptions', 'TEXT')
+    ensure_column(cursor, 'search_sessions', 'job_roles', 'TEXT')
+    ensure_column(cursor, 'search_sessions', 'company_names', 'TEXT')
+    ensure_column(cursor, 'search_sessions', 'updated_at', 'TIMESTAMP')
+
+    # roles/companies are JSON lists: one of each for a pair query, several for a packed one
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS session_queries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL REFERENCES search_sessions(id),
+            position INTEGER NOT NULL,
+            query TEXT NOT NULL,
+            roles TEXT,
+            companies TEXT,
+            packed INTEGER DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'pending',
+            results INTEGER DEFAULT 0,
+            error TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (session_id, query)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_queries_status ON session_queries(session_id, status)')
+
+
+def create_metrics_table(cursor):
+    """One row per counter, gauge, histogram or span recorded during a run"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT NOT NULL,
+            session_id INTEGER,
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL,
+            labels TEXT,
+            value REAL,
+            count INTEGER,
+            sum REAL,
+            p50 REAL,
+            p95 REAL,
+            p99 REAL,
+            start REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_run ON metrics(run_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics(name, created_at)')
+
+
+INSERT_METRIC_SQL = '''
+    INSERT INTO metrics (run_id, session_id, kind, name, labels, value, count, sum, p50, p95, p99, start)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def create_dedup_tables(cursor):
+    """Lead clusters: profiles.lead_id and the LSH bucket index behind it"""
+    ensure_column(cursor, 'profiles', 'lead_id', 'INTEGER')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_profiles_lead ON profiles(lead_id)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS lead_buckets (
+            bucket INTEGER NOT NULL,
+            profile_id INTEGER NOT NULL,
+            PRIMARY KEY (bucket, profile_id)
+        ) WITHOUT ROWID
+    ''')
+
+
+# One row per lead, with the fields of its best-scoring profile; {scope} limits the profiles
+# considered (a WHERE clause on p), which must take in every profile of a lead or none.
+# Unresolved profiles (lead_id NULL) count as leads of their own.
+LEADS_SQL = '''
+    WITH ranked AS (
+        SELECT p.*, COALESCE(p.lead_id, p.id) AS lead,
+               ROW_NUMBER() OVER (PARTITION BY COALESCE(p.lead_id, p.id)
+                                  ORDER BY p.best_score DESC, p.id) AS rank
+        FROM profiles p {scope}
+    ),
+    grouped AS (
+        SELECT lead, MAX(best_score) AS best_score, COUNT(*) AS profiles,
+               SUM(times_seen) AS times_seen, GROUP_CONCAT(url, ' ') AS profile_urls,
+               MIN(first_seen) AS first_seen, MAX(last_seen) AS last_seen
+        FROM ranked GROUP BY lead
+    ),
+    queries AS (
+        SELECT r.lead, COUNT(DISTINCT h.query) AS matching_queries
+        FROM hits h JOIN ranked r ON r.id = h.profile_id
+        GROUP BY r.lead
+    )
+    SELECT r.lead AS lead_id, r.author, r.title, r.url, r.snippet,
+           r.name, r.headline, r.company, r.location, r.matched_role, g.best_score,
+           COALESCE(q.matching_queries, 0) AS matching_queries, g.profiles, g.profile_urls,
+           g.times_seen, g.first_seen, g.last_seen
+    FROM ranked r
+    JOIN grouped g ON g.lead = r.lead
+    LEFT JOIN queries q ON q.lead = r.lead
+    WHERE r.rank = 1
+'''
+
+
+def create_leads_view(cursor):
+    """The leads view over every profile; recreated when profiles gains columns"""
+    cursor.execute('DROP VIEW IF EXISTS leads')
+    cursor.execute(f"CREATE VIEW leads AS {LEADS_SQL.format(scope='')}")
+
+
+def create_extracted_columns(cursor):
+    """Structured fields parsed from each profile's title and snippet (lead_extract.py)"""
+    for column in ('name', 'headline', 'company', 'location', 'matched_role'):
+        ensure_column(cursor, 'profiles', column, 'TEXT')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_profiles_company ON profiles(company)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_profiles_matched_role ON profiles(matched_role)')
+    create_leads_view(cursor)
+
+
+def create_search_index(cursor):
+    """
+    FTS5 index over profiles' title, snippet and author (lead_search.py). It is an
+    external-content table: the text stays in profiles and triggers keep the index
+    in step with every insert, changed upsert and delete.
+    """
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS profiles_fts USING fts5(
+            title, snippet, author,
+            content='profiles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS profiles_fts_insert AFTER INSERT ON profiles BEGIN
+            INSERT INTO profiles_fts (rowid, title, snippet, author)
+            VALUES (new.id, new.title, new.snippet, new.author);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS profiles_fts_delete AFTER DELETE ON profiles BEGIN
+            INSERT INTO profiles_fts (profiles_fts, rowid, title, snippet, author)
+            VALUES ('delete', old.id, old.title, old.snippet, old.author);
+        END
+    ''')
+    # Upserts assign title/snippet/author on every repeat hit; only reindex when the text changed
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS profiles_fts_update AFTER UPDATE OF title, snippet, author ON profiles
+        WHEN old.title IS NOT new.title OR old.snippet IS NOT new.snippet OR old.author IS NOT new.author
+        BEGIN
+            INSERT INTO profiles_fts (profiles_fts, rowid, title, snippet, author)
+            VALUES ('delete', old.id, old.title, old.snippet, old.author);
+            INSERT INTO profiles_fts (rowid, title, snippet, author)
+            VALUES (new.id, new.title, new.snippet, new.author);
+        END
+    ''')
+    cursor.execute("INSERT INTO profiles_fts (profiles_fts) VALUES ('rebuild')")
+
+
+def create_export_tables(cursor):
+    """
+    Incremental export state: a high-water mark per export target (schema 8 also added
+    summary totals here; create_analytics_tables replaced them in schema 11)
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS export_marks (
+            target TEXT PRIMARY KEY,
+            hit_id INTEGER NOT NULL DEFAULT 0,
+            result_id INTEGER NOT NULL DEFAULT 0,
+            session_id INTEGER NOT NULL DEFAULT 0,
+            exports INTEGER NOT NULL DEFAULT 0,
+            exported_at TIMESTAMP
+        )
+    ''')
+    # Lets every export find profiles never run through extraction without scanning the rest
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_profiles_unextracted ON profiles(id)
+        WHERE name IS NULL AND headline IS NULL
+    ''')
+
+
+def create_service_tables(cursor):
+    """Jobs accepted by the HTTP service, so queued and interrupted ones survive a restart"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS service_jobs (
+            id TEXT PRIMARY KEY,
+            user_query TEXT NOT NULL,
+            options TEXT,
+            status TEXT NOT NULL DEFAULT 'queued',
+            session_id INTEGER REFERENCES search_sessions(id),
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_service_jobs_status ON service_jobs(status)')
+
+
+# What a session's Exa searches cost: API requests, adaptive probes and deepened queries, profiles
+# whose contents were fetched or skipped as already known, payload bytes (all, and page text), the
+# stored text bytes of the skipped profiles, and seconds waiting on Exa
+EXA_USAGE_COLUMNS = {
+    'exa_requests': 'INTEGER DEFAULT 0',
+    'exa_probes': 'INTEGER DEFAULT 0',
+    'exa_deepened': 'INTEGER DEFAULT 0',
+    'contents_fetched': 'INTEGER DEFAULT 0',
+    'contents_skipped': 'INTEGER DEFAULT 0',
+    'exa_response_bytes': 'INTEGER DEFAULT 0',
+    'exa_content_bytes': 'INTEGER DEFAULT 0',
+    'skipped_content_bytes': 'INTEGER DEFAULT 0',
+    'exa_seconds': 'REAL DEFAULT 0',
+}
+
+
+def create_exa_usage_columns(cursor):
+    """Per-session Exa usage counters on search_sessions"""
+    for column, declaration in EXA_USAGE_COLUMNS.items():
+        ensure_column(cursor, 'search_sessions', column, declaration)
+
+
+def create_merge_log_table(cursor):
+    """
+    Leads absorbed into another by resolve_leads, with the profile that bridged them, so an
+    incremental export can retire the absorbed lead's rows
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS lead_merges (
+            lead_id INTEGER PRIMARY KEY,
+            merged_into INTEGER NOT NULL,
+            profile_id INTEGER NOT NULL,
+            merged_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_lead_merges_profile ON lead_merges(profile_id)')
+
+
+# Rows kept in top_profiles: the Top URLs summary sheet
+TOP_PROFILES = 50
+
+
+def create_analytics_tables(cursor):
+    """
+    Aggregates the summary sheets and database info read instead of scanning history:
+    one result_totals row, per-query totals over search_results, per-session totals over
+    hits, and the TOP_PROFILES best-scoring profiles. Triggers keep the profile, hit and
+    session figures current on every write; search_results rows arrive in bulk, so the
+    writer folds each committed batch in at once instead (fold_result_totals).
+    """
+    # Single row; result_id is the last search_results row folded in, unique_urls counts
+    # distinct non-empty search_results URLs
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS result_totals (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            result_id INTEGER NOT NULL DEFAULT 0,
+            results INTEGER NOT NULL DEFAULT 0,
+            scored INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            max_score REAL,
+            unique_urls INTEGER NOT NULL DEFAULT 0,
+            queries INTEGER NOT NULL DEFAULT 0,
+            sessions INTEGER NOT NULL DEFAULT 0,
+            profiles INTEGER NOT NULL DEFAULT 0,
+            leads INTEGER NOT NULL DEFAULT 0,
+            hits INTEGER NOT NULL DEFAULT 0,
+            first_seen TIMESTAMP,
+            last_seen TIMESTAMP
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO result_totals (id) VALUES (1)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS query_totals (
+            query TEXT PRIMARY KEY,
+            results INTEGER NOT NULL DEFAULT 0,
+            scored INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            max_score REAL,
+            unique_urls INTEGER NOT NULL DEFAULT 0,
+            first_seen TIMESTAMP,
+            last_seen TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_query_totals_results ON query_totals(results)')
+    # From hits, so sessions served from the cache or sharing a batch query count too
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS session_totals (
+            session_id INTEGER PRIMARY KEY,
+            hits INTEGER NOT NULL DEFAULT 0,
+            profiles INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            max_score REAL,
+            first_seen TIMESTAMP,
+            last_seen TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS top_profiles (
+            profile_id INTEGER PRIMARY KEY,
+            score REAL NOT NULL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_top_profiles_score ON top_profiles(score, profile_id DESC)')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS search_sessions_totals AFTER INSERT ON search_sessions BEGIN
+            UPDATE result_totals SET sessions = sessions + 1 WHERE id = 1;
+        END
+    ''')
+    # MAX() of two values is NULL if either is, hence the COALESCEs
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS hits_totals_insert AFTER INSERT ON hits BEGIN
+            UPDATE result_totals SET hits = hits + 1 WHERE id = 1;
+            INSERT INTO session_totals (session_id, hits, profiles, score_sum, max_score, first_seen, last_seen)
+            VALUES (new.session_id, 1, 1, COALESCE(new.score, 0), new.score, new.created_at, new.created_at)
+            ON CONFLICT(session_id) DO UPDATE SET
+                hits = hits + 1,
+                profiles = profiles + NOT EXISTS (
+                    SELECT 1 FROM hits h WHERE h.profile_id = new.profile_id
+                    AND h.session_id = new.session_id AND h.id != new.id),
+                score_sum = score_sum + excluded.score_sum,
+                max_score = COALESCE(MAX(max_score, excluded.max_score), max_score, excluded.max_score),
+                last_seen = COALESCE(MAX(last_seen, excluded.last_seen), last_seen, excluded.last_seen);
+        END
+    ''')
+    # A repeat hit keeps the higher score (UPSERT_HIT_SQL)
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS hits_totals_update AFTER UPDATE OF score ON hits
+        WHEN new.score IS NOT old.score BEGIN
+            UPDATE session_totals SET
+                score_sum = score_sum + COALESCE(new.score, 0) - COALESCE(old.score, 0),
+                max_score = COALESCE(MAX(max_score, new.score), max_score, new.score)
+            WHERE session_id = new.session_id;
+        END
+    ''')
+
+    # A profile with lead_id NULL or its own id heads a lead (see LEADS_SQL)
+    # At most one profile enters per row, so trimming back to TOP_PROFILES drops at most the lowest
+    top = f'''
+            INSERT INTO top_profiles (profile_id, score)
+            SELECT new.id, new.best_score
+            WHERE new.best_score > 0 AND (
+                new.best_score > (SELECT MIN(score) FROM top_profiles)
+                OR (SELECT COUNT(*) FROM top_profiles) < {TOP_PROFILES})
+            ON CONFLICT(profile_id) DO UPDATE SET score = excluded.score;
+            DELETE FROM top_profiles
+            WHERE (SELECT COUNT(*) FROM top_profiles) > {TOP_PROFILES} AND profile_id = (
+                SELECT profile_id FROM top_profiles ORDER BY score, profile_id DESC LIMIT 1);
+    '''
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS profiles_totals_insert AFTER INSERT ON profiles BEGIN
+            UPDATE result_totals SET
+                profiles = profiles + 1,
+                leads = leads + (new.lead_id IS NULL OR new.lead_id = new.id)
+            WHERE id = 1;
+            {top}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS profiles_totals_score AFTER UPDATE OF best_score ON profiles
+        WHEN new.best_score > old.best_score BEGIN
+            {top}
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS profiles_totals_lead AFTER UPDATE OF lead_id ON profiles
+        WHEN (new.lead_id IS NULL OR new.lead_id = new.id) != (old.lead_id IS NULL OR old.lead_id = old.id) BEGIN
+            UPDATE result_totals SET
+                leads = leads + (new.lead_id IS NULL OR new.lead_id = new.id) - (old.lead_id IS NULL OR old.lead_id = old.id)
+            WHERE id = 1;
+        END
+    ''')
+    # A deleted top profile's place goes to the next best (idx_profiles_best_score)
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS profiles_totals_delete AFTER DELETE ON profiles BEGIN
+            UPDATE result_totals SET
+                profiles = profiles - 1,
+                leads = leads - (old.lead_id IS NULL OR old.lead_id = old.id)
+            WHERE id = 1;
+            DELETE FROM top_profiles WHERE profile_id = old.id;
+            INSERT INTO top_profiles (profile_id, score)
+            SELECT id, best_score FROM profiles
+            WHERE best_score > 0 AND id NOT IN (SELECT profile_id FROM top_profiles)
+            ORDER BY best_score DESC, id LIMIT {TOP_PROFILES} - (SELECT COUNT(*) FROM top_profiles);
+        END
+    ''')
+
+
+def fold_result_totals(conn):
+    """
+    Add the search_results rows past result_totals.result_id to result_totals and
+    query_totals in one set-based pass. LeadWriter runs it with each commit, so rows are
+    counted once however many batches inserted them. The caller commits; returns the
+    number of rows folded in.
+    """
+    low = conn.execute('SELECT result_id FROM result_totals').fetchone()[0]
+    high = conn.execute('SELECT COALESCE(MAX(id), 0) FROM search_results').fetchone()[0]
+    if high <= low:
+        return 0
+    params = {'low': low, 'high': high}
+    new_queries = conn.execute('''
+        SELECT COUNT(DISTINCT query) FROM search_results r
+        WHERE id > :low AND id <= :high AND NOT EXISTS (SELECT 1 FROM query_totals q WHERE q.query = r.query)
+    ''', params).fetchone()[0]
+    # A URL is new to a query (or to the database) if no row up to the previous fold has it
+    conn.execute('''
+        INSERT INTO query_totals (query, results, scored, score_sum, max_score, unique_urls, first_seen, last_seen)
+        SELECT query, COUNT(*), COUNT(score), COALESCE(SUM(score), 0), MAX(score),
+               COUNT(DISTINCT CASE WHEN url != '' AND NOT EXISTS (
+                   SELECT 1 FROM search_results seen
+                   WHERE seen.url = r.url AND seen.query = r.query AND seen.id <= :low) THEN url END),
+               MIN(created_at), MAX(created_at)
+        FROM search_results r WHERE id > :low AND id <= :high
+        GROUP BY query
+        ON CONFLICT(query) DO UPDATE SET
+            results = results + excluded.results,
+            scored = scored + excluded.scored,
+            score_sum = score_sum + excluded.score_sum,
+            max_score = COALESCE(MAX(max_score, excluded.max_score), max_score, excluded.max_score),
+            unique_urls = unique_urls + excluded.unique_urls,
+            last_seen = COALESCE(MAX(last_seen, excluded.last_seen), last_seen, excluded.last_seen)
+    ''', params)
+    conn.execute('''
+        UPDATE result_totals SET
+            result_id = :high,
+            results = result_totals.results + delta.results,
+            scored = result_totals.scored + delta.scored,
+            score_sum = result_totals.score_sum + delta.score_sum,
+            max_score = COALESCE(MAX(result_totals.max_score, delta.max_score), result_totals.max_score,
+                                 delta.max_score),
+            unique_urls = result_totals.unique_urls + delta.new_urls,
+            queries = result_totals.queries + :new_queries,
+            first_seen = COALESCE(result_totals.first_seen, delta.first_seen),
+            last_seen = COALESCE(delta.last_seen, result_totals.last_seen)
+        FROM (
+            SELECT COUNT(*) AS results, COUNT(score) AS scored, COALESCE(SUM(score), 0) AS score_sum,
+                   MAX(score) AS max_score, MIN(created_at) AS first_seen, MAX(created_at) AS last_seen,
+                   COUNT(DISTINCT CASE WHEN url != '' AND NOT EXISTS (
+                       SELECT 1 FROM search_results seen
+                       WHERE seen.url = r.url AND seen.id <= :low) THEN url END) AS new_urls
+            FROM search_results r WHERE id > :low AND id <= :high
+        ) AS delta
+    ''', dict(params, new_queries=new_queries))
+    return high - low
+
+
+def rebuild_analytics(conn):
+    """Recompute the analytics tables from scratch (one pass over each table they summarize)"""
+    conn.execute('DELETE FROM result_totals')
+    conn.execute('''
+        INSERT INTO result_totals
+        (id, result_id, results, scored, score_sum, max_score, unique_urls, queries, sessions, profiles, leads,
+         hits, first_seen, last_seen)
+        SELECT 1, r.result_id, r.results, r.scored, r.score_sum, r.max_score, r.unique_urls, r.queries,
+               (SELECT COUNT(*) FROM search_sessions),
+               (SELECT COUNT(*) FROM profiles),
+               (SELECT COUNT(*) FROM profiles WHERE lead_id IS NULL OR lead_id = id),
+               (SELECT COUNT(*) FROM hits),
+               r.first_seen, r.last_seen
+        FROM (
+            SELECT COALESCE(MAX(id), 0) AS result_id, COUNT(*) AS results, COUNT(score) AS scored,
+                   COALESCE(SUM(score), 0) AS score_sum, MAX(score) AS max_score,
+                   COUNT(DISTINCT NULLIF(url, '')) AS unique_urls,
+                   COUNT(DISTINCT query) AS queries, MIN(created_at) AS first_seen, MAX(created_at) AS last_seen
+            FROM search_results
+        ) r
+    ''')
+    conn.execute('DELETE FROM query_totals')
+    conn.execute('''
+        INSERT INTO query_totals (query, results, scored, score_sum, max_score, unique_urls, first_seen, last_seen)
+        SELECT query, COUNT(*), COUNT(score), COALESCE(SUM(score), 0), MAX(score),
+               COUNT(DISTINCT NULLIF(url, '')), MIN(created_at), MAX(created_at)
+        FROM search_results GROUP BY query
+    ''')
+    conn.execute('DELETE FROM session_totals')
+    conn.execute('''
+        INSERT INTO session_totals (session_id, hits, profiles, score_sum, max_score, first_seen, last_seen)
+        SELECT session_id, COUNT(*), COUNT(DISTINCT profile_id), COALESCE(SUM(score), 0), MAX(score),
+               MIN(created_at), MAX(created_at)
+        FROM hits GROUP BY session_id
+    ''')
+    conn.execute('DELETE FROM top_profiles')
+    conn.execute(f'''
+        INSERT INTO top_profiles (profile_id, score)
+        SELECT id, best_score FROM profiles WHERE best_score > 0
+        ORDER BY best_score DESC, id LIMIT {TOP_PROFILES}
+    ''')
+
+
+def upsert_leads(conn, query, session_id, rows):
+    """
+    Upsert search_results-shaped rows into profiles and hits.
+
+    rows are (query, title, url, snippet, published_date, author, score) tuples;
+    non-profile URLs are skipped. Returns the number of profile rows touched.
+    """
+    profiles = []
+    hits = []
+    for _, title, url, snippet, _, author, score in rows:
+        slug = canonical_profile_slug(url)
+        if slug is None:
+            continue
+        profiles.append((slug, canonical_profile_url(slug), title, snippet, author, score or 0.0))
+        hits.append((query, session_id or 0, score or 0.0, slug))
+    if profiles:
+        conn.executemany(UPSERT_PROFILE_SQL, profiles)
+        conn.executemany(UPSERT_HIT_SQL, hits)
+    return len(profiles)
+
+
+def _backfill_from_search_results(conn):
+    """Populate profiles and hits from every existing search_results row"""
+    conn.create_function('canonical_profile_slug', 1, canonical_profile_slug, deterministic=True)
+    conn.execute('''
+        CREATE TEMP TABLE legacy_slugs AS
+        SELECT id AS result_id, canonical_profile_slug(url) AS slug
+        FROM search_results
+    ''')
+    conn.execute('DELETE FROM legacy_slugs WHERE slug IS NULL')
+    conn.execute('CREATE INDEX temp.idx_legacy_slugs ON legacy_slugs(result_id)')
+
+    # Lowest scores first so the best-scoring title/snippet wins the upsert
+    conn.execute('''
+        INSERT INTO profiles (slug, url, title, snippet, author, best_score, first_seen, last_seen)
+        SELECT s.slug, 'https://www.linkedin.com/in/' || s.slug, r.title, r.snippet, r.author,
+               COALESCE(r.score, 0), r.created_at, r.created_at
+        FROM search_results r JOIN legacy_slugs s ON s.result_id = r.id
+        WHERE 1
+        ORDER BY COALESCE(r.score, 0) ASC
+        ON CONFLICT(slug) DO UPDATE SET
+            title = CASE WHEN excluded.best_score > profiles.best_score THEN excluded.title ELSE profiles.title END,
+            snippet = CASE WHEN excluded.best_score > profiles.best_score THEN excluded.snippet ELSE profiles.snippet END,
+            author = COALESCE(NULLIF(profiles.author, ''), excluded.author),
+            best_score = MAX(profiles.best_score, excluded.best_score),
+            times_seen = profiles.times_seen + 1,
+            first_seen = MIN(profiles.first_seen, excluded.first_seen),
+            last_seen = MAX(profiles.last_seen, excluded.last_seen)
+    ''')
+    conn.execute('''
+        INSERT INTO hits (profile_id, query, session_id, score, created_at)
+        SELECT p.id, r.query, COALESCE(r.session_id, 0), COALESCE(r.score, 0), r.created_at
+        FROM search_results r
+        JOIN legacy_slugs s ON s.result_id = r.id
+        JOIN profiles p ON p.slug = s.slug
+        WHERE 1
+        ON CONFLICT(profile_id, query, session_id) DO UPDATE SET
+            score = MAX(hits.score, excluded.score)
+    ''')
+    conn.execute('DROP TABLE legacy_slugs')
+
+
+def _backfill_query_stats(conn):
+    """Seed searched_queries from the queries already in search_results"""
+    conn.create_function('dork_role', 1, lambda query: parse_dorked_query(query)[0], deterministic=True)
+    conn.create_function('dork_company', 1, lambda query: parse_dorked_query(query)[1], deterministic=True)
+    conn.execute('''
+        INSERT OR IGNORE INTO searched_queries
+        (query, job_role, company_name, searches, results, new_profiles, last_searched)
+        SELECT r.query, dork_role(r.query), dork_company(r.query), 1, r.results,
+               COALESCE(h.profiles, 0), r.last_searched
+        FROM (
+            SELECT query, COUNT(*) AS results, MAX(created_at) AS last_searched
+            FROM search_results GROUP BY query
+        ) r
+        LEFT JOIN (
+            SELECT query, COUNT(DISTINCT profile_id) AS profiles FROM hits GROUP BY query
+        ) h ON h.query = r.query
+    ''')
+
+
+def migrate_database(conn):
+    """Bring an existing database up to SCHEMA_VERSION in place; returns the steps applied"""
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    applied = []
+
+    if version < 1:
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(search_results)')]
+        if 'session_id' not in columns:
+            conn.execute('ALTER TABLE search_results ADD COLUMN session_id INTEGER')
+        create_lead_tables(conn.cursor())
+        _backfill_from_search_results(conn)
+        applied.append('1: profiles/hits tables, indexes, backfill from search_results')
+
+    if version < 2:
+        create_query_stats_table(conn.cursor())
+        _backfill_query_stats(conn)
+        applied.append('2: searched_queries yield history, backfill from search_results')
+
+    if version < 3:
+        create_session_tables(conn.cursor())
+        applied.append('3: resumable session checkpoints (session_queries)')
+
+    if version < 4:
+        create_metrics_table(conn.cursor())
+        applied.append('4: run metrics (metrics table)')
+
+    if version < 5:
+        create_dedup_tables(conn.cursor())
+        applied.append('5: lead clusters (profiles.lead_id, lead_buckets)')
+
+    if version < 6:
+        create_extracted_columns(conn.cursor())
+        applied.append('6: extracted name/headline/company/location/matched_role on profiles, leads view')
+
+    if version < 7:
+        create_search_index(conn.cursor())
+        applied.append('7: full-text search index over profiles (profiles_fts)')
+
+    if version < 8:
+        create_export_tables(conn.cursor())
+        applied.append('8: incremental export marks, unextracted-profiles index')
+
+    if version < 9:
+        create_service_tables(conn.cursor())
+        applied.append('9: HTTP service job queue (service_jobs)')
+
+    if version < 10:
+        create_exa_usage_columns(conn.cursor())
+        applied.append('10: per-session Exa usage (requests, probes, contents fetched/skipped, bytes)')
+
+    if version < 11:
+        # Superseded by the trigger-maintained analytics tables
+        conn.execute('DROP TABLE IF EXISTS export_totals')
+        conn.execute('DROP TABLE IF EXISTS export_query_totals')
+        create_analytics_tables(conn.cursor())
+        rebuild_analytics(conn)
+        applied.append('11: analytics tables kept current on write (totals per query/session, top profiles)')
+
+    if version < 12:
+        create_merge_log_table(conn.cursor())
+        applied.append('12: lead merge log for incremental exports (lead_merges)')
+
+    if version < 13:
+        create_session_index(conn.cursor())
+        applied.append('13: hits index on (session_id, profile_id) replaces the session_id one')
+
+    if version < 14:
+        # Searches extract and cluster the profiles they find; these are the ones stored before
+        # that existed, which exports used to fill in on every run. Imported here: both modules
+        # import this one
+        from lead_extract import extract_missing
+        from lead_dedup import resolve_leads
+        extract_missing(conn)
+        resolve_leads(conn)
+        applied.append('14: extracted fields and lead clusters for profiles stored without them')
+
+    if applied:
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        conn.commit()
+    return applied
+
+
+def main():
+    db_name = sys.argv[1] if len(sys.argv) > 1 else 'linkedin_leads.db'
+    conn = sqlite3.connect(db_name)
+    try:
+        applied = migrate_database(conn)
+        profiles = conn.execute('SELECT COUNT(*) FROM profiles').fetchone()[0]
+        hits = conn.execute('SELECT COUNT(*) FROM hits').fetchone()[0]
+    finally:
+        conn.close()
+
+    if applied:
+        print(f"✅ Migrated {db_name}:")
+        for step in applied:
+            print(f"   - {step}")
+    else:
+        print(f"✅ {db_name} is already up to date")
+    print(f"   📋 profiles: {profiles} rows, hits: {hits} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Leads CLI
+One entry point for every tool, with subcommands. Only argparse is imported up
+front; each subcommand imports its own module when it runs, so `info`, `search`
+and `--help` start in tens of milliseconds instead of loading the Exa SDK,
+requests and openpyxl.
+
+Usage:
+    python leads.py run [--query TEXT] [--budget N] [--pack] [--batch FILE]   # research a user query
+    python leads.py resume [SESSION_ID]    # continue a session; without an id, list recent ones
+    python leads.py search "devops infosys" [--session ID] [--json]
+    python leads.py export [--format csv] [--incremental]
+    python leads.py info [--db linkedin_leads.db]
+    python leads.py serve [--port 8080] [--workers 4]
+
+`python leads.py COMMAND --help` shows a subcommand's own options.
+"""
+
+import argparse
+import sys
+
+COMMANDS = {
+    'run': "research a user query (or a --batch file) end to end",
+    'resume': "continue a checkpointed session, or list sessions without an id",
+    'search': "full-text search over stored leads",
+    'export': "export the database to xlsx, csv or parquet",
+    'info': "show row counts and recent activity from the analytics totals",
+    'serve': "run the HTTP job service",
+}
+
+
+def _forward(command, argv):
+    """Hand the remaining arguments to a tool's own parser, named after the subcommand"""
+    sys.argv = [f"{sys.argv[0]} {command}"] + argv
+
+
+def run(argv):
+    _forward('run', argv)
+    import linkedin_lead_generator
+    linkedin_lead_generator.main()
+
+
+def resume(argv):
+    if argv and not argv[0].startswith('-'):
+        _forward('resume', ['--resume'] + argv)
+    else:
+        _forward('resume', ['--list-sessions'] + argv)
+    import linkedin_lead_generator
+    linkedin_lead_generator.main()
+
+
+def search(argv):
+    _forward('search', argv)
+    import lead_search
+    lead_search.main()
+
+
+def export(argv):
+    _forward('export', argv)
+    import export_to_excel
+    export_to_excel.main()
+
+
+def info(argv):
+    parser = argparse.ArgumentParser(prog=f"{sys.argv[0]} info", description=COMMANDS['info'])
+    parser.add_argument('--db', default='linkedin_leads.db')
+    args = parser.parse_args(argv)
+    from export_to_excel import show_database_info
+    show_database_info(args.db)
+
+
+def serve(argv):
+    _forward('serve', argv)
+    import lead_service
+    lead_service.main()
+
+
+HANDLERS = {'run': run, 'resume': resume, 'search': search, 'export': export, 'info': info, 'serve': serve}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(
+        description="LinkedIn Lead Research",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n" + '\n'.join(f"  {name:<8} {text}" for name, text in COMMANDS.items())
+              + "\n\nRun 'COMMAND --help' for a command's options.",
+    )
+    parser.add_argument('command', choices=COMMANDS, metavar='COMMAND')
+    # Only the command is parsed here; everything after it belongs to the command
+    args = parser.parse_args(argv[:1])
+    HANDLERS[args.command](argv[1:])
+
+
+if __name__ == "__main__":
+    main()
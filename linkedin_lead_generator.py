@@ -12,13 +12,35 @@ See README.md for detailed setup instructions.
 
 import os
 import json
-import requests
+import argparse
+import atexit
+import math
 import sys
 import sqlite3
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from exa_py import Exa
 from dotenv import load_dotenv
+from search_engine import TokenBucket, run_concurrent_searches
+from stage_runner import Stage, run_stages, print_stage_timings
+from llm_cache import LLMCache, make_cache_key
+from groq_client import GroqError, CircuitBreaker
+from llm_providers import (LLM_PROVIDERS, OpenAICompatibleProvider, ReplayProvider, RecordingProvider)
+from structured_output import (StructuredOutputError, ParseMetrics, parse_stage_output, wants_json_object,
+                               build_repair_prompt)
+from search_cache import SearchCache, CachedResult
+from db_writer import LeadWriter, configure_connection
+from lead_store import (migrate_database, ensure_column, canonical_profile_slug, parse_dorked_query,
+                        RECORD_QUERY_SQL, INSERT_METRIC_SQL, EXA_USAGE_COLUMNS)
+from query_scheduler import QueryScheduler, load_yield_history
+from query_packing import PackedQuery, pack_queries, attribute_results
+from batch_plan import SharedQueryPlan, read_user_queries, normalize_user_query, chunked
+from metrics import Metrics, COUNT_BUCKETS
+from prompt_registry import PromptRegistry, PROMPTS_DIR as DEFAULT_PROMPTS_DIR, estimate_tokens
+from lead_dedup import resolve_leads
+from lead_extract import extract_session
 
 # Load environment variables from .env file
 load_dotenv()
@@ -29,18 +51,129 @@ load_dotenv()
 
 # Groq API configuration
 GROQ_API_KEY = os.getenv('GROQ_API_KEY', 'your_groq_api_key_here')
-GROQ_API_URL = 'https://api.groq.com/openai/v1/chat/completions'
+GROQ_API_URL = os.getenv('GROQ_API_URL', 'https://api.groq.com/openai/v1/chat/completions')
+GROQ_MODEL = 'llama3-8b-8192'
+
+# Groq HTTP client: connect/read timeouts in seconds, retries with jittered backoff on 429/5xx,
+# and a circuit breaker that fails fast for GROQ_BREAKER_RESET seconds after repeated failures
+GROQ_CONNECT_TIMEOUT = float(os.getenv('GROQ_CONNECT_TIMEOUT', '5'))
+GROQ_READ_TIMEOUT = float(os.getenv('GROQ_READ_TIMEOUT', '60'))
+GROQ_MAX_RETRIES = int(os.getenv('GROQ_MAX_RETRIES', '4'))
+GROQ_BACKOFF_BASE = float(os.getenv('GROQ_BACKOFF_BASE', '0.5'))
+GROQ_BACKOFF_CAP = float(os.getenv('GROQ_BACKOFF_CAP', '20'))
+GROQ_BREAKER_THRESHOLD = int(os.getenv('GROQ_BREAKER_THRESHOLD', '5'))
+GROQ_BREAKER_RESET = float(os.getenv('GROQ_BREAKER_RESET', '30'))
+
+# LLM provider: 'groq', 'openai' (any OpenAI-compatible server at LLM_API_URL), 'replay'
+# (serve responses recorded in LLM_RECORDINGS, offline) or 'record' (call LLM_RECORD_FROM and save them)
+LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'groq')
+LLM_MODEL = os.getenv('LLM_MODEL', GROQ_MODEL)
+LLM_API_URL = os.getenv('LLM_API_URL', 'http://localhost:8080/v1/chat/completions')
+LLM_API_KEY = os.getenv('LLM_API_KEY', 'not-needed')
+LLM_RECORDINGS = os.getenv('LLM_RECORDINGS', 'llm_recordings.jsonl')
+LLM_RECORD_FROM = os.getenv('LLM_RECORD_FROM', 'groq')
+llm_provider = None
+
+# Prompt templates, loaded and checked once per process
+PROMPTS_DIR = os.getenv('PROMPTS_DIR', DEFAULT_PROMPTS_DIR)
+prompt_registry = None
+prompt_lock = threading.Lock()
+
+# Structured output: ask for JSON mode on object stages, and how many short repair prompts a
+# stage gets when its reply doesn't match its schema
+LLM_JSON_MODE = os.getenv('LLM_JSON_MODE', '1').lower() in ('1', 'true', 'yes')
+LLM_REPAIR_RETRIES = int(os.getenv('LLM_REPAIR_RETRIES', '1'))
+LLM_REPAIR_MAX_TOKENS = int(os.getenv('LLM_REPAIR_MAX_TOKENS', '1000'))
+parse_metrics = ParseMetrics()
+
+# Groq response cache: mode is 'on', 'refresh' (re-query and overwrite) or 'off'
+LLM_CACHE_DB = os.getenv('LLM_CACHE_DB', 'llm_cache.db')
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000'))
+LLM_CACHE_MODE = os.getenv('LLM_CACHE_MODE', 'on')
+llm_cache = None
 
 # Exa API configuration
 EXA_API_KEY = os.getenv('EXA_API_KEY', 'your_exa_api_key_here')
-exa = Exa(api_key=EXA_API_KEY)
+# Created on the first search: importing exa_py alone takes over a second
+exa = None
+
+# Exa concurrency: requests kept in flight, sustained requests/sec and burst size
+EXA_MAX_IN_FLIGHT = int(os.getenv('EXA_MAX_IN_FLIGHT', '5'))
+EXA_RATE_LIMIT = float(os.getenv('EXA_RATE_LIMIT', '5'))
+EXA_BURST = int(os.getenv('EXA_BURST', '5'))
+
+# Exa calls per session (0 = a quarter of the generated queries) and the marginal
+# new-profiles-per-call below which a session stops early
+EXA_QUERY_BUDGET = int(os.getenv('EXA_QUERY_BUDGET', '0'))
+EXA_MIN_MARGINAL_YIELD = float(os.getenv('EXA_MIN_MARGINAL_YIELD', '0.5'))
+
+# Query packing: OR several roles/companies into one dorked query up to this many characters
+EXA_PACK_QUERIES = os.getenv('EXA_PACK_QUERIES', '0').lower() in ('1', 'true', 'yes')
+EXA_MAX_QUERY_LENGTH = int(os.getenv('EXA_MAX_QUERY_LENGTH', '1000'))
+EXA_PACKED_NUM_RESULTS = int(os.getenv('EXA_PACKED_NUM_RESULTS', '25'))
+
+# Parameters sent with every Exa search; they are part of the result cache key.
+# The filters choose which results come back, the contents options what each one carries.
+EXA_FILTER_PARAMS = {
+    'exclude_text': ["linkedin.com/company"],
+    'include_text': ["linkedin.com/in"],
+    'include_domains': ["linkedin.com"],
+    'category': "linkedin profile"
+}
+EXA_CONTENTS_PARAMS = {
+    'text': True,
+    'livecrawl': "fallback",
+    'extras': {
+        "links": 1
+    }
+}
+EXA_SEARCH_PARAMS = dict(EXA_CONTENTS_PARAMS, **EXA_FILTER_PARAMS)
+
+# Adaptive result depth: probe each query for EXA_PROBE_RESULTS titles/URLs (no text, no live
+# crawl), search EXA_DEEP_RESULTS deep only when the probe turns up profiles not already stored,
+# and fetch contents for just those profiles, up to EXA_CONTENTS_BATCH URLs per call across a
+# batch of queries. Each probe, deepen and contents request counts against the query budget.
+# Needs exa_py 2.0+ (search(contents=False)); 0 = always search_and_contents
+EXA_ADAPTIVE_DEPTH = os.getenv('EXA_ADAPTIVE_DEPTH', '0').lower() in ('1', 'true', 'yes')
+EXA_PROBE_RESULTS = int(os.getenv('EXA_PROBE_RESULTS', '5'))
+EXA_DEEP_RESULTS = int(os.getenv('EXA_DEEP_RESULTS', '25'))
+EXA_CONTENTS_BATCH = int(os.getenv('EXA_CONTENTS_BATCH', '100'))
+
+# Exa result cache: results younger than EXA_CACHE_MAX_AGE seconds are served locally
+EXA_CACHE_MAX_AGE = int(os.getenv('EXA_CACHE_MAX_AGE', str(7 * 24 * 3600)))
+EXA_CACHE_MODE = os.getenv('EXA_CACHE_MODE', 'on')
+search_cache = None
+
+# Batch mode: user queries whose LLM stages run at once, and how many are merged per search wave
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))
+BATCH_WAVE_SIZE = int(os.getenv('BATCH_WAVE_SIZE', '50'))
 
 # Database configuration
 DB_NAME = 'linkedin_leads.db'
 
+# Writes go through one connection; commit every DB_BATCH_SIZE rows or DB_FLUSH_INTERVAL seconds
+DB_BATCH_SIZE = int(os.getenv('DB_BATCH_SIZE', '500'))
+DB_FLUSH_INTERVAL = float(os.getenv('DB_FLUSH_INTERVAL', '1.0'))
+db_writer = None
+
+# Guards first creation of the shared clients above; worker threads can race to create them.
+# Reentrant because get_search_cache starts the writer while holding it
+shared_lock = threading.RLock()
+
+# Title+snippet Jaccard similarity at which same-name profiles are merged into one lead
+DEDUP_THRESHOLD = float(os.getenv('DEDUP_THRESHOLD', '0.6'))
+
+# Run instrumentation: spans, latency histograms and counters, saved to the metrics table at exit
+metrics = Metrics()
+# Metrics are tagged with the session only when a run made exactly one, so two ids are enough;
+# capped so the long-running service doesn't keep every session it ever created
+run_session_ids = []
+METRICS_FILE = os.getenv('METRICS_FILE', '')
+
 def init_database():
     """Initialize SQLite database for storing search results"""
-    conn = sqlite3.connect(DB_NAME)
+    conn = configure_connection(sqlite3.connect(DB_NAME))
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -53,6 +186,7 @@ def init_database():
             published_date TEXT,
             author TEXT,
             score REAL,
+            session_id INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
@@ -63,160 +197,950 @@ def init_database():
             user_query TEXT NOT NULL,
             total_queries INTEGER,
             queries_searched INTEGER,
+            exa_calls_avoided INTEGER DEFAULT 0,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
     
+    # Bring databases created by older versions up to date
+    ensure_column(cursor, 'search_sessions', 'exa_calls_avoided', 'INTEGER DEFAULT 0')
+    conn.commit()
+    
+    # Normalized profiles/hits tables and indexes (backfilled from search_results once)
+    for step in migrate_database(conn):
+        print(f"🔧 Applied migration {step}")
+    
     conn.commit()
     conn.close()
     print("✅ Database initialized successfully")
 
-def save_search_results(query, results):
-    """Save search results to database"""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+def get_db_writer():
+    """Return the shared database writer, starting it on first use"""
+    global db_writer
+    with shared_lock:
+        if db_writer is None:
+            db_writer = LeadWriter(DB_NAME, batch_size=DB_BATCH_SIZE, flush_interval=DB_FLUSH_INTERVAL)
+            atexit.register(close_db_writer)
+        return db_writer.start()
+
+def close_db_writer():
+    """Commit pending writes and stop the writer thread"""
+    global db_writer
+    with shared_lock:
+        if db_writer is not None:
+            db_writer.close()
+            db_writer = None
+            if search_cache is not None:
+                search_cache.writer = None
+
+def extract_lead_fields(session_ids):
+    """Parse name/headline/company/location/role out of the sessions' profiles, on the writer thread"""
+    with metrics.span('extraction'):
+        count = get_db_writer().call(lambda conn: sum(extract_session(conn, sid) for sid in session_ids))
+    metrics.inc('profiles_extracted', count)
+    return count
+
+def resolve_new_leads():
+    """Cluster profiles found since the last pass into leads, on the writer thread"""
+    with metrics.span('dedup'):
+        stats = get_db_writer().call(lambda conn: resolve_leads(conn, threshold=DEDUP_THRESHOLD))
+    metrics.inc('dedup_profiles_merged', stats['merged'])
+    return stats
+
+def save_search_results(query, results, session_id=None, store_raw=True):
+    """Queue search results for a batched insert and profile/hit upsert"""
+    get_db_writer().save_results(query, results, session_id=session_id, store_raw=store_raw)
+
+def save_query_results(query, results, session_id=None, store_raw=True, packed_query=None):
+    """Save results; a packed query's results go under the single role/company query each one matched"""
+    if packed_query is None:
+        save_search_results(query, results, session_id=session_id, store_raw=store_raw)
+        return
+    for (role, company), matched in attribute_results(packed_query, results).items():
+        if role is None:
+            pair_query = packed_query.query
+        else:
+            pair_query = generate_dorked_queries([role], [company])[0]
+        save_search_results(pair_query, matched, session_id=session_id, store_raw=store_raw)
+
+def create_session(user_query, queries, variables=None, descriptions=None, job_roles=None,
+                   company_names=None, packed=None, budget=None):
+    """Checkpoint a new session up front - its LLM outputs and every query as pending - and return its id"""
+    packed = packed or {}
     
-    for result in results:
-        cursor.execute('''
-            INSERT INTO search_results 
-            (query, title, url, snippet, published_date, author, score)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            query,
-            result.title if hasattr(result, 'title') else '',
-            result.url if hasattr(result, 'url') else '',
-            result.text if hasattr(result, 'text') else '',
-            result.published_date if hasattr(result, 'published_date') else '',
-            result.author if hasattr(result, 'author') else '',
-            result.score if hasattr(result, 'score') else 0.0
-        ))
+    def insert(conn):
+        cursor = conn.execute('''
+            INSERT INTO search_sessions 
+            (user_query, total_queries, queries_searched, status, budget,
+             variables, descriptions, job_roles, company_names, updated_at)
+            VALUES (?, ?, 0, 'searching', ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (user_query, len(queries), budget, json.dumps(variables), json.dumps(descriptions),
+              json.dumps(job_roles), json.dumps(company_names)))
+        session_id = cursor.lastrowid
+        if len(run_session_ids) < 2:
+            run_session_ids.append(session_id)
+        
+        rows = []
+        for position, query in enumerate(queries):
+            if query in packed:
+                roles, companies = packed[query].roles, packed[query].companies
+            else:
+                role, company = parse_dorked_query(query)
+                roles, companies = [role] if role else [], [company] if company else []
+            rows.append((session_id, position, query, json.dumps(roles), json.dumps(companies),
+                         int(query in packed)))
+        conn.executemany('''
+            INSERT OR IGNORE INTO session_queries (session_id, position, query, roles, companies, packed)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+        return session_id
     
-    conn.commit()
-    conn.close()
+    return get_db_writer().call(insert)
 
-def save_search_session(user_query, total_queries, queries_searched):
-    """Save search session information"""
+def mark_query_status(session_id, query, status, results=0, error=None):
+    """Queue a per-query checkpoint: pending, done or failed"""
+    get_db_writer().execute('''
+        UPDATE session_queries 
+        SET status = ?, results = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE session_id = ? AND query = ?
+    ''', (status, results, error, session_id, query))
+
+def set_session_status(session_id, status):
+    """Record whether a session is searching, completed, interrupted or failed"""
+    def update(conn):
+        conn.execute('''
+            UPDATE search_sessions SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?
+        ''', (status, session_id))
+    
+    get_db_writer().call(update)
+
+def finish_search_session(session_id, exa_calls_avoided=0, status=None, usage=None):
+    """
+    Record how many queries a session has searched so far (and the Exa usage to add) and return
+    that count. Without a status the session is 'failed' while any of its queries is, across every
+    run of it, and 'completed' otherwise.
+    """
+    usage = usage or {}
+    added = ''.join(f"{column} = COALESCE({column}, 0) + ?, " for column in EXA_USAGE_COLUMNS)
+    def update(conn):
+        conn.execute(f'''
+            UPDATE search_sessions 
+            SET queries_searched = (
+                    SELECT COUNT(*) FROM session_queries WHERE session_id = ? AND status = 'done'
+                ),
+                exa_calls_avoided = COALESCE(exa_calls_avoided, 0) + ?,
+                {added}status = COALESCE(?, CASE WHEN EXISTS (
+                    SELECT 1 FROM session_queries WHERE session_id = ? AND status = 'failed'
+                ) THEN 'failed' ELSE 'completed' END),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (session_id, exa_calls_avoided, *(usage.get(column, 0) for column in EXA_USAGE_COLUMNS),
+              status, session_id, session_id))
+        return conn.execute(
+            'SELECT queries_searched FROM search_sessions WHERE id = ?', (session_id,)
+        ).fetchone()[0]
+    
+    return get_db_writer().call(update)
+
+def load_session(session_id):
+    """Load a checkpointed session and its queries; returns None if it doesn't exist"""
     conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+    conn.row_factory = sqlite3.Row
+    try:
+        session = conn.execute('SELECT * FROM search_sessions WHERE id = ?', (session_id,)).fetchone()
+        if session is None:
+            return None
+        queries = conn.execute('''
+            SELECT query, roles, companies, packed, status FROM session_queries
+            WHERE session_id = ? ORDER BY position
+        ''', (session_id,)).fetchall()
+    finally:
+        conn.close()
     
-    cursor.execute('''
-        INSERT INTO search_sessions 
-        (user_query, total_queries, queries_searched)
-        VALUES (?, ?, ?)
-    ''', (user_query, total_queries, queries_searched))
+    session = dict(session)
+    for field in ('variables', 'descriptions', 'job_roles', 'company_names'):
+        session[field] = json.loads(session[field]) if session.get(field) else None
+    session['queries'] = [row['query'] for row in queries]
+    session['done'] = {row['query'] for row in queries if row['status'] == 'done'}
+    session['packed'] = {
+        row['query']: PackedQuery(json.loads(row['roles']), json.loads(row['companies']), row['query'])
+        for row in queries if row['packed']
+    }
+    return session
+
+def list_sessions(limit=20):
+    """Print recent sessions with their checkpoint progress"""
+    conn = sqlite3.connect(DB_NAME)
+    try:
+        rows = conn.execute('''
+            SELECT s.id, s.user_query, COALESCE(s.status, 'completed'), s.created_at,
+                   COUNT(q.id), SUM(q.status = 'done'), SUM(q.status = 'failed')
+            FROM search_sessions s LEFT JOIN session_queries q ON q.session_id = s.id
+            GROUP BY s.id ORDER BY s.id DESC LIMIT ?
+        ''', (limit,)).fetchall()
+    finally:
+        conn.close()
     
-    conn.commit()
-    conn.close()
+    print(f"\n📋 Recent sessions:")
+    for session_id, user_query, status, created_at, total, done, failed in rows:
+        print(f"   #{session_id:<5} {status:<12} {done or 0}/{total} done, {failed or 0} failed  "
+              f"{created_at}  '{user_query[:60]}'")
+
+def get_exa_client():
+    """Return the shared Exa client, importing exa_py and creating it on first use"""
+    global exa
+    if exa is None:
+        with shared_lock:
+            if exa is None:
+                from exa_py import Exa
+                exa = Exa(api_key=EXA_API_KEY)
+    return exa
 
-def call_exa_api(query, num_results=10):
+def exa_payload_bytes(results, text_only=False):
+    """Bytes of the text fields Exa returned; exa_py hides the raw response, so this stands in for it"""
+    total = 0
+    for r in results:
+        total += len((getattr(r, 'text', '') or '').encode())
+        if not text_only:
+            total += len((getattr(r, 'title', '') or '').encode()) + len((getattr(r, 'url', '') or '').encode())
+    return total
+
+def call_exa_api(query, num_results=10, client=None, raise_errors=False):
     """Call Exa API to search for results"""
     try:
         print(f"🔍 Searching Exa API for: {query[:100]}...")
         
-        result = exa.search_and_contents(
-            query,
-            text=True,
-            exclude_text=["linkedin.com/company"],
-            include_text=["linkedin.com/in"],
-            num_results=num_results,
-            include_domains=["linkedin.com"],
-            livecrawl="fallback",
-            extras={
-                "links": 1
-            },
-            category="linkedin profile"
-        )
+        with metrics.timer('exa_request_seconds'):
+            result = (client or get_exa_client()).search_and_contents(
+                query,
+                num_results=num_results,
+                **EXA_SEARCH_PARAMS
+            )
         
         results = result.results
+        metrics.inc('exa_requests_total')
+        metrics.inc('exa_response_bytes', exa_payload_bytes(results))
         print(f"✅ Found {len(results)} results")
         return results
         
     except Exception as e:
+        metrics.inc('exa_errors_total')
         print(f"❌ Error calling Exa API: {str(e)}")
+        if raise_errors:
+            raise
         return []
 
-def search_with_rate_limiting(queries, user_query):
-    """Search queries with rate limiting - only first 5 out of every 20 queries"""
-    total_queries = len(queries)
-    queries_searched = 0
-    total_results = 0
+def get_search_cache():
+    """Return the shared Exa result cache, opening it on first use"""
+    global search_cache
+    cache = search_cache
+    if cache is None or cache.writer is None:
+        with shared_lock:
+            if search_cache is None:
+                # Cache writes go through the writer thread so they don't wait on its open transaction
+                search_cache = SearchCache(DB_NAME, max_age=EXA_CACHE_MAX_AGE, mode=EXA_CACHE_MODE,
+                                           writer=get_db_writer())
+            elif search_cache.writer is None:
+                search_cache.writer = get_db_writer()
+            cache = search_cache
+    return cache
+
+def search_exa_cached(query, num_results=10, client=None, limiter=None):
+    """Serve a query from the Exa result cache, falling back to the API. Returns (results, from_cache)"""
+    cache = get_search_cache()
+    params = dict(EXA_SEARCH_PARAMS, num_results=num_results)
+    cached = cache.get(query, params)
+    if cached is not None:
+        print(f"⚡ Exa results served from cache for: {query[:100]}...")
+        return cached, True
+    
+    # Only network calls spend rate limit tokens
+    if limiter is not None:
+        limiter.acquire()
+    results = call_exa_api(query, num_results=num_results, client=client, raise_errors=True)
+    if results:
+        cache.put(query, params, results)
+    return results, False
+
+def call_exa_search(query, num_results, client=None):
+    """Search Exa for titles and URLs only: no page text, no live crawl"""
+    with metrics.timer('exa_request_seconds'):
+        results = (client or get_exa_client()).search(
+            query, num_results=num_results, contents=False, **EXA_FILTER_PARAMS
+        ).results
+    metrics.inc('exa_requests_total')
+    metrics.inc('exa_response_bytes', exa_payload_bytes(results))
+    return results
+
+def call_exa_contents(urls, client=None):
+    """Fetch the contents of several profile URLs in one Exa call"""
+    with metrics.timer('exa_request_seconds'):
+        results = (client or get_exa_client()).get_contents(urls, **EXA_CONTENTS_PARAMS).results
+    metrics.inc('exa_requests_total')
+    metrics.inc('exa_response_bytes', exa_payload_bytes(results))
+    return results
+
+class KnownProfiles:
+    """
+    Profile slugs a search run shouldn't pay for again: stored in profiles, or claimed by
+    another query's probe this run. Shared by the search threads.
+    """
+    
+    def __init__(self, db_name):
+        self.conn = sqlite3.connect(db_name, check_same_thread=False)
+        self.claimed = set()
+        # Stored text bytes of the stored profiles looked up so far
+        self.stored_bytes = {}
+        self.lock = threading.Lock()
+    
+    def claim(self, urls):
+        """The slugs among urls that are neither stored nor claimed; they become claimed"""
+        slugs = {canonical_profile_slug(url) for url in urls} - {None}
+        with self.lock:
+            slugs -= self.claimed
+            slugs -= self.stored_bytes.keys()
+            if slugs:
+                placeholders = ','.join('?' * len(slugs))
+                stored = dict(self.conn.execute(
+                    f"SELECT slug, LENGTH(CAST(COALESCE(snippet, '') AS BLOB)) FROM profiles "
+                    f"WHERE slug IN ({placeholders})", list(slugs)))
+                self.stored_bytes.update(stored)
+                slugs -= stored.keys()
+            self.claimed |= slugs
+        return slugs
+    
+    def release(self, slugs):
+        """Give back claimed slugs whose query failed"""
+        with self.lock:
+            self.claimed -= slugs
+    
+    def close(self):
+        self.conn.close()
+
+def adaptive_cache_params(num_results):
+    """Cache key parameters of an adaptive search; its results differ from a plain search's"""
+    return dict(EXA_FILTER_PARAMS, adaptive=[EXA_PROBE_RESULTS, max(num_results, EXA_DEEP_RESULTS)])
+
+def search_exa_adaptive(query, num_results=10, client=None, limiter=None, known=None):
+    """
+    Probe a query for EXA_PROBE_RESULTS titles/URLs and only if the probe finds profiles that
+    aren't known, search it max(num_results, EXA_DEEP_RESULTS) deep, still without contents.
+    Returns (results, from_cache, usage, wanted): usage counts the EXA_USAGE_COLUMNS, and
+    wanted maps the slugs of the new profiles, whose text is still empty, to their URLs for
+    fetch_contents_bulk. Results without wanted profiles are cached right away.
+    """
+    cache = get_search_cache()
+    params = adaptive_cache_params(num_results)
+    cached = cache.get(query, params)
+    if cached is not None:
+        print(f"⚡ Exa results served from cache for: {query[:100]}...")
+        return cached, True, None, {}
+    
+    usage = dict.fromkeys(EXA_USAGE_COLUMNS, 0)
+    
+    def request(num_results):
+        # Every request spends a rate limit token, probes included
+        if limiter is not None:
+            limiter.acquire()
+        start = time.perf_counter()
+        results = call_exa_search(query, num_results, client=client)
+        usage['exa_requests'] += 1
+        usage['exa_response_bytes'] += exa_payload_bytes(results)
+        usage['exa_seconds'] += time.perf_counter() - start
+        return results
+    
+    print(f"🔍 Probing Exa for: {query[:100]}...")
+    results = request(EXA_PROBE_RESULTS)
+    usage['exa_probes'] = 1
+    fresh = known.claim(r.url for r in results)
+    # A probe that came back short already holds everything the query matches
+    if fresh and len(results) >= EXA_PROBE_RESULTS and params['adaptive'][1] > EXA_PROBE_RESULTS:
+        try:
+            results = request(params['adaptive'][1])
+        except Exception:
+            known.release(fresh)
+            raise
+        usage['exa_deepened'] = 1
+        fresh |= known.claim(r.url for r in results)
+    
+    wanted = {}
+    profiles = set()
+    for r in results:
+        slug = canonical_profile_slug(r.url)
+        profiles.add(slug)
+        if slug in fresh:
+            wanted.setdefault(slug, r.url)
+    skipped = profiles - fresh - {None}
+    usage['contents_skipped'] = len(skipped)
+    usage['skipped_content_bytes'] = sum(known.stored_bytes.get(slug, 0) for slug in skipped)
+    metrics.inc('exa_probes_total')
+    metrics.inc('exa_deepened_total', usage['exa_deepened'])
+    metrics.inc('exa_contents_skipped', usage['contents_skipped'])
+    
+    results = [CachedResult(title=r.title or '', url=r.url, text='', published_date=r.published_date or '',
+                            author=r.author or '', score=r.score or 0.0) for r in results]
+    print(f"✅ Found {len(results)} results, {len(wanted)} new"
+          f"{' (deepened)' if usage['exa_deepened'] else ''}")
+    if results and not wanted:
+        cache.put(query, params, results)
+    return results, False, usage, wanted
+
+def fetch_contents_bulk(pending, client=None, limiter=None):
+    """
+    Fetch the contents every pending adaptive search wants, EXA_CONTENTS_BATCH URLs per call,
+    and fill the texts into their results. pending holds (query, results, usage, wanted) tuples
+    from search_exa_adaptive. Each query's usage is charged for its own pages; a request's
+    count and time go to the first query it served.
+    """
+    wanted = []
+    for usage_index, (_, _, _, urls) in enumerate(pending):
+        wanted += [(url, usage_index) for url in urls.values()]
+    pages = {}
+    for start in range(0, len(wanted), EXA_CONTENTS_BATCH):
+        chunk = wanted[start:start + EXA_CONTENTS_BATCH]
+        if limiter is not None:
+            limiter.acquire()
+        # Counted before it is sent, so a request that fails is still charged
+        usage = pending[chunk[0][1]][2]
+        usage['exa_requests'] += 1
+        began = time.perf_counter()
+        fetched = call_exa_contents([url for url, _ in chunk], client=client)
+        usage['exa_seconds'] += time.perf_counter() - began
+        pages.update((canonical_profile_slug(page.url), page) for page in fetched)
+    
+    for _, results, usage, urls in pending:
+        mine = [pages[slug] for slug in urls if slug in pages]
+        usage['contents_fetched'] += len(mine)
+        usage['exa_response_bytes'] += exa_payload_bytes(mine)
+        usage['exa_content_bytes'] += exa_payload_bytes(mine, text_only=True)
+        metrics.inc('exa_contents_fetched', len(mine))
+        # A profile another query of the batch fetched gets its text here too
+        for result in results:
+            page = pages.get(canonical_profile_slug(result.url))
+            if page is not None:
+                result.text = page.text or ''
+                result.title = result.title or page.title or ''
+                result.author = result.author or getattr(page, 'author', '') or ''
+    print(f"📄 Fetched contents of {len(pages)} new profiles for {len(pending)} queries")
+
+def full_contents_usage(results):
+    """Usage of a plain search_and_contents call, in EXA_USAGE_COLUMNS terms"""
+    usage = dict.fromkeys(EXA_USAGE_COLUMNS, 0)
+    usage['exa_requests'] = 1
+    usage['contents_fetched'] = len({canonical_profile_slug(getattr(r, 'url', '')) for r in results} - {None})
+    usage['exa_response_bytes'] = exa_payload_bytes(results)
+    usage['exa_content_bytes'] = exa_payload_bytes(results, text_only=True)
+    return usage
+
+def result_slugs(results):
+    return {canonical_profile_slug(getattr(result, 'url', '')) for result in results} - {None}
+
+def new_profile_slugs(conn, seen, results):
+    """Slugs of profiles in results not seen this session nor already stored; marks them seen"""
+    slugs = result_slugs(results) - seen
+    if not slugs:
+        return set()
+    placeholders = ','.join('?' * len(slugs))
+    stored = {row[0] for row in conn.execute(
+        f"SELECT slug FROM profiles WHERE slug IN ({placeholders})", list(slugs))}
+    seen.update(slugs)
+    return slugs - stored
+
+def query_yields(query, results, fresh, packed_query=None):
+    """
+    (query, job_role, company_name, results, new profiles) rows for searched_queries.
+    A packed query is credited per role/company pair it covers, under that pair's own query,
+    with the results attributed to it (none for a pair that matched nothing); results that
+    match no pair stay under the packed query.
+    """
+    if packed_query is None:
+        role, company = parse_dorked_query(query)
+        return [(query, role, company, len(results), len(fresh))]
+    grouped = attribute_results(packed_query, results)
+    rows = []
+    for role in packed_query.roles:
+        for company in packed_query.companies:
+            matched = grouped.get((role, company), [])
+            rows.append((generate_dorked_queries([role], [company])[0], role, company,
+                         len(matched), len(result_slugs(matched) & fresh)))
+    unmatched = grouped.get((None, None))
+    if unmatched:
+        rows.append((query, None, None, len(unmatched), len(result_slugs(unmatched) & fresh)))
+    return rows
+
+class SearchInterrupted(Exception):
+    """A search was asked to stop; its sessions are checkpointed as interrupted"""
+
+def run_search_plan(plan, budget, client=None, max_in_flight=None, rate=None, burst=None,
+                    limiter=None, stop=None, retry=()):
+    """
+    Search a SharedQueryPlan's unique queries, most promising first, within budget Exa calls
+    (deepen and contents requests of adaptive searches count too; cache hits don't).
+    Each result is saved once and linked to every session that wanted the query.
+    Pass a shared limiter to keep concurrent plans under one Exa rate limit, and a stop
+    Event to end the plan between batches (raises SearchInterrupted). Queries in retry (ones
+    that failed before) are searched first.
+    With EXA_ADAPTIVE_DEPTH each query is probed first (see search_exa_adaptive).
+    Returns the run's counters; per-session counts are keyed by session id, and a query's
+    Exa usage is charged to the first session that wanted it.
+    """
+    stats = {
+        'searched': 0, 'cache_hits': 0, 'total_results': 0, 'new_profiles': 0, 'stop_reason': None,
+        'failed': dict.fromkeys(plan.session_ids, 0),
+        'avoided': dict(plan.duplicates),
+        'usage': {session_id: dict.fromkeys(EXA_USAGE_COLUMNS, 0) for session_id in plan.session_ids},
+    }
+    max_in_flight = max_in_flight or EXA_MAX_IN_FLIGHT
+    limiter = limiter or TokenBucket(rate or EXA_RATE_LIMIT, burst or EXA_BURST)
+    
+    read_conn = sqlite3.connect(DB_NAME)
+    scheduler = QueryScheduler(
+        [(*parse_dorked_query(query), query) for query in plan.queries()], budget,
+        history=load_yield_history(read_conn),
+        min_marginal_yield=EXA_MIN_MARGINAL_YIELD,
+        batch_size=max_in_flight * 2,
+        # A probe, plus a deepen or a share of a contents call for many queries
+        call_cost=2.0 if EXA_ADAPTIVE_DEPTH else 1.0,
+        first=retry
+    )
+    seen = set()
+    known = KnownProfiles(DB_NAME) if EXA_ADAPTIVE_DEPTH else None
+    
+    # Adaptive searches whose new profiles wait for the batch's bulk contents fetch
+    pending = []
+    search_errors = 0
     
-    print(f"\n🔍 Starting Exa API searches with rate limiting...")
-    print(f"📊 Total queries: {total_queries}")
-    print(f"📋 Search pattern: First 5 out of every 20 queries")
+    def num_results_for(query):
+        return EXA_PACKED_NUM_RESULTS if query in plan.packed else 10
+    
+    def search(query):
+        if known is not None:
+            return search_exa_adaptive(query, num_results=num_results_for(query), client=client,
+                                       limiter=limiter, known=known)
+        start = time.perf_counter()
+        results, from_cache = search_exa_cached(query, num_results=num_results_for(query), client=client,
+                                                limiter=limiter)
+        if from_cache:
+            return results, True, None, {}
+        usage = full_contents_usage(results)
+        usage['exa_seconds'] = time.perf_counter() - start
+        return results, False, usage, {}
+    
+    print(f"📋 Search pattern: up to {budget} Exa calls, highest expected yield first")
+    print(f"⚡ Concurrency: {max_in_flight} in flight, {limiter.rate:g} req/s (burst {int(limiter.capacity)})")
     print("=" * 60)
     
-    for i, query in enumerate(queries):
-        # Check if this query should be searched (first 5 out of every 20)
-        position_in_batch = i % 20
-        should_search = position_in_batch < 5
+    def on_result(i, query, outcome):
+        results, from_cache, usage, wanted = outcome
+        fresh_slugs = new_profile_slugs(read_conn, seen, results)
+        fresh = len(fresh_slugs)
+        source = 'cache' if from_cache else 'network'
+        metrics.observe('results_per_query', len(results), buckets=COUNT_BUCKETS, source=source)
+        metrics.observe('new_profiles_per_query', fresh, buckets=COUNT_BUCKETS, source=source)
+        stats['new_profiles'] += fresh
+        stats['total_results'] += len(results)
+        if usage and not from_cache:
+            # The probe is the query's own call; a deepen request is charged on top
+            scheduler.charge(usage['exa_requests'] - 1)
+        finished = scheduler.recorded + stats['cache_hits'] + search_errors + 1
+        print(f"\n🔍 Query {finished} finished{' (cached)' if from_cache else ''}: {fresh} new profiles")
+        if from_cache:
+            stats['cache_hits'] += 1
+            # Served locally, so it leaves room in the budget for another network query
+            scheduler.cached(query)
+        else:
+            yields = query_yields(query, results, fresh_slugs, plan.packed.get(query))
+            if query in plan.packed:
+                scheduler.record(query, fresh, members={(role, company): found
+                                                        for _, role, company, _, found in yields if role})
+            else:
+                scheduler.record(query, fresh)
+            get_db_writer().executemany(RECORD_QUERY_SQL, yields)
         
-        if should_search:
-            queries_searched += 1
-            print(f"\n🔍 Query {queries_searched}/{total_queries} (Position {i+1})")
-            
-            # Call Exa API
-            results = call_exa_api(query, num_results=10)
-            
-            if results:
-                # Save results to database
-                save_search_results(query, results)
-                total_results += len(results)
-                print(f"💾 Saved {len(results)} results to database")
-            
-            # Rate limiting - wait 1 second between searches
-            if queries_searched < min(5, len([q for j, q in enumerate(queries) if j % 20 < 5])):
-                print("⏱️  Rate limiting: waiting 1 second...")
-                time.sleep(1)
+        if wanted:
+            pending.append((query, results, usage, wanted))
         else:
-            print(f"⏭️  Skipping query {i+1}/{total_queries} (batch position {position_in_batch + 1})")
+            save(query, results, from_cache, usage)
+    
+    def charge(query, usage):
+        if usage:
+            session_id = plan.sessions_for(query)[0][0]
+            for column, amount in usage.items():
+                stats['usage'][session_id][column] += amount
+    
+    def save(query, results, from_cache, usage):
+        charge(query, usage)
+        saved = set()
+        for session_id, spelling in plan.sessions_for(query):
+            if session_id not in saved:
+                # Raw rows are stored once, when first fetched; other sessions only link the profiles
+                store_raw = not from_cache and not saved
+                save_query_results(query, results, session_id=session_id, store_raw=store_raw,
+                                   packed_query=plan.packed.get(query))
+                if from_cache or saved:
+                    stats['avoided'][session_id] += 1
+                saved.add(session_id)
+            mark_query_status(session_id, spelling, 'done', results=len(results))
+        if results and not from_cache:
+            print(f"💾 Saved {len(results)} results to database"
+                  + (f" for {len(saved)} sessions" if len(saved) > 1 else ""))
+    
+    def on_error(i, query, error):
+        nonlocal search_errors
+        search_errors += 1
+        # The failed search was still sent, so the session's stored count (and with it the
+        # budget a resume gets) includes it
+        charge(query, {'exa_requests': 1})
+        fail(query, error)
+    
+    def fail(query, error):
+        for session_id, spelling in plan.sessions_for(query):
+            stats['failed'][session_id] += 1
+            mark_query_status(session_id, spelling, 'failed', error=str(error))
+    
+    # The bulk contents fetch of one batch runs while the next batch is searched
+    contents_pool = ThreadPoolExecutor(max_workers=1) if known is not None else None
+    fetching = None
+    
+    def fetch_pending():
+        batch = pending[:]
+        pending.clear()
+        # Charged when sent, so the next batch is sized with them already spent
+        urls = sum(len(wanted) for _, _, _, wanted in batch)
+        scheduler.charge(math.ceil(urls / EXA_CONTENTS_BATCH))
+        return contents_pool.submit(fetch_contents_bulk, batch, client=client, limiter=limiter), batch
+    
+    def save_fetched(fetch):
+        future, batch = fetch
+        try:
+            future.result()
+        except Exception as e:
+            metrics.inc('exa_errors_total')
+            print(f"❌ Error fetching Exa contents: {str(e)}")
+            for query, _, usage, wanted in batch:
+                known.release(set(wanted))
+                charge(query, usage)
+                fail(query, e)
+            return
+        cache = get_search_cache()
+        for query, results, usage, _ in batch:
+            cache.put(query, adaptive_cache_params(num_results_for(query)), results)
+            save(query, results, False, usage)
+    
+    try:
+        with metrics.span('search'):
+            while True:
+                if stop is not None and stop.is_set():
+                    if fetching is not None:
+                        save_fetched(fetching)
+                    raise SearchInterrupted(f"stopped after {scheduler.issued} queries")
+                batch = scheduler.next_batch()
+                if not batch:
+                    break
+                run_concurrent_searches(
+                    batch,
+                    search,
+                    max_in_flight=max_in_flight,
+                    on_result=on_result,
+                    on_error=on_error
+                )
+                if fetching is not None:
+                    save_fetched(fetching)
+                    fetching = None
+                if pending:
+                    fetching = fetch_pending()
+            if fetching is not None:
+                save_fetched(fetching)
+    except BaseException:
+        # Keep what finished; unfinished queries stay pending for --resume
+        for session_id in plan.session_ids:
+            finish_search_session(session_id, stats['avoided'][session_id], status='interrupted',
+                                  usage=stats['usage'][session_id])
+        raise
+    finally:
+        read_conn.close()
+        if contents_pool is not None:
+            contents_pool.shutdown(wait=False, cancel_futures=True)
+        if known is not None:
+            known.close()
+    
+    stats['searched'] = scheduler.issued
+    # Every request sent: each network search plus the deepen and contents requests it needed
+    stats['exa_requests'] = scheduler.spent
+    stats['stop_reason'] = scheduler.stop_reason
+    return stats
+
+def print_exa_usage(usage, new_profiles):
+    """Summary lines for a session's Exa usage: payload and time per new profile, and what probing saved"""
+    per_profile = f"{usage['exa_response_bytes'] / new_profiles / 1024:.1f} KB and " \
+                  f"{usage['exa_seconds'] / new_profiles * 1000:.0f} ms per new profile" if new_profiles else "no new profiles"
+    print(f"   - Exa payload: {usage['exa_response_bytes'] / 1024:.1f} KB in {usage['exa_requests']} requests "
+          f"({per_profile})")
+    if usage['exa_probes']:
+        # Skipped contents are priced at the text already stored for them; profiles another query
+        # of the run fetched count as skipped but not as saved bytes
+        print(f"   - Adaptive depth: {usage['exa_probes']} probes, {usage['exa_deepened']} deepened; contents "
+              f"fetched for {usage['contents_fetched']} profiles, skipped for {usage['contents_skipped']} "
+              f"already known (~{usage['skipped_content_bytes'] / 1024:.1f} KB not re-fetched)")
+
+def search_with_rate_limiting(queries, user_query, client=None, max_in_flight=None,
+                              rate=None, burst=None, budget=None, packed=None, session_id=None,
+                              limiter=None, stop=None):
+    """
+    Search the most promising queries within an Exa call budget, concurrently under a token-bucket rate limit.
+    packed maps packed query strings to PackedQuery so their results are attributed per role/company.
+    Pass the session_id of a checkpointed session to skip queries it has already searched.
+    limiter and stop are passed on to run_search_plan.
+    """
+    packed = packed or {}
+    total_queries = len(queries)
+    budget = budget or EXA_QUERY_BUDGET or math.ceil(total_queries / 4)
+    if session_id is None:
+        session_id = create_session(user_query, queries, packed=packed, budget=budget)
+    
+    conn = sqlite3.connect(DB_NAME)
+    try:
+        done = {row[0] for row in conn.execute(
+            "SELECT query FROM session_queries WHERE session_id = ? AND status = 'done'", (session_id,))}
+        # Retried before any query still pending
+        retry = [row[0] for row in conn.execute(
+            "SELECT query FROM session_queries WHERE session_id = ? AND status = 'failed'", (session_id,))]
+        # Requests an earlier run of the session sent, failed and deepened ones included;
+        # queries served from cache are done but cost nothing
+        sent = conn.execute("SELECT COALESCE(exa_requests, 0) FROM search_sessions WHERE id = ?",
+                            (session_id,)).fetchone()
+    finally:
+        conn.close()
+    plan = SharedQueryPlan()
+    plan.add(session_id, queries, packed=packed, skip=done)
+    remaining_budget = max(0, budget - (sent[0] if sent else 0))
+    
+    print(f"\n🔍 Starting Exa API searches with rate limiting (session #{session_id})...")
+    print(f"📊 Total queries: {total_queries} ({len(plan.queries())} unique still to search)")
+    stats = run_search_plan(plan, remaining_budget, client=client, max_in_flight=max_in_flight,
+                            rate=rate, burst=burst, limiter=limiter, stop=stop, retry=retry)
+    extract_lead_fields([session_id])
+    leads = resolve_new_leads()
     
     # Save search session
-    save_search_session(user_query, total_queries, queries_searched)
+    failed = stats['failed'][session_id]
+    exa_calls_avoided = stats['avoided'][session_id]
+    usage = stats['usage'][session_id]
+    queries_searched = finish_search_session(session_id, exa_calls_avoided, usage=usage)
     
-    print(f"\n📊 Search Summary:")
+    network_calls = stats['exa_requests']
+    print(f"\n📊 Search Summary (session #{session_id}):")
     print(f"   - Total queries generated: {total_queries}")
-    print(f"   - Queries actually searched: {queries_searched}")
-    print(f"   - Total results found: {total_results}")
+    print(f"   - Queries searched this run: {stats['searched']} (stopped: {stats['stop_reason']})")
+    print(f"   - Queries searched in session: {queries_searched}")
+    if failed:
+        print(f"   - Failed queries: {failed} (retry with --resume {session_id})")
+    print(f"   - Exa network calls: {network_calls}")
+    print(f"   - Network calls avoided: {exa_calls_avoided} "
+          f"({stats['cache_hits']} served from cache, {plan.duplicates[session_id]} duplicate queries)")
+    print(f"   - Total results found: {stats['total_results']}")
+    print(f"   - New unique profiles: {stats['new_profiles']}"
+          f" ({stats['new_profiles'] / network_calls if network_calls else 0:.2f} per Exa call)")
+    print_exa_usage(usage, stats['new_profiles'])
+    print(f"   - Leads after dedup: {leads['leads']} ({leads['merged']} new profiles merged into existing leads)")
     print(f"   - Results saved to database: {DB_NAME}")
     
-    return queries_searched, total_results
+    return queries_searched, stats['total_results']
 
-def read_prompt_file(filename):
-    """Read prompt file content"""
+def resume_session(session_id, client=None):
+    """Continue a checkpointed session's unfinished queries without redoing any LLM stage"""
+    session = load_session(session_id)
+    if session is None:
+        print(f"❌ Session #{session_id} not found in {DB_NAME}")
+        sys.exit(1)
+    if not session['queries']:
+        print(f"❌ Session #{session_id} has no checkpointed queries to resume")
+        sys.exit(1)
+    
+    print(f"\n♻️  Resuming session #{session_id}: '{session['user_query']}'")
+    print(f"   - Status: {session.get('status')}")
+    print(f"   - Job Roles: {len(session['job_roles'] or [])}")
+    print(f"   - Company Names: {len(session['company_names'] or [])}")
+    print(f"   - Queries done: {len(session['done'])}/{len(session['queries'])}")
+    
+    set_session_status(session_id, 'searching')
+    return search_with_rate_limiting(
+        session['queries'], session['user_query'], client=client,
+        budget=session.get('budget'), packed=session['packed'], session_id=session_id
+    )
+
+def prepare_user_query(user_query):
+    """Run the LLM stages for one batch entry; returns their outputs, or None if a stage failed"""
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            return file.read()
-    except FileNotFoundError:
-        print(f"❌ Error: Could not find {filename}")
-        return None
-    except Exception as e:
-        print(f"❌ Error reading {filename}: {str(e)}")
+        outputs, _ = run_llm_stages(user_query)
+        return outputs
+    except (Exception, SystemExit) as e:
+        # A Groq failure or an unrepairable reply only fails this user query
+        print(f"❌ LLM stages failed for '{user_query}': {str(e) or type(e).__name__}")
         return None
 
-def call_groq_api(prompt, input_data):
-    """Call Groq API with the given prompt and input"""
-    # Replace template variables in prompt
-    if isinstance(input_data, str):
-        full_prompt = prompt.replace('${user_query}', input_data)
-    else:
-        full_prompt = prompt
-        full_prompt = full_prompt.replace('${user_query}', input_data.get('user_query', ''))
-        full_prompt = full_prompt.replace('${persona}', input_data.get('persona', ''))
-        full_prompt = full_prompt.replace('${company_type}', input_data.get('company_type', ''))
-        full_prompt = full_prompt.replace('${location}', input_data.get('location', ''))
-        full_prompt = full_prompt.replace('${occupation_description}', input_data.get('occupation_description', ''))
-        full_prompt = full_prompt.replace('${company_description}', input_data.get('company_description', ''))
-    
-    print(f"\n🤖 Calling Groq API...")
-    
-    headers = {
-        'Content-Type': 'application/json',
-        'Authorization': f'Bearer {GROQ_API_KEY}'
+def run_batch(path, client=None, budget=None, pack=False, concurrency=None, wave_size=None):
+    """
+    Run every user query in a JSONL file through the pipeline, one session each.
+    User queries are read in waves; LLM stages run for up to `concurrency` of them at once
+    (identical user queries only once), then the wave's dorked queries are merged so a query
+    several sessions share costs one Exa call and its results are linked to all of them.
+    """
+    concurrency = concurrency or BATCH_CONCURRENCY
+    wave_size = wave_size or BATCH_WAVE_SIZE
+    totals = {'user_queries': 0, 'sessions': 0, 'failed': 0, 'requested': 0,
+              'unique': 0, 'network_calls': 0, 'new_profiles': 0,
+              'merged': 0, 'leads': 0, 'usage': dict.fromkeys(EXA_USAGE_COLUMNS, 0)}
+    
+    print(f"\n📦 Batch: {path} ({concurrency} user queries at once, waves of {wave_size})")
+    for wave_number, wave in enumerate(chunked(read_user_queries(path), wave_size), 1):
+        print(f"\n📦 Wave {wave_number}: {len(wave)} user queries")
+        print("=" * 60)
+        totals['user_queries'] += len(wave)
+        
+        # Steps 1-3 for the whole wave; repeated user queries share one LLM run
+        distinct = {}
+        for _, user_query, _ in wave:
+            distinct.setdefault(normalize_user_query(user_query), user_query)
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            prepared = dict(zip(distinct, pool.map(prepare_user_query, distinct.values())))
+        
+        # Step 4: dorked queries per user query, checkpointed as one session each
+        plan = SharedQueryPlan()
+        wave_budget = 0
+        for line_number, user_query, _ in wave:
+            outputs = prepared[normalize_user_query(user_query)]
+            if outputs is None:
+                totals['failed'] += 1
+                continue
+            job_roles = outputs['job_roles']
+            company_names = outputs['company_names']
+            with metrics.span('dorking'):
+                queries = generate_dorked_queries(job_roles, company_names)
+                packed = {}
+                if pack:
+                    packed = {p.query: p for p in pack_queries(job_roles, company_names,
+                                                               max_length=EXA_MAX_QUERY_LENGTH)}
+                    queries = list(packed)
+            session_budget = budget or EXA_QUERY_BUDGET or math.ceil(len(queries) / 4)
+            session_id = create_session(
+                user_query, queries,
+                variables=outputs['variables'], descriptions=outputs['descriptions'],
+                job_roles=job_roles, company_names=company_names, packed=packed, budget=session_budget
+            )
+            plan.add(session_id, queries, packed=packed)
+            wave_budget += session_budget
+            print(f"   - Line {line_number}: session #{session_id}, {len(queries)} queries, '{user_query[:60]}'")
+        
+        if not plan.session_ids:
+            continue
+        
+        # Step 5: each unique Exa query once, attributed to every session that wanted it
+        print(f"\n🔗 Merged {plan.requested} session queries into {len(plan.queries())} unique Exa queries")
+        stats = run_search_plan(plan, wave_budget, client=client)
+        extract_lead_fields(plan.session_ids)
+        leads = resolve_new_leads()
+        for session_id in plan.session_ids:
+            finish_search_session(session_id, stats['avoided'][session_id], usage=stats['usage'][session_id])
+        
+        totals['sessions'] += len(plan.session_ids)
+        totals['requested'] += plan.requested
+        totals['unique'] += len(plan.queries())
+        totals['network_calls'] += stats['exa_requests']
+        totals['new_profiles'] += stats['new_profiles']
+        for usage in stats['usage'].values():
+            for column, amount in usage.items():
+                totals['usage'][column] += amount
+        totals['merged'] += leads['merged']
+        totals['leads'] = leads['leads']
+    
+    print(f"\n📊 Batch Summary:")
+    print(f"   - User queries: {totals['user_queries']} ({totals['failed']} failed)")
+    print(f"   - Sessions created: {totals['sessions']}")
+    print(f"   - Session queries: {totals['requested']} ({totals['unique']} unique after merging)")
+    print(f"   - Exa network calls: {totals['network_calls']}")
+    print(f"   - New unique profiles: {totals['new_profiles']}")
+    print_exa_usage(totals['usage'], totals['new_profiles'])
+    print(f"   - Leads after dedup: {totals['leads']} ({totals['merged']} profiles merged into existing leads)")
+    print_parse_metrics()
+    print(f"   - Results saved to database: {DB_NAME}")
+    return totals
+
+def get_prompt_registry():
+    """Return the shared prompt templates, loading and validating PROMPTS_DIR on first use"""
+    global prompt_registry
+    with prompt_lock:
+        if prompt_registry is None:
+            try:
+                registry = PromptRegistry(PROMPTS_DIR)
+            except OSError as e:
+                print(f"❌ Error reading prompts from {PROMPTS_DIR}: {str(e)}")
+                sys.exit(1)
+            problems = registry.validate()
+            if problems:
+                for problem in problems:
+                    print(f"❌ Prompt error: {problem}")
+                sys.exit(1)
+            chars, tokens = registry.size()
+            print(f"📄 Loaded {len(registry.templates)} prompt templates from {PROMPTS_DIR} "
+                  f"(stage prompts: {chars} chars, ~{tokens} tokens)")
+            prompt_registry = registry
+    return prompt_registry
+
+def get_llm_cache():
+    """Return the shared Groq response cache, opening it on first use"""
+    global llm_cache
+    if llm_cache is None:
+        with shared_lock:
+            if llm_cache is None:
+                llm_cache = LLMCache(LLM_CACHE_DB, ttl=LLM_CACHE_TTL,
+                                     max_entries=LLM_CACHE_MAX_ENTRIES, mode=LLM_CACHE_MODE)
+    return llm_cache
+
+def create_llm_provider(name):
+    """Build an LLM provider by name; HTTP providers share the Groq timeout/retry/breaker settings"""
+    client_options = {
+        'timeout': (GROQ_CONNECT_TIMEOUT, GROQ_READ_TIMEOUT),
+        'max_retries': GROQ_MAX_RETRIES,
+        'backoff_base': GROQ_BACKOFF_BASE,
+        'backoff_cap': GROQ_BACKOFF_CAP,
+        'breaker': CircuitBreaker(GROQ_BREAKER_THRESHOLD, GROQ_BREAKER_RESET),
     }
+    if name == 'groq':
+        return OpenAICompatibleProvider(GROQ_API_URL, LLM_MODEL, GROQ_API_KEY, name='groq', **client_options)
+    if name == 'openai':
+        return OpenAICompatibleProvider(LLM_API_URL, LLM_MODEL, LLM_API_KEY, name='openai', **client_options)
+    if name == 'replay':
+        return ReplayProvider(LLM_RECORDINGS, LLM_MODEL)
+    if name == 'record' and LLM_RECORD_FROM != 'record':
+        return RecordingProvider(create_llm_provider(LLM_RECORD_FROM), LLM_RECORDINGS)
+    raise ValueError(f"Unknown LLM provider '{name}' (choose from {', '.join(LLM_PROVIDERS)})")
+
+def get_llm_provider():
+    """Return the shared LLM provider, so every call reuses its pooled keep-alive connections"""
+    global llm_provider
+    if llm_provider is None:
+        with shared_lock:
+            if llm_provider is None:
+                llm_provider = create_llm_provider(LLM_PROVIDER)
+    return llm_provider
+
+def render_prompt(prompt, input_data):
+    """Fill a PromptTemplate's placeholders; a plain string input is the user query"""
+    if isinstance(input_data, str):
+        return prompt.render({'user_query': input_data})
+    return prompt.render({name: input_data.get(name) or '' for name in prompt.placeholders})
+
+def call_llm(full_prompt, max_tokens=2000, json_mode=False):
+    """
+    Send a rendered prompt to the configured LLM provider (Groq by default),
+    serving repeats from the response cache.
+    Raises GroqError once retries are exhausted, the circuit breaker is open or a replay has no recording.
+    """
+    provider = get_llm_provider()
     
     payload = {
-        'model': 'llama3-8b-8192',
+        'model': provider.model,
         'messages': [
             {
                 'role': 'user',
@@ -224,69 +1148,87 @@ def call_groq_api(prompt, input_data):
             }
         ],
         'temperature': 0.3,
-        'max_tokens': 2000
+        'max_tokens': max_tokens
     }
+    if json_mode:
+        payload['response_format'] = {'type': 'json_object'}
+    
+    cache = get_llm_cache()
+    cache_key = make_cache_key(payload)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        print(f"\n⚡ LLM response served from cache")
+        return cached
+    
+    print(f"\n🤖 Calling {provider.name} LLM ({provider.model})...")
     
     try:
-        response = requests.post(GROQ_API_URL, headers=headers, json=payload)
-        response.raise_for_status()
-        
-        data = response.json()
-        ai_response = data['choices'][0]['message']['content'].strip()
-        
-        print(f"✅ AI Response received")
-        return ai_response
-        
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error calling Groq API: {str(e)}")
-        sys.exit(1)
-    except KeyError as e:
-        print(f"❌ Unexpected API response format: {str(e)}")
-        sys.exit(1)
-
-def parse_json_response(response_text, step_name):
-    """Parse JSON response from AI, handling potential formatting issues"""
-    # Remove markdown code blocks if present
-    clean_response = response_text.strip()
-    if clean_response.startswith('```json'):
-        clean_response = clean_response[7:]
-    if clean_response.startswith('```'):
-        clean_response = clean_response[3:]
-    if clean_response.endswith('```'):
-        clean_response = clean_response[:-3]
-    
-    clean_response = clean_response.strip()
-    
-    # Look for JSON content between { and }
-    start_idx = clean_response.find('{')
-    end_idx = clean_response.rfind('}')
-    
-    if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
-        json_content = clean_response[start_idx:end_idx+1]
-        try:
-            return json.loads(json_content)
-        except json.JSONDecodeError:
-            pass
+        with metrics.timer('llm_request_seconds', provider=provider.name):
+            ai_response = provider.complete(payload)
+        metrics.inc('llm_requests_total', provider=provider.name)
+    except GroqError as e:
+        metrics.inc('llm_errors_total', provider=provider.name)
+        print(f"❌ Error calling {provider.name} LLM: {str(e)}")
+        raise
     
-    # Look for JSON array content between [ and ]
-    start_idx = clean_response.find('[')
-    end_idx = clean_response.rfind(']')
+    print(f"✅ AI Response received")
+    cache.put(cache_key, ai_response, model=payload['model'])
+    return ai_response
+
+def call_groq_api(prompt, input_data, json_mode=False, stage=None):
+    """Call the LLM with the given prompt template and input, counting the rendered prompt's size"""
+    full_prompt = render_prompt(prompt, input_data)
+    labels = {'stage': stage} if stage else {}
+    metrics.inc('llm_prompt_chars', len(full_prompt), **labels)
+    metrics.inc('llm_prompt_tokens_estimate', estimate_tokens(full_prompt), **labels)
+    return call_llm(full_prompt, json_mode=json_mode)
+
+def call_llm_json(prompt, input_data, stage):
+    """
+    Call the LLM for a stage and return its reply parsed and validated against the stage's schema.
+    A reply that doesn't fit gets a short repair prompt (not the full prompt again); raises
+    StructuredOutputError if the repairs fail too.
+    """
+    json_mode = LLM_JSON_MODE and wants_json_object(stage)
+    response = call_groq_api(prompt, input_data, json_mode=json_mode, stage=stage)
+    try:
+        value = parse_stage_output(stage, response)
+        parse_metrics.add(stage, responses=1)
+        return value
+    except StructuredOutputError as e:
+        parse_metrics.add(stage, responses=1, parse_failures=1)
+        error = e
     
-    if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
-        json_content = clean_response[start_idx:end_idx+1]
+    for attempt in range(LLM_REPAIR_RETRIES):
+        print(f"⚠️  {stage} reply didn't match its schema ({'; '.join(error.errors)}), asking for a repair")
+        repair_prompt = build_repair_prompt(stage, error)
+        start = time.perf_counter()
+        try:
+            response = call_llm(repair_prompt, max_tokens=LLM_REPAIR_MAX_TOKENS, json_mode=json_mode)
+        finally:
+            parse_metrics.add(stage, repairs=1, repair_seconds=time.perf_counter() - start,
+                              repair_prompt_chars=len(repair_prompt))
         try:
-            return json.loads(json_content)
-        except json.JSONDecodeError:
-            pass
+            value = parse_stage_output(stage, response)
+            parse_metrics.add(stage, repaired=1)
+            return value
+        except StructuredOutputError as e:
+            error = e
     
-    # If all else fails, try the original response
-    try:
-        return json.loads(clean_response)
-    except json.JSONDecodeError as e:
-        print(f"❌ Failed to parse {step_name} response as JSON:")
-        print(f"Response: {response_text}")
-        print(f"Error: {str(e)}")
-        sys.exit(1)
+    print(f"❌ Failed to parse {stage} response as JSON:")
+    print(f"Response: {error.raw}")
+    raise error
+
+def print_parse_metrics():
+    """Print per-stage JSON parse failures and what repairing them cost"""
+    snapshot = parse_metrics.snapshot()
+    responses = sum(entry['responses'] for entry in snapshot.values())
+    failures = sum(entry['parse_failures'] for entry in snapshot.values())
+    print(f"   - JSON parse failures: {failures}/{responses} replies")
+    for stage, entry in snapshot.items():
+        if entry['parse_failures']:
+            print(f"     • {stage}: {entry['failure_rate']:.0%} failed, {entry['repaired']}/{entry['repairs']} "
+                  f"repairs succeeded ({entry['repair_seconds']:.2f}s, {entry['repair_prompt_chars']} prompt chars)")
 
 def generate_dorked_queries(job_roles, company_names):
     """Generate dorked search queries from job roles and company names"""
@@ -299,16 +1241,241 @@ def generate_dorked_queries(job_roles, company_names):
             
     return queries
 
+def load_prompt_or_exit(stage):
+    """The prompt template of an LLM stage (the registry exits if the templates don't validate)"""
+    return get_prompt_registry().stage(stage)
+
+def extract_variables(user_query):
+    """Step 1: Extract persona, company type and location from the user query"""
+    print("\n📊 Step 1: Variable Extraction")
+    variable_extractor_prompt = load_prompt_or_exit('variables')
+    
+    variables = call_llm_json(variable_extractor_prompt, user_query, 'variables')
+    
+    print(f"✅ Extracted Variables:")
+    print(f"   - Persona: {variables.get('persona')}")
+    print(f"   - Company Type: {variables.get('company_type')}")
+    print(f"   - Location: {variables.get('location')}")
+    return variables
+
+def generate_descriptions(variables):
+    """Step 2: Expand the extracted variables into persona and company descriptions"""
+    print("\n📝 Step 2: Description Generation")
+    description_prompt = load_prompt_or_exit('descriptions')
+    
+    descriptions = call_llm_json(description_prompt, variables, 'descriptions')
+    
+    print(f"✅ Persona Description: {descriptions.get('persona_description')}")
+    print(f"✅ Company Description: {descriptions.get('company_description')}")
+    return descriptions
+
+def generate_job_roles(persona_description):
+    """Step 3A: Turn the persona description into a list of job roles"""
+    print("\n👥 Step 3A: Generating Job Roles")
+    job_roles_prompt = load_prompt_or_exit('job_roles')
+    
+    job_roles = call_llm_json(job_roles_prompt, {'occupation_description': persona_description}, 'job_roles')
+    
+    print(f"✅ Job Roles ({len(job_roles)} found):")
+    for i, role in enumerate(job_roles, 1):
+        print(f"   {i}. {role}")
+    return job_roles
+
+def generate_company_names(company_description, location):
+    """Step 3B: Turn the company description and location into a list of companies"""
+    print("\n🏢 Step 3B: Generating Company Names")
+    company_names_prompt = load_prompt_or_exit('company_names')
+    
+    company_input = {
+        'company_description': company_description,
+        'location': location
+    }
+    company_names = call_llm_json(company_names_prompt, company_input, 'company_names')
+    
+    print(f"✅ Company Names ({len(company_names)} found):")
+    for i, company in enumerate(company_names, 1):
+        print(f"   {i}. {company}")
+    return company_names
+
+def build_llm_stages(user_query):
+    """Describe the LLM steps as a DAG - job roles and company names only need the descriptions"""
+    return [
+        Stage('variables', lambda inputs: extract_variables(user_query)),
+        Stage('descriptions', lambda inputs: generate_descriptions(inputs['variables']),
+              deps=['variables']),
+        Stage('job_roles', lambda inputs: generate_job_roles(
+                  inputs['descriptions'].get('persona_description')),
+              deps=['descriptions']),
+        Stage('company_names', lambda inputs: generate_company_names(
+                  inputs['descriptions'].get('company_description'),
+                  inputs['variables'].get('location', '')),
+              deps=['variables', 'descriptions']),
+    ]
+
+def run_llm_stages(user_query):
+    """Run the LLM steps, with independent ones in parallel, and return (outputs, timings)"""
+    stages = build_llm_stages(user_query)
+    offset = time.perf_counter() - metrics.t0
+    outputs, timings = run_stages(stages)
+    for name, timing in timings.items():
+        metrics.record_span(name, offset + timing['start'], offset + timing['end'])
+    print_stage_timings(stages, timings)
+    
+    stats = get_llm_cache().stats()
+    print(f"   - LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"({stats['hit_rate']:.0%} hit rate, mode '{get_llm_cache().mode}')")
+    print_parse_metrics()
+    return outputs, timings
+
+def record_run_metrics():
+    """Copy cache, transport, parse and writer counters into the metrics registry as gauges"""
+    for name, cache in (('llm', llm_cache), ('exa', search_cache)):
+        if cache is not None:
+            lookups = cache.hits + cache.misses
+            metrics.set('cache_hits', cache.hits, cache=name)
+            metrics.set('cache_misses', cache.misses, cache=name)
+            metrics.set('cache_hit_rate', cache.hits / lookups if lookups else 0.0, cache=name)
+    if llm_provider is not None:
+        for field, value in llm_provider.stats().items():
+            metrics.set(f'llm_http_{field}', value, provider=llm_provider.name)
+    for stage, counts in parse_metrics.snapshot().items():
+        for field, value in counts.items():
+            metrics.set(f'llm_{field}', value, stage=stage)
+
+def save_run_metrics(path=None):
+    """Flush the writer under a persistence span, then save this run's metrics to the DB (and path)"""
+    writer = db_writer
+    with metrics.span('persistence'):
+        close_db_writer()
+    if writer is not None:
+        metrics.set('db_rows_written', writer.rows_written)
+        metrics.set('db_commits', writer.commits)
+        metrics.set('db_writer_busy_seconds', writer.busy_seconds)
+        # Writes that failed and were rolled back alone (their futures hold the errors)
+        metrics.set('db_write_errors', writer.errors)
+    record_run_metrics()
+    
+    run_id = uuid.uuid4().hex[:12]
+    session_id = run_session_ids[0] if len(run_session_ids) == 1 else None
+    try:
+        conn = sqlite3.connect(DB_NAME)
+        conn.executemany(INSERT_METRIC_SQL, [(run_id, session_id) + row for row in metrics.rows()])
+        conn.commit()
+        conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️  Could not save run metrics: {str(e)}")
+    if path:
+        metrics.write(path)
+        print(f"📈 Metrics written to {path}")
+    
+    print(f"\n📈 Run metrics (run {run_id}):")
+    for name, seconds in metrics.span_totals().items():
+        print(f"   - {name}: {seconds:.2f}s")
+    for label, name in (('Exa', 'exa_request_seconds'), ('LLM', 'llm_request_seconds')):
+        summaries = [h.summary() for (n, _), h in metrics.histograms.items() if n == name]
+        if summaries and summaries[0]['count']:
+            print(f"   - {label} latency: p50 {summaries[0]['p50']:.2f}s, p95 {summaries[0]['p95']:.2f}s "
+                  f"over {summaries[0]['count']} calls")
+
+def parse_args(argv=None):
+    """Parse command line flags"""
+    parser = argparse.ArgumentParser(description="LinkedIn Lead Research Generator")
+    parser.add_argument('--pack', action='store_true', default=EXA_PACK_QUERIES,
+                        help="pack several roles/companies into each Exa query")
+    parser.add_argument('--budget', type=int, default=None,
+                        help="maximum Exa searches for this session (default: a quarter of the queries)")
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument('--no-cache', action='store_true',
+                             help="bypass the Groq response and Exa result caches")
+    cache_group.add_argument('--refresh-cache', action='store_true',
+                             help="ignore cached Groq/Exa responses and store fresh ones")
+    session_group = parser.add_mutually_exclusive_group()
+    session_group.add_argument('--resume', type=int, metavar='SESSION_ID',
+                               help="continue the unfinished queries of a checkpointed session")
+    session_group.add_argument('--list-sessions', action='store_true',
+                               help="list recent sessions and their progress, then exit")
+    session_group.add_argument('--batch', metavar='JSONL',
+                               help="run every user query in a JSONL file, sharing common Exa queries")
+    parser.add_argument('--query', default=None,
+                        help="user query to research (otherwise it is asked for)")
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help="user queries whose LLM stages run at once in --batch mode")
+    parser.add_argument('--metrics', metavar='FILE', default=METRICS_FILE or None,
+                        help="also write run metrics to FILE (.prom/.txt: Prometheus text, otherwise JSON)")
+    parser.add_argument('--profile', metavar='FILE', nargs='?', const='linkedin_leads.prof', default=None,
+                        help="run under cProfile, dump stats to FILE and print the top functions")
+    return parser.parse_args(argv)
+
 def main():
     """Main function that runs the complete LinkedIn lead research flow"""
+    args = parse_args()
+    if args.list_sessions:
+        run(args)
+        return
+    
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+    try:
+        if profiler is not None:
+            profiler.runcall(run, args)
+        else:
+            run(args)
+    finally:
+        save_run_metrics(args.metrics)
+        if profiler is not None:
+            profiler.dump_stats(args.profile)
+            print(f"\n🔬 Profile written to {args.profile} (top 15 by cumulative time):")
+            import pstats
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+
+def run(args):
+    """Run the mode selected on the command line"""
+    global LLM_CACHE_MODE, EXA_CACHE_MODE
+    if args.no_cache:
+        LLM_CACHE_MODE = EXA_CACHE_MODE = 'off'
+    elif args.refresh_cache:
+        LLM_CACHE_MODE = EXA_CACHE_MODE = 'refresh'
+    if LLM_PROVIDER not in LLM_PROVIDERS:
+        print(f"❌ Unknown LLM_PROVIDER '{LLM_PROVIDER}' (choose from {', '.join(LLM_PROVIDERS)})")
+        sys.exit(1)
+    
     print("🚀 LinkedIn Lead Research Generator")
     print("=" * 50)
     
     # Initialize database
     init_database()
     
+    if args.list_sessions:
+        list_sessions()
+        return
+    
+    if args.resume is not None:
+        try:
+            resume_session(args.resume)
+            print("\n✅ LinkedIn lead research completed successfully!")
+            print(f"💾 Results saved to database: {DB_NAME}")
+        except KeyboardInterrupt:
+            print("\n\n❌ Process interrupted by user")
+            print(f"♻️  Resume with: python linkedin_lead_generator.py --resume {args.resume}")
+            sys.exit(1)
+        return
+    
+    if args.batch:
+        try:
+            run_batch(args.batch, budget=args.budget, pack=args.pack, concurrency=args.concurrency)
+        except KeyboardInterrupt:
+            print("\n\n❌ Process interrupted by user")
+            print("♻️  Unfinished sessions: python linkedin_lead_generator.py --list-sessions")
+            sys.exit(1)
+        except OSError as e:
+            print(f"❌ Could not read batch file: {str(e)}")
+            sys.exit(1)
+        return
+    
     # Get user input
-    user_query = input("\n📝 Enter your search query: ").strip()
+    user_query = (args.query or input("\n📝 Enter your search query: ")).strip()
     if not user_query:
         print("❌ No query provided. Exiting.")
         sys.exit(1)
@@ -316,69 +1483,17 @@ def main():
     print(f"\n🔍 Processing: '{user_query}'")
     print("=" * 50)
     
+    session_id = None
     try:
-        # Step 1: Variable Extraction
-        print("\n📊 Step 1: Variable Extraction")
-        variable_extractor_prompt = read_prompt_file('varible-extractor.md')
-        if not variable_extractor_prompt:
-            sys.exit(1)
-        
-        extracted_variables_response = call_groq_api(variable_extractor_prompt, user_query)
-        variables = parse_json_response(extracted_variables_response, "variable extraction")
-        
-        print(f"✅ Extracted Variables:")
-        print(f"   - Persona: {variables.get('persona')}")
-        print(f"   - Company Type: {variables.get('company_type')}")
-        print(f"   - Location: {variables.get('location')}")
-        
-        # Step 2: Description Generation
-        print("\n📝 Step 2: Description Generation")
-        description_prompt = read_prompt_file('extracted-variables-to-description.md')
-        if not description_prompt:
-            sys.exit(1)
-        
-        descriptions_response = call_groq_api(description_prompt, variables)
-        descriptions = parse_json_response(descriptions_response, "description generation")
-        
-        persona_description = descriptions.get('persona_description')
-        company_description = descriptions.get('company_description')
-        
-        print(f"✅ Persona Description: {persona_description}")
-        print(f"✅ Company Description: {company_description}")
-        
-        # Step 3: Generate Job Roles
-        print("\n👥 Step 3A: Generating Job Roles")
-        job_roles_prompt = read_prompt_file('job-description-to-role-list.md')
-        if not job_roles_prompt:
-            sys.exit(1)
-        
-        job_roles_response = call_groq_api(job_roles_prompt, {'occupation_description': persona_description})
-        job_roles = parse_json_response(job_roles_response, "job roles generation")
-        
-        print(f"✅ Job Roles ({len(job_roles)} found):")
-        for i, role in enumerate(job_roles, 1):
-            print(f"   {i}. {role}")
-        
-        # Step 4: Generate Company Names
-        print("\n🏢 Step 3B: Generating Company Names")
-        company_names_prompt = read_prompt_file('company-description-and-location-to-list.md')
-        if not company_names_prompt:
-            sys.exit(1)
-        
-        company_input = {
-            'company_description': company_description,
-            'location': variables.get('location', '')
-        }
-        company_names_response = call_groq_api(company_names_prompt, company_input)
-        company_names = parse_json_response(company_names_response, "company names generation")
-        
-        print(f"✅ Company Names ({len(company_names)} found):")
-        for i, company in enumerate(company_names, 1):
-            print(f"   {i}. {company}")
+        # Steps 1-3: Variable extraction, descriptions, then job roles and company names in parallel
+        outputs, timings = run_llm_stages(user_query)
+        job_roles = outputs['job_roles']
+        company_names = outputs['company_names']
         
         # Step 5: Generate Dorked Queries
         print("\n🔍 Step 4: Generating Dorked Search Queries")
-        dorked_queries = generate_dorked_queries(job_roles, company_names)
+        with metrics.span('dorking'):
+            dorked_queries = generate_dorked_queries(job_roles, company_names)
         
         print(f"\n🎯 GENERATED DORKED SEARCH QUERIES ({len(dorked_queries)} total):")
         print("=" * 60)
@@ -396,17 +1511,41 @@ def main():
         print(f"   - Total Queries Generated: {len(dorked_queries)}")
         print(f"   - Combinations: {len(job_roles)} × {len(company_names)} = 1 query per combination")
         
+        packed = {}
+        if args.pack:
+            packed = {p.query: p for p in pack_queries(job_roles, company_names, max_length=EXA_MAX_QUERY_LENGTH)}
+            print(f"   - Packed into {len(packed)} queries of up to {EXA_MAX_QUERY_LENGTH} characters")
+            dorked_queries = list(packed)
+        
+        # Checkpoint the session before searching so an interrupted run can be resumed
+        session_id = create_session(
+            user_query, dorked_queries,
+            variables=outputs['variables'], descriptions=outputs['descriptions'],
+            job_roles=job_roles, company_names=company_names, packed=packed,
+            budget=args.budget or EXA_QUERY_BUDGET or math.ceil(len(dorked_queries) / 4)
+        )
+        
         # Step 6: Search with Exa API (rate limited)
-        queries_searched, total_results = search_with_rate_limiting(dorked_queries, user_query)
+        queries_searched, total_results = search_with_rate_limiting(dorked_queries, user_query,
+                                                                    budget=args.budget, packed=packed,
+                                                                    session_id=session_id)
         
         print("\n✅ LinkedIn lead research completed successfully!")
         print(f"💾 Results saved to database: {DB_NAME}")
         
     except KeyboardInterrupt:
         print("\n\n❌ Process interrupted by user")
+        if session_id is not None:
+            print(f"♻️  Resume with: python linkedin_lead_generator.py --resume {session_id}")
+        sys.exit(1)
+    except GroqError as e:
+        print(f"\n❌ Groq API unavailable, stopping: {str(e)}")
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ Unexpected error: {str(e)}")
+        if session_id is not None:
+            set_session_status(session_id, 'failed')
+            print(f"♻️  Resume with: python linkedin_lead_generator.py --resume {session_id}")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Persistent LLM Response Cache
+Stores Groq responses on disk in SQLite, keyed by a hash of the model, the
+rendered prompt and the sampling parameters, with TTL and LRU eviction.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+# Cache modes: 'on' reads and writes, 'refresh' skips reads but stores fresh
+# responses, 'off' bypasses the cache entirely
+CACHE_MODES = ('on', 'refresh', 'off')
+
+
+def make_cache_key(payload):
+    """Content-address a request payload (model, messages, sampling params)"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response cache with TTL expiry and LRU size bound"""
+
+    def __init__(self, path='llm_cache.db', ttl=7 * 24 * 3600, max_entries=5000, mode='on'):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}', expected one of {CACHE_MODES}")
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hit_count INTEGER DEFAULT 0
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used)')
+        self.conn.commit()
+
+    def get(self, key):
+        """Return the cached response for key, or None on miss/expiry/bypass"""
+        if self.mode != 'on':
+            return None
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT response, created_at FROM llm_cache WHERE key = ?', (key,)
+            ).fetchone()
+            now = time.time()
+            if row is None:
+                self.misses += 1
+                return None
+            response, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self.conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                self.conn.commit()
+                self.expired += 1
+                self.misses += 1
+                return None
+            self.conn.execute(
+                'UPDATE llm_cache SET last_used = ?, hit_count = hit_count + 1 WHERE key = ?',
+                (now, key)
+            )
+            self.conn.commit()
+            self.hits += 1
+            return response
+
+    def put(self, key, response, model=None):
+        """Store a response and evict least-recently-used entries past max_entries"""
+        if self.mode == 'off':
+            return
+        with self.lock:
+            now = time.time()
+            self.conn.execute('''
+                INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_used, hit_count)
+                VALUES (?, ?, ?, ?, ?, 0)
+            ''', (key, model, response, now, now))
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        if not self.max_entries:
+            return
+        count = self.conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self.conn.execute('''
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_used ASC LIMIT ?
+                )
+            ''', (overflow,))
+            self.evicted += overflow
+
+    def purge_expired(self):
+        """Delete every entry older than the TTL and return how many were removed"""
+        if self.ttl is None:
+            return 0
+        with self.lock:
+            cursor = self.conn.execute(
+                'DELETE FROM llm_cache WHERE created_at < ?', (time.time() - self.ttl,)
+            )
+            self.conn.commit()
+            self.expired += cursor.rowcount
+            return cursor.rowcount
+
+    def stats(self):
+        """Return hit/miss counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'evicted': self.evicted,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
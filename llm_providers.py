@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+LLM Providers
+Interchangeable backends for the pipeline's chat completions: Groq, any
+OpenAI-compatible server (e.g. a local llama.cpp, vLLM or Ollama endpoint),
+and a record/replay pair that saves responses to a JSONL file and serves them
+back offline, so runs and benchmarks are deterministic without a key or network.
+"""
+
+import json
+import os
+import threading
+
+from groq_client import GroqClient, GroqError
+from llm_cache import make_cache_key
+
+LLM_PROVIDERS = ('groq', 'openai', 'replay', 'record')
+
+
+class ReplayMissError(GroqError):
+    """The replay recordings have no response for this request"""
+
+
+class LLMProvider:
+    """Base class: complete(payload) takes an OpenAI-style chat payload and returns the message text"""
+
+    name = 'llm'
+
+    def __init__(self, model):
+        self.model = model
+
+    def complete(self, payload):
+        raise NotImplementedError
+
+    def stats(self):
+        """Transport counters (requests, retries, bytes); empty for providers without a network"""
+        return {}
+
+    def close(self):
+        pass
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Any server exposing POST /chat/completions in OpenAI's format, Groq included"""
+
+    def __init__(self, url, model, api_key='not-needed', name='openai', **client_options):
+        super().__init__(model)
+        self.name = name
+        self.client = GroqClient(api_key, url, **client_options)
+
+    def complete(self, payload):
+        return self.client.chat(payload)
+
+    def stats(self):
+        return self.client.stats()
+
+    def close(self):
+        self.client.close()
+
+
+def load_recordings(path):
+    """Read recorded responses from JSONL into {key: response}; later lines win"""
+    recordings = {}
+    if not os.path.exists(path):
+        return recordings
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                recordings[record['key']] = record['response']
+    return recordings
+
+
+class ReplayProvider(LLMProvider):
+    """Serves responses recorded by RecordingProvider; never touches the network"""
+
+    name = 'replay'
+
+    def __init__(self, path, model):
+        super().__init__(model)
+        self.path = path
+        self.recordings = load_recordings(path)
+
+    def complete(self, payload):
+        response = self.recordings.get(make_cache_key(payload))
+        if response is None:
+            raise ReplayMissError(f"No recorded response in {self.path} for this prompt "
+                                  f"(model {payload.get('model')}); record it with LLM_PROVIDER=record")
+        return response
+
+
+class RecordingProvider(LLMProvider):
+    """Passes calls to another provider and appends each request/response pair to a JSONL file"""
+
+    name = 'record'
+
+    def __init__(self, inner, path):
+        super().__init__(inner.model)
+        self.inner = inner
+        self.path = path
+        self.lock = threading.Lock()
+
+    def complete(self, payload):
+        response = self.inner.complete(payload)
+        record = {'key': make_cache_key(payload), 'model': payload.get('model'),
+                  'messages': payload.get('messages'), 'response': response}
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return response
+
+    def stats(self):
+        return self.inner.stats()
+
+    def close(self):
+        self.inner.close()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Pipeline Metrics
+A small in-process registry of counters, gauges, latency histograms and
+timed spans, shared by the pipeline's threads. A run's metrics can be written
+as Prometheus text exposition or JSON, and saved to the `metrics` table.
+Memory stays bounded however long the process runs (the HTTP service shares one
+registry across every job): histograms keep bucket counters and a fixed-size
+sample, and only the most recent spans are kept besides running totals.
+"""
+
+import bisect
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import accumulate
+
+# Upper bounds in seconds for latency histograms (Prometheus-style, cumulative)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Upper bounds for counts, e.g. results per query
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+# Observations a histogram samples for its percentiles, and individual spans a registry keeps
+RESERVOIR_SIZE = 2048
+MAX_SPANS = 1000
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + list((extra or {}).items())
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{str(value)}"' for name, value in items) + '}'
+
+
+class Histogram:
+    """
+    Cumulative bucket counters, sum and max, plus a uniform sample of at most
+    reservoir_size observations (reservoir sampling) for the percentiles
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, reservoir_size=RESERVOIR_SIZE):
+        self.buckets = tuple(buckets)
+        self.bucket_hits = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0
+        self.max = None
+        self.reservoir_size = reservoir_size
+        self.sample = []
+        # Seeded so a run's percentiles don't change between identical runs
+        self._random = random.Random(0)
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        if self.max is None or value > self.max:
+            self.max = value
+        # Buckets are upper bounds: the first bound >= value takes it
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.bucket_hits[index] += 1
+        if len(self.sample) < self.reservoir_size:
+            self.sample.append(value)
+        else:
+            slot = self._random.randrange(self.count)
+            if slot < self.reservoir_size:
+                self.sample[slot] = value
+
+    def quantile(self, q):
+        """Nearest-rank percentile of the sampled observations (None when empty); exact until the sample fills"""
+        if not self.sample:
+            return None
+        ordered = sorted(self.sample)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+    def bucket_counts(self):
+        """Cumulative counts per upper bound, ending with +Inf"""
+        return list(zip(self.buckets, accumulate(self.bucket_hits))) + [(float('inf'), self.count)]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'max': self.max,
+        }
+
+
+class Metrics:
+    """Thread-safe registry; names follow Prometheus conventions (snake_case, unit suffix)"""
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        # The most recent spans, and the total seconds of every (name, labels) ever recorded
+        self.spans = deque(maxlen=MAX_SPANS)
+        self.span_seconds = {}
+        self.lock = threading.Lock()
+        self.t0 = time.perf_counter()
+
+    def inc(self, name, amount=1, **labels):
+        with self.lock:
+            key = (name, _label_key(labels))
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        with self.lock:
+            key = (name, _label_key(labels))
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(buckets)
+            self.histograms[key].observe(value)
+
+    def record_span(self, name, start, end, **labels):
+        """Record a span with start/end in seconds since the registry was created"""
+        with self.lock:
+            self.spans.append({'name': name, 'start': start, 'end': end,
+                               'duration': end - start, 'labels': labels})
+            key = (name, _label_key(labels))
+            self.span_seconds[key] = self.span_seconds.get(key, 0.0) + end - start
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Time a block as a named span"""
+        start = time.perf_counter() - self.t0
+        try:
+            yield
+        finally:
+            self.record_span(name, start, time.perf_counter() - self.t0, **labels)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time a block into a latency histogram"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def span_totals(self):
+        """{span name: total seconds}, for spans that may repeat (e.g. one per batch wave)"""
+        totals = {}
+        with self.lock:
+            for (name, _), seconds in self.span_seconds.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                             for (name, labels), value in sorted(self.counters.items())],
+                'gauges': [{'name': name, 'labels': dict(labels), 'value': value}
+                           for (name, labels), value in sorted(self.gauges.items())],
+                'histograms': [{'name': name, 'labels': dict(labels), **histogram.summary()}
+                               for (name, labels), histogram in sorted(self.histograms.items())],
+                'spans': list(self.spans),
+            }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format; spans become span_duration_seconds gauges"""
+        lines = []
+        with self.lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+            for (name, labels), value in sorted(self.gauges.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} gauge")
+                    typed.add(name)
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                for bound, count in histogram.bucket_counts():
+                    le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                    lines.append(f"{name}_bucket{_format_labels(labels, {'le': le})} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+            totals = dict(self.span_seconds)
+        if totals:
+            lines.append("# TYPE span_duration_seconds gauge")
+            for (name, labels), duration in sorted(totals.items()):
+                lines.append(f"span_duration_seconds{_format_labels((('span', name),) + labels)} {duration}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Write Prometheus text for .prom/.txt files, JSON otherwise"""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+    def rows(self):
+        """(kind, name, labels JSON, value, count, sum, p50, p95, p99, start) rows for the metrics table"""
+        data = self.to_dict()
+        rows = []
+        for kind in ('counters', 'gauges'):
+            for item in data[kind]:
+                rows.append((kind[:-1], item['name'], json.dumps(item['labels']), item['value'],
+                             None, None, None, None, None, None))
+        for item in data['histograms']:
+            rows.append(('histogram', item['name'], json.dumps(item['labels']), None,
+                         item['count'], item['sum'], item['p50'], item['p95'], item['p99'], None))
+        for span in data['spans']:
+            rows.append(('span', span['name'], json.dumps(span['labels']), span['duration'],
+                         None, None, None, None, None, span['start']))
+        return rows
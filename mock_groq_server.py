@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Mock Groq Server
+Local stand-in for Groq's OpenAI-compatible chat completions endpoint, for
+exercising the Groq client without an API key or network. It can inject
+latency, 429s (with Retry-After) and 5xx errors, speaks HTTP/1.1 keep-alive,
+and counts requests and TCP connections so connection reuse is visible.
+
+Replies are canned JSON chosen from the prompt text, so the whole pipeline
+can run against it:
+
+    python mock_groq_server.py --port 8765 --latency 0.2 --rate-limit-every 5
+    GROQ_API_URL=http://127.0.0.1:8765/openai/v1/chat/completions python linkedin_lead_generator.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# (marker found in the rendered prompt, reply) for each pipeline step
+CANNED_REPLIES = [
+    ('User query:', {'persona': 'IT support professionals', 'company_type': 'top tech firms',
+                     'location': 'India'}),
+    ('persona:', {'persona_description': 'Professionals who provide technical support and IT help desk services',
+                  'company_description': 'Large information technology services and consulting companies'}),
+    ('Your input is:', ['IT Support Specialist', 'Technical Support Engineer', 'System Administrator']),
+    ('Company description:', ['Infosys', 'TCS', 'Wipro', 'HCL Technologies']),
+]
+
+
+def canned_reply(payload):
+    """Pick the canned reply for the pipeline step the prompt belongs to"""
+    prompt = ' '.join(message.get('content', '') for message in payload.get('messages', []))
+    for marker, reply in CANNED_REPLIES:
+        if marker in prompt:
+            return json.dumps(reply)
+    return json.dumps({'echo': prompt[:200]})
+
+
+class MockGroqServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering POSTs like Groq's chat completions endpoint.
+
+    latency/jitter: seconds added to every response.
+    rate_limit_every: every Nth request gets a 429 with Retry-After: retry_after.
+    error_rate: probability of a 503 for any other request.
+    reply_fn(payload) -> str: message content (default: canned_reply).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), latency=0.0, jitter=0.0, rate_limit_every=0,
+                 retry_after=1, error_rate=0.0, reply_fn=canned_reply, seed=0):
+        super().__init__(address, MockGroqHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.reply_fn = reply_fn
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.connections = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/openai/v1/chat/completions"
+
+    def start(self):
+        """Serve from a background thread; returns self"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class MockGroqHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one segment, so keep-alive isn't stalled by delayed ACKs
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            self._send(400, {'error': {'message': 'invalid JSON body'}})
+            return
+
+        with server.lock:
+            server.requests += 1
+            number = server.requests
+            delay = server.latency + (server.rng.uniform(0, server.jitter) if server.jitter else 0.0)
+            rate_limited = bool(server.rate_limit_every) and number % server.rate_limit_every == 0
+            failed = not rate_limited and server.rng.random() < server.error_rate
+            server.rate_limited += rate_limited
+            server.errors += failed
+        if delay > 0:
+            time.sleep(delay)
+
+        if rate_limited:
+            self._send(429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_exceeded'}},
+                       {'Retry-After': str(server.retry_after)})
+            return
+        if failed:
+            self._send(503, {'error': {'message': 'Service unavailable'}})
+            return
+
+        content = server.reply_fn(payload)
+        self._send(200, {
+            'id': f'chatcmpl-mock-{number}',
+            'object': 'chat.completion',
+            'model': payload.get('model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content},
+                         'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock of Groq's chat completions API")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--rate-limit-every', type=int, default=0, help="send a 429 for every Nth request")
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="probability of a 503")
+    args = parser.parse_args()
+
+    server = MockGroqServer(('127.0.0.1', args.port), latency=args.latency, jitter=args.jitter,
+                            rate_limit_every=args.rate_limit_every, retry_after=args.retry_after,
+                            error_rate=args.error_rate)
+    print(f"🚀 Mock Groq server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {server.requests} requests over {server.connections} connections "
+              f"({server.rate_limited} rate limited, {server.errors} errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Prompt Registry
+Loads every markdown template in prompts/ once per process and splits each one
+into literal text and ${placeholder} slots, so rendering is a single join
+instead of a str.replace pass over the whole prompt per variable. The pipeline's
+stage templates are checked up front: a missing file, or a placeholder the
+stage doesn't fill (or fills but the template never uses), fails before any
+LLM call. Character and estimated token counts are kept per template.
+
+Usage:
+    python prompt_registry.py [prompts_dir]    # validate the templates and print their sizes
+"""
+
+import math
+import os
+import re
+import sys
+
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prompts')
+# Rough size of an English token for Llama/GPT-style tokenizers; counts are estimates
+CHARS_PER_TOKEN = 4
+
+# The template each LLM stage renders, and the placeholders the stage fills
+PIPELINE_PROMPTS = {
+    'variables': ('varible-extractor.md', ('user_query',)),
+    'descriptions': ('extracted-variables-to-description.md', ('persona', 'company_type', 'location')),
+    'job_roles': ('job-description-to-role-list.md', ('occupation_description',)),
+    'company_names': ('company-description-and-location-to-list.md', ('company_description', 'location')),
+}
+
+_PLACEHOLDER_RE = re.compile(r'\$\{(\w+)\}')
+
+
+class PromptError(Exception):
+    """A prompt template is missing or its placeholders don't match its stage"""
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class PromptTemplate:
+    """A prompt split into literal text and placeholder names; parts alternate literal, name, literal..."""
+
+    def __init__(self, name, text):
+        self.name = name
+        self.text = text
+        self.parts = _PLACEHOLDER_RE.split(text)
+        self.placeholders = tuple(dict.fromkeys(self.parts[1::2]))
+        self.chars = len(text)
+        self.tokens = estimate_tokens(text)
+
+    def render(self, values):
+        """Fill the placeholders from values in one pass; a name missing from values stays ${name}"""
+        parts = self.parts
+        out = parts[:]
+        for i in range(1, len(parts), 2):
+            value = values.get(parts[i])
+            out[i] = '${' + parts[i] + '}' if value is None else value
+        return ''.join(out)
+
+
+class PromptRegistry:
+    """Every *.md template in a directory, read once"""
+
+    def __init__(self, directory=PROMPTS_DIR):
+        self.directory = directory
+        self.templates = {}
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith('.md'):
+                with open(os.path.join(directory, filename), 'r', encoding='utf-8') as file:
+                    self.templates[filename] = PromptTemplate(filename, file.read())
+
+    def get(self, name):
+        template = self.templates.get(name)
+        if template is None:
+            raise PromptError(f"Could not find {name} in {self.directory}")
+        return template
+
+    def stage(self, stage):
+        """The template of a pipeline stage"""
+        return self.get(PIPELINE_PROMPTS[stage][0])
+
+    def validate(self, prompts=PIPELINE_PROMPTS):
+        """Problems with the stage templates, as messages; empty when they all line up"""
+        problems = []
+        for stage, (name, filled) in prompts.items():
+            template = self.templates.get(name)
+            if template is None:
+                problems.append(f"{stage}: could not find {name} in {self.directory}")
+                continue
+            unfilled = [p for p in template.placeholders if p not in filled]
+            unused = [p for p in filled if p not in template.placeholders]
+            if unfilled:
+                problems.append(f"{stage}: {name} has placeholders the stage doesn't fill: "
+                                + ', '.join('${' + p + '}' for p in unfilled))
+            if unused:
+                problems.append(f"{stage}: {name} never uses " + ', '.join('${' + p + '}' for p in unused))
+        return problems
+
+    def size(self, prompts=PIPELINE_PROMPTS):
+        """(chars, estimated tokens) of the stage templates before rendering"""
+        templates = [self.templates[name] for name, _ in prompts.values() if name in self.templates]
+        return sum(t.chars for t in templates), sum(t.tokens for t in templates)
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else PROMPTS_DIR
+    registry = PromptRegistry(directory)
+    stages = {name: stage for stage, (name, _) in PIPELINE_PROMPTS.items()}
+
+    print(f"📄 Prompt templates in {directory}:")
+    for name, template in registry.templates.items():
+        placeholders = ', '.join('${' + p + '}' for p in template.placeholders) or '-'
+        print(f"   {name:<48} {template.chars:6} chars  ~{template.tokens:5} tokens  "
+              f"{stages.get(name, '(not a stage prompt)'):<20} {placeholders}")
+
+    problems = registry.validate()
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    print(f"✅ All {len(PIPELINE_PROMPTS)} stage templates match their stages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Query Packing
+Builds dorked queries that cover several job roles and/or companies at once
+(OR-groups, up to a length limit), and attributes each returned profile back
+to the role/company pair it actually matched.
+"""
+
+import re
+
+# Company spellings used inside packed queries; shorter than the seven
+# variants of a single-pair query so more companies fit per query
+PACKED_COMPANY_VARIANTS = ('{c}', '@{c}', 'at {c}')
+
+
+class PackedQuery:
+    """A dorked query covering several roles and companies"""
+
+    def __init__(self, roles, companies, query):
+        self.roles = list(roles)
+        self.companies = list(companies)
+        self.query = query
+
+    def __repr__(self):
+        return f"PackedQuery(roles={self.roles}, companies={self.companies})"
+
+
+def build_packed_query(roles, companies, variants=PACKED_COMPANY_VARIANTS):
+    """Render one query: any of the roles in the title AND any company variant"""
+    role_clause = ' OR '.join(f'intitle:"{role}"' for role in roles)
+    if len(roles) > 1:
+        role_clause = f'({role_clause})'
+    company_clause = ' OR '.join(
+        f'"{variant.format(c=company)}"' for company in companies for variant in variants
+    )
+    return f'"{role_clause} AND ({company_clause}) inurl:/in/"'
+
+
+def _chunk_by_length(items, render, max_length, max_items):
+    """Greedily group items so render(group) stays within max_length"""
+    groups = []
+    current = []
+    for item in items:
+        candidate = current + [item]
+        if current and (len(render(candidate)) > max_length or len(candidate) > max_items):
+            groups.append(current)
+            current = [item]
+        else:
+            current = candidate
+    if current:
+        groups.append(current)
+    return groups
+
+
+def pack_queries(job_roles, company_names, max_length=1000, max_roles=3, max_companies=10,
+                 variants=PACKED_COMPANY_VARIANTS):
+    """
+    Pack the role × company cross product into as few queries as fit max_length.
+
+    Roles are grouped first (up to max_roles), then each role group is paired
+    with company groups filled greedily up to the length limit.
+    """
+    if not job_roles or not company_names:
+        return []
+    role_groups = _chunk_by_length(
+        job_roles, lambda group: build_packed_query(group, company_names[:1], variants),
+        max_length, max_roles
+    )
+    packed = []
+    for roles in role_groups:
+        company_groups = _chunk_by_length(
+            company_names, lambda group: build_packed_query(roles, group, variants),
+            max_length, max_companies
+        )
+        for companies in company_groups:
+            packed.append(PackedQuery(roles, companies, build_packed_query(roles, companies, variants)))
+    return packed
+
+
+def _term_pattern(terms):
+    """Compile a case-insensitive alternation matching any term as a whole phrase"""
+    ordered = sorted(set(terms), key=len, reverse=True)
+    return re.compile(
+        r'(?<![\w])(' + '|'.join(re.escape(term) for term in ordered) + r')(?![\w])',
+        re.IGNORECASE
+    )
+
+
+class Attributor:
+    """Maps a result back to the (role, company) pairs of a packed query it matches"""
+
+    def __init__(self, roles, companies):
+        self.roles = {role.casefold(): role for role in roles}
+        self.companies = {company.casefold(): company for company in companies}
+        self.role_re = _term_pattern(roles)
+        self.company_re = _term_pattern(companies)
+
+    def attribute(self, result):
+        """Return the matching (role, company) pairs; roles from the title, companies from title then text"""
+        title = getattr(result, 'title', '') or ''
+        text = getattr(result, 'text', '') or ''
+        roles = list(dict.fromkeys(self.roles[m.casefold()] for m in self.role_re.findall(title)))
+        companies = list(dict.fromkeys(self.companies[m.casefold()] for m in self.company_re.findall(title)))
+        if not companies:
+            companies = list(dict.fromkeys(self.companies[m.casefold()] for m in self.company_re.findall(text)))
+        return [(role, company) for role in roles for company in companies]
+
+
+def attribute_results(packed_query, results):
+    """
+    Group results by the (role, company) pair they matched.
+
+    Returns {(role, company): [results]}; results that match no pair are
+    grouped under (None, None). A result matching several pairs is listed
+    under each of them.
+    """
+    attributor = Attributor(packed_query.roles, packed_query.companies)
+    grouped = {}
+    for result in results:
+        pairs = attributor.attribute(result) or [(None, None)]
+        for pair in pairs:
+            grouped.setdefault(pair, []).append(result)
+    return grouped
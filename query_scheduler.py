@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Budgeted Query Scheduler
+Decides which role × company queries to spend a session's Exa budget on.
+Queries are ranked by expected yield (new unique profiles per call), estimated
+from historical results per role and per company, and re-ranked as the
+session's own results come in. Without history the order interleaves roles
+and companies uniformly. The run stops early once the marginal yield drops
+below a threshold.
+"""
+
+
+def load_yield_history(conn):
+    """Read (searches, new_profiles) totals per role and per company from searched_queries"""
+    history = {'role': {}, 'company': {}}
+    try:
+        for column, key in (('job_role', 'role'), ('company_name', 'company')):
+            for name, searches, new_profiles in conn.execute(f'''
+                SELECT {column}, SUM(searches), SUM(new_profiles)
+                FROM searched_queries
+                WHERE {column} IS NOT NULL
+                GROUP BY {column}
+            '''):
+                history[key][name] = [searches or 0, new_profiles or 0]
+    except Exception as e:
+        print(f"⚠️  Could not load query yield history: {str(e)}")
+    return history
+
+
+def interleave_order(plan):
+    """
+    Order (role, company, query) items so consecutive picks spread across
+    roles and companies, instead of exhausting one role before the next.
+    """
+    roles = list(dict.fromkeys(role for role, _, _ in plan))
+    companies = list(dict.fromkeys(company for _, company, _ in plan))
+    role_index = {role: i for i, role in enumerate(roles)}
+    company_index = {company: i for i, company in enumerate(companies)}
+    width = max(1, len(companies))
+
+    def key(item):
+        i = role_index[item[0]]
+        j = company_index[item[1]]
+        return ((j - i) % width, i)
+
+    return sorted(plan, key=key)
+
+
+class QueryScheduler:
+    """
+    Hands out batches of queries in order of expected yield.
+
+    plan is a list of (job_role, company_name, query). Call next_batch() to get
+    the next queries to run and record(query, new_profiles) once each finishes,
+    or cached(query) if it was served without an Exa call.
+    Queries in first (e.g. ones that failed in an earlier run) are handed out before the rest.
+    """
+
+    def __init__(self, plan, budget, history=None, min_marginal_yield=0.5,
+                 batch_size=10, warmup=None, prior_weight=2.0, call_cost=1.0, first=()):
+        self.remaining = interleave_order(plan)
+        self.first = set(first)
+        self.budget = budget
+        self.min_marginal_yield = min_marginal_yield
+        self.batch_size = max(1, batch_size)
+        # Don't judge marginal yield before a quarter of the budget (or one batch) has run
+        self.warmup = warmup if warmup is not None else max(self.batch_size, (budget or 0) // 4)
+        self.prior_weight = prior_weight
+        # Exa calls a query is expected to take until some have been charged (see charge())
+        self.call_cost = call_cost
+        self.stats = {'role': {}, 'company': {}}
+        for kind in ('role', 'company'):
+            for name, (searches, new_profiles) in ((history or {}).get(kind) or {}).items():
+                self.stats[kind][name] = [searches, new_profiles]
+        self.roles = {item[2]: (item[0], item[1]) for item in plan}
+        self.issued = 0
+        self.from_cache = 0
+        self.extra_calls = 0
+        self.recorded = 0
+        self.last_batch = []
+        self.stop_reason = None
+
+    def _global_rate(self):
+        searches = sum(value[0] for value in self.stats['role'].values())
+        found = sum(value[1] for value in self.stats['role'].values())
+        return (found / searches) if searches else None
+
+    def _rate(self, kind, name, prior):
+        searches, found = self.stats[kind].get(name, (0, 0))
+        return (found + self.prior_weight * prior) / (searches + self.prior_weight)
+
+    def expected_yield(self, role, company):
+        """Smoothed new-profiles-per-call estimate; equal for every pair without history"""
+        prior = self._global_rate()
+        if not prior:
+            return 0.0
+        return self._rate('role', role, prior) * self._rate('company', company, prior) / prior
+
+    @property
+    def sent(self):
+        """Issued queries that went to Exa rather than being served from cache"""
+        return self.issued - self.from_cache
+
+    @property
+    def spent(self):
+        """Exa calls counted against the budget: one per query sent plus any charged extra"""
+        return self.sent + self.extra_calls
+
+    def charge(self, calls):
+        """Count Exa requests a query needed beyond its own search against the budget"""
+        self.extra_calls += max(0, calls)
+
+    def cached(self, query):
+        """Give back the budget of an issued query that was served from cache"""
+        self.from_cache += 1
+
+    def next_batch(self):
+        """Return the next queries to run, or [] when the budget or marginal yield is exhausted"""
+        if self.stop_reason:
+            return []
+        if self.budget is not None and self.spent >= self.budget:
+            self.stop_reason = 'budget exhausted'
+            return []
+        if not self.remaining:
+            self.stop_reason = 'all queries searched'
+            return []
+        if self.last_batch and self.recorded >= self.warmup and self.min_marginal_yield:
+            marginal = sum(found for _, found in self.last_batch) / len(self.last_batch)
+            if marginal < self.min_marginal_yield:
+                self.stop_reason = (f'marginal yield {marginal:.2f} new profiles/call '
+                                    f'below {self.min_marginal_yield:g}')
+                return []
+
+        # Stable sort keeps the interleaved order among equally promising queries
+        self.remaining.sort(key=lambda item: (item[2] in self.first, self.expected_yield(item[0], item[1])),
+                            reverse=True)
+        size = self.batch_size
+        if self.budget is not None:
+            # Leave room for the extra calls the queries are likely to need
+            cost = max(1.0, self.spent / self.sent if self.extra_calls and self.sent else self.call_cost)
+            size = min(size, max(1, int((self.budget - self.spent) / cost)))
+        batch, self.remaining = self.remaining[:size], self.remaining[size:]
+        self.issued += len(batch)
+        self.last_batch = []
+        return [query for _, _, query in batch]
+
+    def record(self, query, new_profiles, members=None):
+        """
+        Feed back how many previously unseen profiles a query produced. For a packed query,
+        members maps each (role, company) pair it covers to the new profiles attributed to it.
+        """
+        if members is None:
+            members = {self.roles.get(query, (None, None)): new_profiles}
+        for (role, company), found in members.items():
+            for kind, name in (('role', role), ('company', company)):
+                if name is None:
+                    continue
+                entry = self.stats[kind].setdefault(name, [0, 0])
+                entry[0] += 1
+                entry[1] += found
+        self.recorded += 1
+        self.last_batch.append((query, new_profiles))
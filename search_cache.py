@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Exa Search Result Cache
+Keeps Exa responses in the local SQLite store, keyed on the normalized query
+plus the search parameters, so a warm query inside the freshness window is
+served locally and never reaches the network.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+from llm_cache import CACHE_MODES
+
+RESULT_FIELDS = ('title', 'url', 'text', 'published_date', 'author', 'score')
+
+CREATE_CACHE_SQL = '''
+    CREATE TABLE IF NOT EXISTS exa_cache (
+        key TEXT PRIMARY KEY,
+        query TEXT NOT NULL,
+        params TEXT,
+        results TEXT NOT NULL,
+        fetched_at REAL NOT NULL
+    )
+'''
+
+PUT_CACHE_SQL = '''
+    INSERT OR REPLACE INTO exa_cache (key, query, params, results, fetched_at)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+
+class CachedResult:
+    """Search result rebuilt from the cache, with the same attributes as an Exa result"""
+
+    def __init__(self, title='', url='', text='', published_date='', author='', score=0.0):
+        self.title = title
+        self.url = url
+        self.text = text
+        self.published_date = published_date
+        self.author = author
+        self.score = score
+
+    def __repr__(self):
+        return f"CachedResult(title={self.title!r}, url={self.url!r})"
+
+
+def normalize_query(query):
+    """Collapse whitespace and case so trivially different spellings share a cache entry"""
+    return re.sub(r'\s+', ' ', query).strip().casefold()
+
+
+def make_search_key(query, params):
+    """Hash the normalized query together with the parameters that shape the results"""
+    canonical = json.dumps({'query': normalize_query(query), 'params': params},
+                           sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def result_to_dict(result):
+    return {field: getattr(result, field, None) for field in RESULT_FIELDS}
+
+
+class SearchCache:
+    """
+    SQLite-backed Exa result cache with a freshness window.
+
+    Pass the database's LeadWriter as writer when the cache shares its file:
+    writes then join the writer's batches instead of waiting on its write lock
+    (up to a flush interval per put). They become visible once the batch commits.
+    """
+
+    def __init__(self, path, max_age=7 * 24 * 3600, mode='on', writer=None):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}', expected one of {CACHE_MODES}")
+        self.path = path
+        self.max_age = max_age
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.lock = threading.Lock()
+        self.writer = writer
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        if writer is not None:
+            writer.call(lambda conn: conn.execute(CREATE_CACHE_SQL))
+        else:
+            self.conn.execute(CREATE_CACHE_SQL)
+            self.conn.commit()
+
+    def get(self, query, params):
+        """Return cached results (list of CachedResult) if fresh, else None"""
+        if self.mode != 'on':
+            return None
+        key = make_search_key(query, params)
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT results, fetched_at FROM exa_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if self.max_age is not None and time.time() - row[1] > self.max_age:
+                self.stale += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+        return [CachedResult(**item) for item in json.loads(row[0])]
+
+    def put(self, query, params, results):
+        """Store the results for a query, replacing any stale copy"""
+        if self.mode == 'off':
+            return
+        payload = json.dumps([result_to_dict(result) for result in results])
+        row = (make_search_key(query, params), query, json.dumps(params, sort_keys=True), payload, time.time())
+        if self.writer is not None:
+            self.writer.execute(PUT_CACHE_SQL, row)
+            return
+        with self.lock:
+            self.conn.execute(PUT_CACHE_SQL, row)
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Concurrent Search Engine
+Runs Exa searches with several requests in flight at once, governed by a
+token-bucket rate limiter instead of a fixed sleep between calls.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst` saved up"""
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available, without blocking"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """Block until tokens are available, then take them"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def run_concurrent_searches(queries, search_fn, max_in_flight=5, rate_limiter=None, on_result=None,
+                            on_error=None):
+    """
+    Call search_fn(query) for every query with up to max_in_flight calls at once.
+
+    on_result(index, query, results) is called from the calling thread as each
+    search finishes, so callers can persist results without sharing database
+    connections across threads. A search that raises is reported to
+    on_error(index, query, error) if given, otherwise it counts as no results.
+    Returns a list of (query, results) in the same order as `queries`, which
+    matches what the serial loop would produce. On Ctrl-C, searches that have
+    not started yet are cancelled before the interrupt propagates.
+    """
+    queries = list(queries)
+    ordered = [None] * len(queries)
+    if not queries:
+        return []
+
+    def worker(query):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        return search_fn(query)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_in_flight))
+    try:
+        futures = {pool.submit(worker, query): i for i, query in enumerate(queries)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                if on_error is not None:
+                    ordered[i] = (queries[i], [])
+                    on_error(i, queries[i], e)
+                    continue
+                print(f"❌ Search failed for query {i+1}: {str(e)}")
+                results = []
+            ordered[i] = (queries[i], results)
+            if on_result is not None:
+                on_result(i, queries[i], results)
+    except BaseException:
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
+
+    return ordered
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+DAG Stage Runner
+Runs pipeline stages as soon as the stages they depend on have finished, so
+independent stages (e.g. job roles and company names) execute at the same time.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class Stage:
+    """A named pipeline step: fn receives a dict of its dependencies' outputs"""
+
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, deps={list(self.deps)})"
+
+
+def _check_graph(stages):
+    names = set()
+    for stage in stages:
+        if stage.name in names:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        names.add(stage.name)
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in names]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {missing}")
+
+    # Reject cycles with a simple topological pass
+    remaining = {stage.name: set(stage.deps) for stage in stages}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Stage dependency cycle among: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def critical_path(stages, timings):
+    """Return (stage names, seconds) of the longest dependency chain by duration"""
+    by_name = {stage.name: stage for stage in stages}
+    best = {}
+
+    def longest(name):
+        if name not in best:
+            chains = [longest(dep) for dep in by_name[name].deps]
+            path, seconds = max(chains, key=lambda chain: chain[1]) if chains else ([], 0.0)
+            best[name] = (path + [name], seconds + timings[name]['duration'])
+        return best[name]
+
+    return max((longest(stage.name) for stage in stages), key=lambda chain: chain[1])
+
+
+def run_stages(stages, max_workers=4):
+    """
+    Run a DAG of stages and return (outputs, timings).
+
+    outputs maps stage name -> return value. timings maps stage name ->
+    {'start', 'end', 'duration'} in seconds relative to the start of the run.
+    The first stage to raise cancels the rest and its exception propagates.
+    """
+    stages = list(stages)
+    _check_graph(stages)
+
+    outputs = {}
+    timings = {}
+    pending = {stage.name: stage for stage in stages}
+    t0 = time.perf_counter()
+
+    def execute(stage, inputs):
+        start = time.perf_counter() - t0
+        try:
+            return stage.fn(inputs)
+        finally:
+            end = time.perf_counter() - t0
+            timings[stage.name] = {'start': start, 'end': end, 'duration': end - start}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        running = {}
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(dep in outputs for dep in stage.deps):
+                    inputs = {dep: outputs[dep] for dep in stage.deps}
+                    running[pool.submit(execute, stage, inputs)] = name
+                    del pending[name]
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    for other in running:
+                        other.cancel()
+                    raise error
+                outputs[name] = future.result()
+
+    return outputs, timings
+
+
+def print_stage_timings(stages, timings):
+    """Print per-stage timings and how much running stages concurrently saved"""
+    wall = max(timing['end'] for timing in timings.values())
+    total = sum(timing['duration'] for timing in timings.values())
+    path, path_seconds = critical_path(stages, timings)
+
+    print(f"\n⏱️  Stage Timings:")
+    for stage in stages:
+        timing = timings[stage.name]
+        print(f"   - {stage.name:<16} {timing['duration']:6.2f}s  "
+              f"(started at {timing['start']:5.2f}s)")
+    print(f"   - Sum of stages:   {total:6.2f}s")
+    print(f"   - Critical path:   {path_seconds:6.2f}s  ({' → '.join(path)})")
+    print(f"   - Wall clock:      {wall:6.2f}s  (saved {max(0.0, total - wall):.2f}s)")
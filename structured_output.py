@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Structured Output
+Schemas for each LLM stage's JSON output, a fast tolerant JSON extractor, a
+small validator, the short repair prompt sent when a stage's reply doesn't
+fit its schema, and per-stage parse-failure / repair-cost metrics.
+"""
+
+import json
+import re
+import threading
+
+# Minimal JSON Schema subset: type, required, properties, items, minItems
+STAGE_SCHEMAS = {
+    'variables': {
+        'type': 'object',
+        'required': ['persona', 'company_type', 'location'],
+        'properties': {
+            'persona': {'type': ['string', 'null']},
+            'company_type': {'type': ['string', 'null']},
+            'location': {'type': ['string', 'null']},
+        },
+    },
+    'descriptions': {
+        'type': 'object',
+        'required': ['persona_description', 'company_description'],
+        'properties': {
+            'persona_description': {'type': 'string'},
+            'company_description': {'type': 'string'},
+        },
+    },
+    'job_roles': {'type': 'array', 'items': {'type': 'string'}, 'minItems': 1},
+    'company_names': {'type': 'array', 'items': {'type': 'string'}, 'minItems': 1},
+}
+
+_TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'null': type(None),
+}
+
+_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$', re.IGNORECASE)
+
+
+class StructuredOutputError(ValueError):
+    """An LLM reply that isn't JSON, or doesn't match its stage's schema"""
+
+    def __init__(self, stage, errors, raw):
+        super().__init__(f"{stage} output invalid: {'; '.join(errors)}")
+        self.stage = stage
+        self.errors = errors
+        self.raw = raw
+
+
+def extract_json(text):
+    """
+    Parse the JSON value in an LLM reply.
+
+    Tries the whole reply first (the common case in JSON mode), then without
+    markdown fences, then decodes from each '{' or '[' in turn so leading and
+    trailing prose are ignored. Raises ValueError if nothing parses.
+    """
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    text = _FENCE_RE.sub('', text).strip()
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r'[\[{]', text):
+        try:
+            value, _ = decoder.raw_decode(text, match.start())
+            return value
+        except json.JSONDecodeError:
+            continue
+    raise ValueError("no JSON object or array found")
+
+
+def validate(value, schema, path='$'):
+    """Return a list of schema violations (empty when value matches)"""
+    types = schema.get('type')
+    if types is not None:
+        types = types if isinstance(types, list) else [types]
+        if not any(isinstance(value, _TYPES[name]) for name in types):
+            return [f"{path} should be {' or '.join(types)}, got {type(value).__name__}"]
+    errors = []
+    if isinstance(value, dict):
+        for key in schema.get('required', []):
+            if key not in value:
+                errors.append(f"{path} is missing '{key}'")
+        for key, subschema in schema.get('properties', {}).items():
+            if key in value:
+                errors.extend(validate(value[key], subschema, f"{path}.{key}"))
+    if isinstance(value, list):
+        if len(value) < schema.get('minItems', 0):
+            errors.append(f"{path} needs at least {schema['minItems']} items")
+        if 'items' in schema:
+            for i, item in enumerate(value):
+                errors.extend(validate(item, schema['items'], f"{path}[{i}]"))
+    return errors
+
+
+def unwrap_array(value):
+    """Accept {"job_roles": [...]} where a bare array was asked for"""
+    if isinstance(value, dict) and len(value) == 1:
+        inner = next(iter(value.values()))
+        if isinstance(inner, list):
+            return inner
+    return value
+
+
+def parse_stage_output(stage, text):
+    """Parse and validate one stage's reply; raises StructuredOutputError"""
+    schema = STAGE_SCHEMAS[stage]
+    try:
+        value = extract_json(text)
+    except ValueError as e:
+        raise StructuredOutputError(stage, [str(e)], text)
+    if schema.get('type') == 'array':
+        value = unwrap_array(value)
+    errors = validate(value, schema)
+    if errors:
+        raise StructuredOutputError(stage, errors, text)
+    return value
+
+
+def wants_json_object(stage):
+    """JSON mode (response_format json_object) only allows a top-level object"""
+    return STAGE_SCHEMAS[stage].get('type') == 'object'
+
+
+def build_repair_prompt(stage, error, max_reply_chars=2000):
+    """A short follow-up asking only for corrected JSON, instead of re-running the full prompt"""
+    return (
+        f"Your previous reply could not be used: {'; '.join(error.errors)}.\n"
+        f"Reply with only valid JSON matching this JSON Schema, with no markdown or commentary:\n"
+        f"{json.dumps(STAGE_SCHEMAS[stage])}\n\n"
+        f"Previous reply:\n{error.raw[:max_reply_chars]}"
+    )
+
+
+class ParseMetrics:
+    """Per-stage counts of replies, parse failures and repair retries, and what the repairs cost"""
+
+    FIELDS = ('responses', 'parse_failures', 'repairs', 'repaired', 'repair_seconds', 'repair_prompt_chars')
+
+    def __init__(self):
+        self.stages = {}
+        self.lock = threading.Lock()
+
+    def add(self, stage, **counts):
+        with self.lock:
+            entry = self.stages.setdefault(stage, dict.fromkeys(self.FIELDS, 0))
+            for field, amount in counts.items():
+                entry[field] += amount
+
+    def snapshot(self):
+        """{stage: counts}, with failure_rate = parse failures per reply"""
+        with self.lock:
+            snapshot = {stage: dict(entry) for stage, entry in self.stages.items()}
+        for entry in snapshot.values():
+            entry['failure_rate'] = entry['parse_failures'] / entry['responses'] if entry['responses'] else 0.0
+        return snapshot
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Groq Client Tests
+Runs GroqClient against the local mock Groq server: a 429 with Retry-After is
+retried after the server's delay, and repeated failures trip the circuit
+breaker, which lets one trial call through once it turns half-open.
+
+Usage:
+    python -m pytest tests
+"""
+
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from groq_client import GroqClient, GroqError, CircuitOpenError, CircuitBreaker
+from mock_groq_server import MockGroqServer
+
+PAYLOAD = {'model': 'llama3-8b-8192', 'messages': [{'role': 'user', 'content': 'User query: test'}]}
+RESET_TIMEOUT = 0.2
+
+
+class GroqClientTest(unittest.TestCase):
+
+    def setUp(self):
+        # Every request is rate limited until a test turns it off
+        self.server = MockGroqServer(rate_limit_every=1, retry_after=3).start()
+        self.client = GroqClient('test-key', self.server.url, max_retries=2,
+                                 breaker=CircuitBreaker(failure_threshold=2, reset_timeout=RESET_TIMEOUT))
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def chat(self):
+        """Call the mock, recording the retry delays instead of sleeping through them"""
+        with mock.patch('groq_client.time.sleep') as sleep:
+            try:
+                return self.client.chat(PAYLOAD)
+            finally:
+                self.delays = [call.args[0] for call in sleep.call_args_list]
+
+    def test_retry_after_sets_retry_delay(self):
+        with self.assertRaises(GroqError) as raised:
+            self.chat()
+        self.assertEqual(raised.exception.status, 429)
+        self.assertEqual(self.delays, [3.0, 3.0])
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(self.client.stats()['retries'], 2)
+
+    def test_breaker_opens_then_half_opens(self):
+        for _ in range(2):
+            with self.assertRaises(GroqError):
+                self.chat()
+        self.assertEqual(self.client.breaker.state, 'open')
+        requests = self.server.requests
+        with self.assertRaises(CircuitOpenError):
+            self.chat()
+        self.assertEqual(self.server.requests, requests)
+
+        # A failed trial call reopens the breaker straight away
+        time.sleep(RESET_TIMEOUT)
+        self.assertEqual(self.client.breaker.state, 'half-open')
+        with self.assertRaises(GroqError):
+            self.chat()
+        self.assertEqual(self.client.breaker.state, 'open')
+
+        # A successful one closes it
+        time.sleep(RESET_TIMEOUT)
+        self.server.rate_limit_every = 0
+        self.assertIn('persona', self.chat())
+        self.assertEqual(self.client.breaker.state, 'closed')
+
+
+if __name__ == '__main__':
+    unittest.main()